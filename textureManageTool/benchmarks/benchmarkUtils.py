@@ -0,0 +1,123 @@
+"""Shared set up of the tree view benchmarks, run them with mayapy or from the maya script editor.
+
+"""
+
+import os, random, sys, time
+
+TOOL_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for tool_folder in (os.path.join(TOOL_PATH, 'utils'), os.path.join(TOOL_PATH, 'ui'), TOOL_PATH):
+    if tool_folder not in sys.path:
+        sys.path.insert(0, tool_folder)
+
+from Qt import QtWidgets
+
+import DATA_ITEMS, treeView
+
+COLOR_ROLES = ('WindowText', 'Button', 'Light', 'Mid', 'Dark', 'Text', 'BrightText', 'Base', 'Window', 'Shadow',
+               'Highlight', 'HighlightedText')
+WORDS = ('wood', 'metal', 'stone', 'skin', 'albedo', 'rough', 'normal', 'height')
+
+
+def get_application():
+    """Return the running QApplication, a new one out of maya.
+
+    Returns:
+        QtWidgets.QApplication: The application.
+
+    """
+
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+
+def create_tree_view():
+    """Return a shown tree view with the tool gray colors.
+
+    Returns:
+        treeView.TreeView: The tree view.
+
+    """
+
+    tree_view = treeView.TreeView(color_setting=dict((role, [60, 60, 60]) for role in COLOR_ROLES))
+    tree_view.resize(400, 600)
+    tree_view.show()
+
+    return tree_view
+
+
+def add_texture_rows(tree_view, folders=100, files=1000, seed=0):
+    """Add folders rows with texture file names rows under them, names are repeatable from the seed.
+
+    Args:
+        tree_view (treeView.TreeView): The tree view to add the rows to.
+        folders (int): The number of top level folders rows.
+        files (int): The number of files rows under each folder.
+        seed (int): The random names seed.
+
+    Returns:
+        list: The folders items.
+
+    """
+
+    random_names = random.Random(seed)
+    folders_items = []
+    for folder in range(folders):
+        folder_kwargs = DATA_ITEMS.DATA_ITEMS['str'].copy()
+        folder_kwargs['default'] = 'folder{}'.format(folder)
+        folder_kwargs['editable'] = False
+        folder_item = tree_view.add_items(items_kwargs=[[folder_kwargs]], unique_name=False)[0][0]
+
+        rows_kwargs = []
+        for file_number in range(files):
+            file_kwargs = DATA_ITEMS.DATA_ITEMS['str'].copy()
+            file_kwargs['default'] = '{}_{}_v{:03d}.png'.format(
+                random_names.choice(WORDS), random_names.choice(WORDS), file_number
+            )
+            rows_kwargs.append([file_kwargs])
+        tree_view.add_items(items_kwargs=rows_kwargs, unique_name=False, parent_item=folder_item)
+        folders_items.append(folder_item)
+
+    return folders_items
+
+
+def get_memory_usage():
+    """Return the resident memory of the process, read from /proc on linux.
+
+    Returns:
+        float/None: The resident memory in MB, None if it can not be read.
+
+    """
+
+    try:
+        with open('/proc/self/status') as status_file:
+            for line in status_file:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024.0
+    except (IOError, OSError):
+        pass
+
+    return None
+
+
+def measure(label, function, *args, **kwargs):
+    """Print the time of the function call and the time of the layout and paint it caused.
+
+    Args:
+        label (str): The printed measure description.
+        function (callable): The measured function.
+        *args: The function arguments.
+        **kwargs: The function keyword arguments.
+
+    Returns:
+        any: The function result.
+
+    """
+
+    application = get_application()
+    start = time.time()
+    result = function(*args, **kwargs)
+    elapsed = time.time() - start
+    start = time.time()
+    application.processEvents()
+    print('{:<40} {:>8.1f}ms  layout and paint {:>8.1f}ms'.format(label, elapsed * 1000, (time.time() - start) * 1000))
+
+    return result
@@ -0,0 +1,113 @@
+"""Benchmark the textures catalog name queries against a plain LIKE scan of the whole table.
+
+Run with mayapy from this folder, the catalog of generated records is kept in the temp folder between runs:
+    mayapy catalogBenchmark.py [records count]
+
+"""
+
+import os, random, sys, tempfile, time
+
+TOOL_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [TOOL_PATH, os.path.join(TOOL_PATH, 'ui'), os.path.join(TOOL_PATH, 'utils')]
+
+import textureCatalog
+
+WORDS = ('wood', 'metal', 'rock', 'brick', 'fabric', 'leather', 'concrete', 'plaster', 'tile', 'grass', 'moss', 'rust',
+         'paint', 'plank', 'floor', 'wall', 'roof', 'stone', 'sand', 'dirt')
+MAPS = ('albedo', 'diffuse', 'normal', 'rough', 'metal', 'height', 'ao', 'spec', 'disp', 'mask')
+RESOLUTIONS = (512, 1024, 2048, 4096)
+NAMES = ('rock_moss', 'albedo', 'wood', '1234', 'metal_rough_0042', 'zzz', 'ood_pl', 'ROCK_Moss', 'ab')
+ROOT = '/library'
+REPEATS = 5
+
+
+def create_catalog(count):
+    """Return the benchmark catalog of count generated records, created at the first run.
+
+    Args:
+        count (int): The number of textures records.
+
+    Returns:
+        TextureCatalog: The benchmark catalog.
+
+    """
+
+    catalog_path = os.path.join(tempfile.gettempdir(), 'catalogBenchmark_{}.db'.format(count))
+    exists = os.path.exists(catalog_path)
+    catalog = textureCatalog.TextureCatalog(catalog_path=catalog_path)
+    if exists:
+        return catalog
+
+    random.seed(0)
+    records = []
+    for index in range(count):
+        stem = '{}_{}_{}_{:04d}_v{:03d}'.format(
+            random.choice(WORDS), random.choice(WORDS), random.choice(MAPS), random.randrange(10000), random.randrange(20)
+        )
+        folder = '{}/f{}'.format(ROOT, index // 100)
+        records.append((
+            ROOT, '{}/{}_{}.png'.format(folder, stem, index), folder, stem + '.png', stem, '.png', 1, 1.0,
+            random.choice(RESOLUTIONS), random.choice(RESOLUTIONS), 8
+        ))
+
+    start = time.time()
+    for batch_start in range(0, count, 500):
+        catalog.connection.executemany(
+            'INSERT OR REPLACE INTO textures (root, path, folder, name, stem, extension, size, mtime, width, height, '
+            'bit_depth) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            records[batch_start:batch_start + 500]
+        )
+        catalog.connection.commit()
+    print('catalogued {} records in {:.1f}s'.format(count, time.time() - start))
+
+    return catalog
+
+
+def benchmark(catalog, label, **kwargs):
+    """Print the best query time of the catalog and the time of the same query through a LIKE scan.
+
+    Args:
+        catalog (TextureCatalog): The benchmark catalog.
+        label (str): The printed query description.
+        **kwargs: The TextureCatalog.query arguments.
+
+    """
+
+    best = None
+    for _ in range(REPEATS):
+        start = time.time()
+        records = catalog.query(**kwargs)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    # without a trigram the name is matched by scanning the textures table
+    pick_trigram = textureCatalog.TextureCatalog._pick_trigram
+    textureCatalog.TextureCatalog._pick_trigram = lambda self, name: (None, 0)
+    try:
+        start = time.time()
+        like_records = catalog.query(**kwargs)
+        like_elapsed = time.time() - start
+    finally:
+        textureCatalog.TextureCatalog._pick_trigram = pick_trigram
+
+    assert records == like_records, label
+    print('{:<45} {:>5} records  trigram {:>7.1f}ms  like {:>7.1f}ms'.format(
+        label, len(records), best * 1000, like_elapsed * 1000
+    ))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    catalog = create_catalog(count=count)
+
+    for name in NAMES:
+        benchmark(catalog, 'name={!r} limit=500'.format(name), root=ROOT, name=name, limit=500)
+    benchmark(catalog, "name='1234' no limit", name='1234')
+    benchmark(catalog, "name='rock_moss' 4K limit=500", root=ROOT, name='rock_moss', min_width=4096, min_height=4096,
+              limit=500)
+
+    catalog.close()
+
+
+if __name__ == '__main__':
+    main()
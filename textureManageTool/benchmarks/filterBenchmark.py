@@ -0,0 +1,40 @@
+"""Benchmark the tree view filter on 100 folders of 1000 textures rows: keystrokes, refilter after edits and clear.
+
+Run with mayapy from this folder:
+    mayapy filterBenchmark.py
+
+"""
+
+import benchmarkUtils
+
+import DATA_ITEMS
+
+
+def main():
+    application = benchmarkUtils.get_application()
+    tree_view = benchmarkUtils.create_tree_view()
+    folders_items = benchmarkUtils.add_texture_rows(tree_view=tree_view)
+    application.processEvents()
+
+    benchmarkUtils.measure('build name index', tree_view._ensure_name_index)
+    for text in ('w', 'wo', 'woo', 'wood', 'wood_a', 'wood_al', 'wood_alb'):
+        benchmarkUtils.measure('filter {!r}'.format(text), tree_view.filter_items, text=text, mode='Substring')
+
+    # the model changes are filtered again on the next event loop, measured here at once
+    folder_item = folders_items[3]
+    file_kwargs = DATA_ITEMS.DATA_ITEMS['str'].copy()
+    file_kwargs['default'] = 'wood_albedo_new.png'
+    tree_view.add_items(items_kwargs=[[file_kwargs]], unique_name=False, parent_item=folder_item)
+    benchmarkUtils.measure('refilter after adding a row', tree_view._refilter_items)
+    folder_item.child(5).setText('wood_albedo_renamed.png')
+    benchmarkUtils.measure('refilter after renaming a row', tree_view._refilter_items)
+    folder_item.removeRow(7)
+    benchmarkUtils.measure('refilter after removing a row', tree_view._refilter_items)
+
+    benchmarkUtils.measure('clear the filter', tree_view.filter_items, text='', mode='Substring')
+    benchmarkUtils.measure('filter \'w\' again', tree_view.filter_items, text='w', mode='Substring')
+    benchmarkUtils.measure('clear the filter', tree_view.filter_items, text='', mode='Substring')
+
+
+if __name__ == '__main__':
+    main()
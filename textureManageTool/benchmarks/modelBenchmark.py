@@ -0,0 +1,121 @@
+"""Benchmark the tree view item model against QtGui.QStandardItemModel items set up the same way:
+load time, resident memory, first layout and reading all the items back, 2 str columns rows.
+
+Run each model in its own process from this folder, the memory is the process resident memory growth:
+    mayapy modelBenchmark.py itemModel [rows count]
+    mayapy modelBenchmark.py standardItemModel [rows count]
+
+"""
+
+import gc, sys, time
+
+import benchmarkUtils
+
+from Qt import QtCore, QtGui, QtWidgets
+
+import DATA_ITEMS
+
+
+def create_rows_kwargs(count):
+    """Return the columns item kwargs of count texture rows, a file name and its folder.
+
+    Args:
+        count (int): The number of rows.
+
+    Returns:
+        list: The rows columns item kwargs.
+
+    """
+
+    rows_kwargs = []
+    for row in range(count):
+        name_kwargs = DATA_ITEMS.DATA_ITEMS['str'].copy()
+        name_kwargs['default'] = 'texture_{}.png'.format(row)
+        name_kwargs['toolTip'] = '/library/texture_{}.png'.format(row)
+        folder_kwargs = DATA_ITEMS.DATA_ITEMS['str'].copy()
+        folder_kwargs['default'] = '/library/folder{}'.format(row % 50)
+        rows_kwargs.append([name_kwargs, folder_kwargs])
+
+    return rows_kwargs
+
+
+def create_standard_item(item_kwargs):
+    """Return a QtGui.QStandardItem with the text, colors, font, size, tool tip and kwargs of the item kwargs,
+       the way the tree view created its items before the item model.
+
+    Args:
+        item_kwargs (dict): The item kwargs.
+
+    Returns:
+        QtGui.QStandardItem: The item.
+
+    """
+
+    item = QtGui.QStandardItem(str(item_kwargs['default']))
+    item.setBackground(QtGui.QBrush(QtGui.QColor(*(item_kwargs['bg_color'] + [item_kwargs['bg_alpha']]))))
+    item.setForeground(QtGui.QBrush(QtGui.QColor(*(item_kwargs['text_color'] + [item_kwargs['text_alpha']]))))
+    font = QtGui.QFont()
+    font.setFamily('Segoe UI')
+    font.setPointSize(item_kwargs['size'])
+    font.setBold(item_kwargs['bold'])
+    item.setFont(font)
+    item.setData(QtCore.QSize(item_kwargs['column_size'], 35), QtCore.Qt.SizeHintRole)
+    item.setToolTip(item_kwargs['toolTip'])
+    item.setEditable(item_kwargs['editable'])
+    item.setData(item_kwargs, QtCore.Qt.UserRole + 2)
+
+    return item
+
+
+def main():
+    model_name = sys.argv[1] if len(sys.argv) > 1 else 'itemModel'
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    application = benchmarkUtils.get_application()
+    rows_kwargs = create_rows_kwargs(count=count)
+
+    if model_name == 'itemModel':
+        view = benchmarkUtils.create_tree_view()
+        view.hide()
+    else:
+        view = QtWidgets.QTreeView()
+        view.resize(400, 600)
+        view.setModel(QtGui.QStandardItemModel(view))
+
+    gc.collect()
+    memory = benchmarkUtils.get_memory_usage()
+    start = time.time()
+    if model_name == 'itemModel':
+        view.add_items(items_kwargs=rows_kwargs, unique_name=False)
+    else:
+        root_item = view.model().invisibleRootItem()
+        for row_kwargs in rows_kwargs:
+            root_item.appendRow([create_standard_item(item_kwargs=dict(item_kwargs)) for item_kwargs in row_kwargs])
+    load_elapsed = time.time() - start
+    gc.collect()
+    memory = None if memory is None else benchmarkUtils.get_memory_usage() - memory
+
+    start = time.time()
+    view.show()
+    application.processEvents()
+    view.viewport().repaint()
+    layout_elapsed = time.time() - start
+
+    start = time.time()
+    if model_name == 'itemModel':
+        view.iter_get_items(view.model.invisibleRootItem())
+    else:
+        root_item = view.model().invisibleRootItem()
+        [
+            [root_item.child(row, column).data(QtCore.Qt.UserRole + 2) for column in range(2)]
+            for row in range(root_item.rowCount())
+        ]
+    read_elapsed = time.time() - start
+
+    print('{} {} rows: load {:.2f}s, memory {}, first layout {:.3f}s, read all the items {:.2f}s'.format(
+        model_name, count, load_elapsed, 'n/a' if memory is None else '+{:.1f} MB'.format(memory), layout_elapsed,
+        read_elapsed
+    ))
+
+
+if __name__ == '__main__':
+    main()
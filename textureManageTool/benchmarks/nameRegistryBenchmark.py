@@ -0,0 +1,85 @@
+"""Benchmark the unique names of fileManage.UniqueNameRegistry against fileManage.unique_name on 100k names in use.
+
+Run with mayapy from this folder:
+    mayapy nameRegistryBenchmark.py [names count]
+
+"""
+
+import os, random, sys, time
+
+TOOL_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [TOOL_PATH, os.path.join(TOOL_PATH, 'ui'), os.path.join(TOOL_PATH, 'utils')]
+
+import fileManage
+
+WORDS = ('wood', 'metal', 'stone', 'skin', 'albedo', 'rough', 'normal', 'height')
+# unique_name scans all the names for each name, only a few names are created through it
+SCAN_NAMES = 20
+REGISTRY_NAMES = 10000
+
+
+def create_names(count, seed=0):
+    """Return count texture versions names of random base names, some names are in use more than once.
+
+    Args:
+        count (int): The number of names.
+        seed (int): The random names seed.
+
+    Returns:
+        list: The names.
+
+    """
+
+    random_names = random.Random(seed)
+
+    return [
+        '{}_{}_{}_v{}'.format(
+            random_names.choice(WORDS), random_names.choice(WORDS), random_names.randrange(1000),
+            random_names.randrange(50)
+        )
+        for _ in range(count)
+    ]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    names = create_names(count=count)
+    new_names = create_names(count=REGISTRY_NAMES, seed=1)
+
+    start = time.time()
+    registry = fileManage.UniqueNameRegistry(names=names)
+    print('{:<36} {:>9.3f}ms'.format('register {} names'.format(count), (time.time() - start) * 1000))
+
+    # the same unique names from both, each unique name is in use before the next one is created
+    names_in_use = list(names)
+    start = time.time()
+    scan_unique_names = []
+    for name in new_names[:SCAN_NAMES]:
+        scan_unique_names.append(fileManage.unique_name(names=names_in_use, name=name))
+        names_in_use.append(scan_unique_names[-1])
+    scan_elapsed = (time.time() - start) / SCAN_NAMES
+
+    start = time.time()
+    registry_unique_names = []
+    for name in new_names:
+        registry_unique_names.append(registry.unique_name(name=name))
+        registry.add(registry_unique_names[-1])
+    registry_elapsed = (time.time() - start) / REGISTRY_NAMES
+
+    assert registry_unique_names[:SCAN_NAMES] == scan_unique_names
+    print('{:<36} {:>9.3f}ms per name'.format('unique name, scanning the names', scan_elapsed * 1000))
+    print('{:<36} {:>9.3f}ms per name'.format('unique name, registry', registry_elapsed * 1000))
+
+    # removing the highest numbers looks at the numbers of the base name only
+    start = time.time()
+    for name in registry_unique_names:
+        registry.remove(name)
+    print('{:<36} {:>9.3f}ms per name'.format(
+        'remove {} names'.format(REGISTRY_NAMES), (time.time() - start) / REGISTRY_NAMES * 1000
+    ))
+
+    assert registry.names == fileManage.UniqueNameRegistry(names=names).names
+
+
+if __name__ == '__main__':
+    main()
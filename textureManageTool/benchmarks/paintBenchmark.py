@@ -0,0 +1,73 @@
+"""Benchmark the tree view repaint while scrolling, 20k selected rows of 2 columns with a few item styles,
+through the default delegate painting and through the 'paint' kwargs painting of ItemDelegate.
+
+Run with mayapy from this folder:
+    mayapy paintBenchmark.py [rows count] [scroll steps]
+
+"""
+
+import sys, time
+
+import benchmarkUtils
+
+import DATA_ITEMS
+
+
+def create_item_kwargs(name, paint, row):
+    """Return str item kwargs of the name, the background color cycles through 3 styles.
+
+    Args:
+        name (str): The item name.
+        paint (bool): Paint the item through ItemDelegate.paint or through the default delegate painting.
+        row (int): The row number, picks the background color.
+
+    Returns:
+        dict: The item kwargs.
+
+    """
+
+    item_kwargs = DATA_ITEMS.DATA_ITEMS['str'].copy()
+    item_kwargs['default'] = name
+    item_kwargs['paint'] = paint
+    item_kwargs['column_size'] = 150
+    item_kwargs['bg_color'] = [40 + row % 3, 40, 40]
+
+    return item_kwargs
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    application = benchmarkUtils.get_application()
+
+    for paint in (False, True):
+        tree_view = benchmarkUtils.create_tree_view()
+        tree_view.resize(500, 900)
+        tree_view.add_items(
+            items_kwargs=[
+                [
+                    create_item_kwargs(name='texture_{}'.format(row), paint=paint, row=row),
+                    create_item_kwargs(name='/library/folder{}'.format(row), paint=paint, row=row)
+                ]
+                for row in range(count)
+            ],
+            unique_name=False
+        )
+        tree_view.selectAll()
+        application.processEvents()
+
+        scroll_bar = tree_view.verticalScrollBar()
+        start = time.time()
+        for step in range(steps):
+            scroll_bar.setValue(scroll_bar.maximum() * step // steps)
+            tree_view.viewport().repaint()
+        elapsed = time.time() - start
+
+        print('{} painting: {} scroll repaints {:.3f}s, {:.2f}ms each'.format(
+            "'paint' kwargs" if paint else 'default delegate', steps, elapsed, elapsed * 1000 / steps
+        ))
+        tree_view.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""Benchmark removing fragmented selected rows, every step row of a folder of textures rows, then undo and redo it.
+
+Run with mayapy from this folder:
+    mayapy removeBenchmark.py [rows count] [step]
+
+"""
+
+import sys
+
+import benchmarkUtils
+
+from Qt import QtCore
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    step = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    application = benchmarkUtils.get_application()
+    tree_view = benchmarkUtils.create_tree_view()
+    folder_item = benchmarkUtils.add_texture_rows(tree_view=tree_view, folders=1, files=count)[0]
+    tree_view.expandAll()
+    tree_view._ensure_name_index()
+    application.processEvents()
+
+    selection = QtCore.QItemSelection()
+    for row in range(0, count, step):
+        selection.select(folder_item.child(row).index(), folder_item.child(row).index())
+    tree_view.selectionModel().select(selection, QtCore.QItemSelectionModel.Select)
+
+    label = 'remove every {} row of {} rows'.format(step, count)
+    benchmarkUtils.measure(label, tree_view.remove_items)
+    benchmarkUtils.measure('undo', tree_view.undo_stack.undo)
+    benchmarkUtils.measure('redo', tree_view.undo_stack.redo)
+
+    assert folder_item.rowCount() == count - len(range(0, count, step))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Tests of the tree view storage over repeated edits, the nodes and the name index entries of the removed rows are
+reused, so the storage stays flat however many edits are done.
+
+Run with mayapy from this folder:
+    mayapy -m unittest testEditStorage
+
+"""
+
+import os, sys, unittest
+
+TOOL_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for tool_folder in (os.path.join(TOOL_PATH, 'utils'), os.path.join(TOOL_PATH, 'ui'), TOOL_PATH):
+    if tool_folder not in sys.path:
+        sys.path.insert(0, tool_folder)
+
+from Qt import QtCore, QtWidgets
+
+import DATA_ITEMS, treeView
+
+COLOR_ROLES = ('WindowText', 'Button', 'Light', 'Mid', 'Dark', 'Text', 'BrightText', 'Base', 'Window', 'Shadow',
+               'Highlight', 'HighlightedText')
+# rows of the tree view, each edit cycle duplicates all of them and removes the duplicates
+ROWS = 200
+# the done commands keep the rows they took out until they are dropped, the storage is full once the stack is full
+UNDO_LIMIT = 100
+# edit cycles filling the undo stack, then edit cycles checked against the filled storage
+WARM_UP_CYCLES = UNDO_LIMIT // 2 + 10
+CYCLES = 100
+
+
+class EditStorageTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.application = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+    def setUp(self):
+        self.tree_view = treeView.TreeView(color_setting=dict((role, [60, 60, 60]) for role in COLOR_ROLES))
+        self.tree_view.undo_stack.set_undo_limit(UNDO_LIMIT)
+        self.tree_view.add_items(
+            items_kwargs=[[self.create_item_kwargs(name='texture_{}'.format(row))] for row in range(ROWS)],
+            unique_name=False
+        )
+        self.tree_view._ensure_name_index()
+
+    def tearDown(self):
+        self.tree_view.deleteLater()
+
+    def create_item_kwargs(self, name):
+        """Return str item kwargs of the name.
+
+        """
+
+        item_kwargs = DATA_ITEMS.DATA_ITEMS['str'].copy()
+        item_kwargs['default'] = name
+
+        return item_kwargs
+
+    def select_rows(self, first, last):
+        """Select the top level rows from first to last.
+
+        """
+
+        selection = QtCore.QItemSelection(self.tree_view.model.index(first, 0), self.tree_view.model.index(last, 0))
+        self.tree_view.selectionModel().clearSelection()
+        self.tree_view.selectionModel().select(selection, QtCore.QItemSelectionModel.Select)
+
+    def edit_cycle(self):
+        """Duplicate all the rows then remove the duplicated rows.
+
+        """
+
+        self.select_rows(first=0, last=ROWS - 1)
+        self.tree_view.duplicate_items()
+        self.select_rows(first=ROWS, last=ROWS * 2 - 1)
+        self.tree_view.remove_items()
+
+    def get_storage_sizes(self):
+        """Return the model nodes and cells arrays sizes, and the name index entries sizes.
+
+        """
+
+        model = self.tree_view.model
+
+        return {
+            'nodes': len(model._parents),
+            'cells': len(model._texts[0]),
+            'index items': len(self.tree_view._index_items),
+            'index entries': len(self.tree_view.name_index.keys)
+        }
+
+    def test_storage_stays_flat(self):
+        for _ in range(WARM_UP_CYCLES):
+            self.edit_cycle()
+        sizes = self.get_storage_sizes()
+
+        for _ in range(CYCLES):
+            self.edit_cycle()
+
+        self.assertEqual(self.get_storage_sizes(), sizes)
+        self.assertEqual(self.tree_view.model.rowCount(), ROWS)
+        self.assertEqual(len(self.tree_view.name_index), ROWS)
+
+    def test_undo_reused_storage(self):
+        for _ in range(WARM_UP_CYCLES):
+            self.edit_cycle()
+        names = [self.tree_view.model.item(row).text() for row in range(ROWS)]
+
+        self.tree_view.undo_stack.undo()
+        self.assertEqual(self.tree_view.model.rowCount(), ROWS * 2)
+        for row in range(ROWS):
+            item = self.tree_view.get_item(self.tree_view.model.item(ROWS + row).text())['item']
+            self.assertEqual(item.row(), ROWS + row)
+
+        self.tree_view.undo_stack.undo()
+        self.assertEqual([self.tree_view.model.item(row).text() for row in range(ROWS)], names)
+        self.assertEqual(len(self.tree_view.name_index), ROWS)
+
+    def test_removed_rows_drop_the_commands(self):
+        self.edit_cycle()
+        self.tree_view.model.invisibleRootItem().removeRow(0)
+
+        self.assertEqual(self.tree_view.undo_stack.count(), 0)
+        self.assertEqual(self.tree_view.model.rowCount(), ROWS - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,1951 @@
+import array, copy
+
+from Qt import QtCore, QtGui
+
+
+# item kwargs dictionary role of the cells
+KWARGS_ROLE = QtCore.Qt.UserRole + 2
+# ItemStyle role of the cells painted by the ItemDelegate itself, None for the cells painted by the default delegate
+PAINT_STYLE_ROLE = QtCore.Qt.UserRole + 3
+# node of the invisible root item, the parent of the top level rows
+ROOT_NODE = 0
+# parent node of the rows taken out of the model, they can be inserted back
+DETACHED_NODE = -1
+# parent node of the removed rows
+REMOVED_NODE = -2
+# key of the (preset id, default) of the items created from a preset, until they are added to the model
+PRESET_CELL_KEY = 'preset'
+# item kwargs keys stored per cell, the other keys are shared by the cells in the presets table
+CELL_KWARGS_KEYS = ('default', 'toolTip')
+# mime type of the dragged rows, the rows nodes are only meaningful inside the same model
+ROWS_MIME_TYPE = 'application/x-texturemanagetool-rows'
+# flags of the cells without kwargs, same as QtGui.QStandardItem
+DEFAULT_FLAGS = (
+    QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEditable | QtCore.Qt.ItemIsEnabled |
+    QtCore.Qt.ItemIsDragEnabled | QtCore.Qt.ItemIsDropEnabled
+)
+# flags of the cells of the rows without children, the views lay them out without asking hasChildren
+DEFAULT_LEAF_FLAGS = DEFAULT_FLAGS | QtCore.Qt.ItemNeverHasChildren
+# roles answered from the preset style, the delegate asks them for every painted cell
+STYLE_ROLES = frozenset([
+    QtCore.Qt.BackgroundRole, QtCore.Qt.ForegroundRole, QtCore.Qt.FontRole, QtCore.Qt.SizeHintRole,
+    QtCore.Qt.DecorationRole, QtCore.Qt.TextAlignmentRole, QtCore.Qt.CheckStateRole, PAINT_STYLE_ROLE
+])
+# (bg_color, bg_alpha, text_color, text_alpha, size, bold) to ItemStyle, shared by all the models
+ITEM_STYLES = {}
+
+
+def freeze_value(value):
+    """Return a hashable key of the item kwargs value, lists and dictionaries are converted to tuples.
+
+    Args:
+        value (object): The item kwargs value.
+
+    Returns:
+        object: The hashable key, raises TypeError if the value can't be hashed.
+
+    """
+
+    if isinstance(value, list):
+        return ('list',) + tuple(freeze_value(element) for element in value)
+    if isinstance(value, dict):
+        return ('dict',) + tuple(sorted((key, freeze_value(element)) for key, element in value.items()))
+
+    hash(value)
+    return value
+
+
+def get_item_style(item_kwargs):
+    """Return the shared style of the item kwargs colors and font, created once per style.
+
+    Args:
+        item_kwargs (dict): Item setting dictionary, see TreeView._create_item.
+
+    Returns:
+        ItemStyle/None: The shared style, None if the item kwargs has no colors or font.
+
+    """
+
+    try:
+        style_key = (
+            tuple(item_kwargs['bg_color']), item_kwargs['bg_alpha'],
+            tuple(item_kwargs['text_color']), item_kwargs['text_alpha'],
+            item_kwargs['size'], item_kwargs['bold']
+        )
+    except (KeyError, TypeError):
+        return None
+
+    item_style = ITEM_STYLES.get(style_key)
+    if item_style is None:
+        item_style = ITEM_STYLES[style_key] = ItemStyle(*style_key)
+
+    return item_style
+
+
+def get_rows_ranges(rows):
+    """Coalesce the rows numbers into contiguous ranges.
+
+    Args:
+        rows (list): The rows numbers.
+
+    Returns:
+        list: The list of (first row, count) ranges, from back -> forward,
+              so removing / moving a range doesn't change the rows numbers of the next ranges.
+
+    """
+
+    ranges = []
+    for row in sorted(set(rows), reverse=True):
+        if ranges and ranges[-1][0] == row + 1:
+            ranges[-1] = (row, ranges[-1][1] + 1)
+        else:
+            ranges.append((row, 1))
+
+    return ranges
+
+
+class ItemStyle(object):
+    """Qt colors, brushes, pen and font of a cell style, shared by all the cells with the same style,
+       they must not be modified.
+
+    """
+
+    __slots__ = ('bg_color', 'bg_brush', 'text_color', 'text_brush', 'text_pen', 'font')
+
+    def __init__(self, bg_color, bg_alpha, text_color, text_alpha, size, bold):
+        """Initial setting for ItemStyle.
+
+        Args:
+            bg_color (tuple): (int, int, int) back ground color.
+            bg_alpha (int): Back ground alpha.
+            text_color (tuple): (int, int, int) text color.
+            text_alpha (int): Text alpha.
+            size (int): Font point size.
+            bold (bool): Bold font.
+
+        """
+
+        # item back ground color -----------------------------------------------------------
+        self.bg_color = QtGui.QColor(bg_color[0], bg_color[1], bg_color[2], bg_alpha)
+        self.bg_brush = QtGui.QBrush()
+        self.bg_brush.setColor(self.bg_color)
+
+        # item text color -----------------------------------------------------------
+        self.text_color = QtGui.QColor(text_color[0], text_color[1], text_color[2], text_alpha)
+        self.text_brush = QtGui.QBrush()
+        self.text_brush.setColor(self.text_color)
+        self.text_pen = QtGui.QPen(self.text_color)
+
+        # item text font -----------------------------------------------------------
+        self.font = QtGui.QFont()
+        self.font.setFamily('Segoe UI')
+        self.font.setPointSize(size)
+        self.font.setBold(bold)
+
+
+class Item(object):
+    """QtGui.QStandardItem compatible facade of a ItemModel cell.
+
+    An item created by itself holds its own data until its row is added to a model,
+    then it is a view of the (node, column) cell of the model, items of the same cell are equal.
+
+    """
+
+    __slots__ = ('_model', '_node', '_column', '_cell')
+
+    def __init__(self, text='', item_kwargs=None):
+        """Initial setting for Item, not in any model yet.
+
+        Args:
+            text (str): The display text.
+            item_kwargs (dict/None): Item setting dictionary, see TreeView._create_item.
+
+        """
+
+        self._model = None
+        self._node = DETACHED_NODE
+        self._column = 0
+        # roles data until the item is added to a model
+        self._cell = {QtCore.Qt.DisplayRole: text, KWARGS_ROLE: item_kwargs}
+        if item_kwargs is not None and 'toolTip' in item_kwargs:
+            self._cell[QtCore.Qt.ToolTipRole] = item_kwargs['toolTip']
+
+    @classmethod
+    def from_preset(cls, preset, default, tool_tip=None):
+        """Return a new item of the model preset, not in any model yet, no item kwargs dictionary is created.
+
+        Args:
+            preset (int): The preset id of the model the item is added to, see ItemModel.get_preset.
+            default (object): The item default value, the display text is its string.
+            tool_tip (str/None): The item tool tip.
+
+        Returns:
+            Item: The new item.
+
+        """
+
+        item = cls.__new__(cls)
+        item._model = None
+        item._node = DETACHED_NODE
+        item._column = 0
+        item._cell = {QtCore.Qt.DisplayRole: str(default), PRESET_CELL_KEY: (preset, default)}
+        if tool_tip is not None:
+            item._cell[QtCore.Qt.ToolTipRole] = tool_tip
+
+        return item
+
+    @classmethod
+    def from_cell(cls, model, node, column):
+        """Return the item of the model cell.
+
+        Args:
+            model (ItemModel): The model.
+            node (int): The row node.
+            column (int): The column number.
+
+        Returns:
+            Item: The item of the cell.
+
+        """
+
+        item = cls.__new__(cls)
+        item._model = model
+        item._node = node
+        item._column = column
+        item._cell = None
+
+        return item
+
+    def __eq__(self, other):
+        if self._cell is not None or not isinstance(other, Item):
+            return self is other
+        return self._model is other._model and self._node == other._node and self._column == other._column
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        if self._cell is not None:
+            return id(self)
+        return hash((id(self._model), self._node, self._column))
+
+    def __repr__(self):
+        if self._cell is not None:
+            return '<Item object at {}>'.format(hex(id(self)))
+        return '<Item node {} column {} of {}>'.format(self._node, self._column, hex(id(self._model)))
+
+    def model(self):
+        return self._model
+
+    def node(self):
+        return self._node
+
+    def index(self):
+        if self._cell is not None:
+            return QtCore.QModelIndex()
+        return self._model.node_index(node=self._node, column=self._column)
+
+    def data(self, role=QtCore.Qt.UserRole + 1):
+        if self._cell is not None:
+            return self._cell.get(role)
+        return self._model.get_cell_data(node=self._node, column=self._column, role=role)
+
+    def setData(self, value, role=QtCore.Qt.UserRole + 1):
+        if self._cell is not None:
+            self._cell[role] = value
+            return
+        self._model.set_cell_data(node=self._node, column=self._column, value=value, role=role)
+
+    def text(self):
+        text = self.data(role=QtCore.Qt.DisplayRole)
+        return '' if text is None else str(text)
+
+    def setText(self, text):
+        self.setData(text, role=QtCore.Qt.DisplayRole)
+
+    def toolTip(self):
+        return self.data(role=QtCore.Qt.ToolTipRole) or ''
+
+    def setToolTip(self, tool_tip):
+        self.setData(tool_tip, role=QtCore.Qt.ToolTipRole)
+
+    def background(self):
+        return self.data(role=QtCore.Qt.BackgroundRole) or QtGui.QBrush()
+
+    def setBackground(self, brush):
+        self.setData(brush, role=QtCore.Qt.BackgroundRole)
+
+    def foreground(self):
+        return self.data(role=QtCore.Qt.ForegroundRole) or QtGui.QBrush()
+
+    def setForeground(self, brush):
+        self.setData(brush, role=QtCore.Qt.ForegroundRole)
+
+    def font(self):
+        return self.data(role=QtCore.Qt.FontRole) or QtGui.QFont()
+
+    def setFont(self, font):
+        self.setData(font, role=QtCore.Qt.FontRole)
+
+    def isEditable(self):
+        item_kwargs = self.data(role=KWARGS_ROLE)
+        return item_kwargs is None or bool(item_kwargs.get('editable', True))
+
+    def setEditable(self, editable):
+        item_kwargs = self.data(role=KWARGS_ROLE)
+        if item_kwargs is not None:
+            item_kwargs['editable'] = editable
+            self.setData(item_kwargs, role=KWARGS_ROLE)
+
+    def row(self):
+        if self._cell is not None or self._node == ROOT_NODE:
+            return -1
+        return self._model.get_node_row(node=self._node)
+
+    def column(self):
+        if self._cell is not None or self._node == ROOT_NODE:
+            return -1
+        return self._column
+
+    def parent(self):
+        if self._cell is not None:
+            return None
+        parent_node = self._model.get_parent_node(node=self._node)
+        if parent_node <= ROOT_NODE:
+            return None
+        return Item.from_cell(model=self._model, node=parent_node, column=0)
+
+    def rowCount(self):
+        if self._cell is not None or self._column:
+            return 0
+        return len(self._model.get_children_nodes(node=self._node))
+
+    def columnCount(self):
+        if self._cell is not None or self._column or not self._model.has_children_list(node=self._node):
+            return 0
+        return self._model.columnCount()
+
+    def hasChildren(self):
+        return self.rowCount() > 0
+
+    def child(self, row, column=0):
+        if self._cell is not None or self._column:
+            return None
+        return self._model.get_child_item(node=self._node, row=row, column=column)
+
+    def appendRow(self, items):
+        self.insertRow(self.rowCount(), items)
+
+    def insertRow(self, row, items):
+        self._model.insert_rows(parent_node=self._node, row=row, rows_items=[items])
+
+    def takeRow(self, row):
+        return self._model.take_row(parent_node=self._node, row=row)
+
+    def removeRow(self, row):
+        self._model.remove_rows(parent_node=self._node, row=row, count=1)
+
+    def removeRows(self, row, count):
+        self._model.remove_rows(parent_node=self._node, row=row, count=count)
+
+    def setChild(self, row, column, item):
+        self._model.set_child(parent_node=self._node, row=row, column=column, item=item)
+
+    def setColumnCount(self, columns):
+        self._model.set_children_column_count(node=self._node, columns=columns)
+
+
+class ItemModel(QtCore.QAbstractItemModel):
+    """Tree item model stored in compact arrays, replaces QtGui.QStandardItemModel for TreeView.
+
+    Every row is a node id, the tree is kept in arrays of node parents and rows and lists of children nodes,
+    the cells are kept in per column arrays of display text, default value, tool tip and preset id.
+    Item kwargs except 'default' and 'toolTip' are shared by the cells in the presets table,
+    their brushes, font and size hint are created once per preset and answered to data() on demand.
+    Rows can be hidden from the views, example: the rows filtered out, the views only see the other rows,
+    the items, the rows numbers and the signals of the model methods are the rows of the model as they are.
+
+    The views ask index() once and flags() twice for every laid out row, each a call through the Python bindings,
+    so the first layout of a long flat list stays slower than QtGui.QStandardItemModel, about 0.45s against 0.05s
+    for 100000 top level rows. It is the accepted trade-off of a load twice faster and a memory 50 times smaller,
+    see benchmarks/modelBenchmark.py, the rows under a folder row are only laid out once it is expanded.
+
+    """
+
+    # moved rows nodes in their new order, the destination node, emitted after the rows are moved
+    nodes_moved = QtCore.Signal(object, int)
+    # rows nodes taken out or removed with one layout change, emitted before, instead of rowsAboutToBeRemoved
+    nodes_about_to_be_taken = QtCore.Signal(object)
+    # rows nodes inserted back with one layout change, the parent node, emitted after they are inserted
+    nodes_inserted = QtCore.Signal(object, int)
+    # removed rows nodes, emitted after the rows and all their descendants are removed, their nodes are reused after
+    nodes_removed = QtCore.Signal(object)
+    # rows nodes whose cells changed, the views don't see them, emitted instead of dataChanged
+    nodes_changed = QtCore.Signal(object)
+
+    def __init__(self, columns=1, parent=None):
+        """Initial setting for ItemModel.
+
+        Args:
+            columns (int): The columns count.
+            parent (QtCore.QObject/None): Parent object.
+
+        """
+
+        super(ItemModel, self).__init__(parent)
+
+        # preset id to shared kwargs, present cell kwargs keys, (kwargs key, flat list or not) of the mutable values,
+        # flags, leaf rows flags and style, preset 0 is the cells without kwargs.
+        self._presets = [None]
+        self._presets_cell_keys = [()]
+        self._presets_mutable_keys = [()]
+        self._presets_flags = [DEFAULT_FLAGS]
+        self._presets_leaf_flags = [DEFAULT_LEAF_FLAGS]
+        self._presets_styles = [{}]
+        self._presets_ids = {}
+
+        self._reset_storage(columns=columns)
+
+    def _reset_storage(self, columns):
+        """Drop all the rows, only the invisible root node is left.
+
+        """
+
+        self._column_count = 0
+        self._parents = array.array('i', [DETACHED_NODE])
+        self._rows = array.array('i', [-1])
+        self._children = [[]]
+        self._texts = []
+        self._defaults = []
+        self._tool_tips = []
+        self._cell_presets = []
+        # (node, column, role) to the roles data not stored in the arrays
+        self._cell_data = {}
+        self._header_items = {}
+        # node to the callback adding its children once it is expanded, see set_fetch_callback
+        self._fetch_callbacks = {}
+        # released nodes, reused by the next new nodes before the arrays grow
+        self._released_nodes = []
+        # rows nodes hidden from the views, parent node to its children nodes the views see, only for the parents
+        # with hidden children, and those children nodes to their rows in the views, see set_hidden_nodes
+        self._hidden_nodes = set()
+        self._view_children = {}
+        self._view_rows = {}
+        self._add_columns(columns=columns)
+
+    def _add_columns(self, columns):
+        """Add empty columns arrays up to the columns count.
+
+        """
+
+        nodes_count = len(self._parents)
+        for _ in range(self._column_count, columns):
+            self._texts.append([None] * nodes_count)
+            self._defaults.append([None] * nodes_count)
+            self._tool_tips.append([None] * nodes_count)
+            self._cell_presets.append(array.array('i', [-1]) * nodes_count)
+        self._column_count = max(self._column_count, columns)
+
+    def get_preset(self, item_kwargs):
+        """Return the preset id of the item kwargs, item kwargs with the same shared values have the same preset.
+
+        Args:
+            item_kwargs (dict/None): Item setting dictionary.
+
+        Returns:
+            int: The preset id, 0 if there is no item kwargs.
+
+        """
+
+        if item_kwargs is None:
+            return 0
+
+        cell_keys = tuple(key for key in CELL_KWARGS_KEYS if key in item_kwargs)
+        try:
+            # only the lists and dictionaries values need to be frozen
+            preset_key = (
+                tuple(sorted(
+                    (key, freeze_value(value) if isinstance(value, (list, dict)) else value)
+                    for key, value in item_kwargs.items() if key not in CELL_KWARGS_KEYS
+                )),
+                cell_keys
+            )
+            preset = self._presets_ids.get(preset_key)
+        except TypeError:
+            # not hashable values, the item kwargs has its own preset
+            preset_key = None
+            preset = None
+
+        if preset is None:
+            preset = len(self._presets)
+            if preset_key is not None:
+                self._presets_ids[preset_key] = preset
+
+            shared_kwargs = copy.deepcopy(
+                dict((key, value) for key, value in item_kwargs.items() if key not in CELL_KWARGS_KEYS)
+            )
+            self._presets.append(shared_kwargs)
+            self._presets_cell_keys.append(cell_keys)
+            self._presets_mutable_keys.append(
+                tuple(
+                    (key, isinstance(value, list) and not any(isinstance(element, (list, dict)) for element in value))
+                    for key, value in shared_kwargs.items() if isinstance(value, (list, dict))
+                )
+            )
+            flags = DEFAULT_FLAGS
+            if not shared_kwargs.get('editable', True):
+                flags &= ~QtCore.Qt.ItemIsEditable
+            self._presets_flags.append(flags)
+            self._presets_leaf_flags.append(flags | QtCore.Qt.ItemNeverHasChildren)
+            # style is created on the first data() of the preset
+            self._presets_styles.append(None)
+
+        return preset
+
+    def get_preset_kwargs(self, preset):
+        """Return a copy of the shared item kwargs of the preset, without 'default' and 'toolTip'.
+
+        Args:
+            preset (int): The preset id.
+
+        Returns:
+            dict/None: The item kwargs, None for the cells without kwargs.
+
+        """
+
+        shared_kwargs = self._presets[preset]
+        if shared_kwargs is None:
+            return None
+
+        item_kwargs = dict(shared_kwargs)
+        for key, flat in self._presets_mutable_keys[preset]:
+            # flat lists, example: the colors, don't need a deep copy
+            item_kwargs[key] = list(item_kwargs[key]) if flat else copy.deepcopy(item_kwargs[key])
+
+        return item_kwargs
+
+    def _get_preset_style(self, preset):
+        """Return the brushes, font, paint style and size hint roles data of the preset.
+
+        """
+
+        style = self._presets_styles[preset]
+        if style is not None:
+            return style
+
+        item_kwargs = self._presets[preset]
+        style = {}
+        item_style = get_item_style(item_kwargs=item_kwargs)
+        if item_style is not None:
+            style[QtCore.Qt.BackgroundRole] = item_style.bg_brush
+            style[QtCore.Qt.ForegroundRole] = item_style.text_brush
+            style[QtCore.Qt.FontRole] = item_style.font
+            if item_kwargs.get('paint'):
+                style[PAINT_STYLE_ROLE] = item_style
+        if 'column_size' in item_kwargs:
+            style[QtCore.Qt.SizeHintRole] = QtCore.QSize(item_kwargs['column_size'], 35)
+
+        self._presets_styles[preset] = style
+
+        return style
+
+    # -------------------------------- cells --------------------------------
+    def get_cell_data(self, node, column, role):
+        """Return the role data of the cell.
+
+        Args:
+            node (int): The row node.
+            column (int): The column number.
+            role (int): The data role.
+
+        Returns:
+            object: The role data, None if not set.
+
+        """
+
+        if node == ROOT_NODE or column >= self._column_count:
+            return None
+
+        if role == QtCore.Qt.DisplayRole or role == QtCore.Qt.EditRole:
+            return self._texts[column][node]
+        if role == QtCore.Qt.ToolTipRole:
+            return self._tool_tips[column][node]
+
+        if self._cell_data:
+            value = self._cell_data.get((node, column, role))
+            if value is not None:
+                return value
+
+        preset = self._cell_presets[column][node]
+        if preset <= 0:
+            return None
+
+        if role == KWARGS_ROLE:
+            item_kwargs = self.get_preset_kwargs(preset=preset)
+            cell_keys = self._presets_cell_keys[preset]
+            if 'default' in cell_keys:
+                item_kwargs['default'] = self._defaults[column][node]
+            if 'toolTip' in cell_keys:
+                item_kwargs['toolTip'] = self._tool_tips[column][node]
+            return item_kwargs
+
+        return self._get_preset_style(preset).get(role)
+
+    def set_cell_data(self, node, column, value, role, emit=True):
+        """Set the role data of the cell, setting the item kwargs also sets the cell preset, default and tool tip.
+
+        Args:
+            node (int): The row node.
+            column (int): The column number.
+            value (object): The role data.
+            role (int): The data role.
+            emit (bool): Emit dataChanged of the cell.
+
+        """
+
+        if node == ROOT_NODE:
+            return
+
+        if column >= self._column_count:
+            self.setColumnCount(column + 1)
+
+        if role == QtCore.Qt.DisplayRole or role == QtCore.Qt.EditRole:
+            self._texts[column][node] = value
+        elif role == QtCore.Qt.ToolTipRole:
+            self._tool_tips[column][node] = value
+        elif role == KWARGS_ROLE:
+            self._cell_presets[column][node] = self.get_preset(item_kwargs=value)
+            if value is not None:
+                self._defaults[column][node] = value.get('default')
+                if 'toolTip' in value:
+                    self._tool_tips[column][node] = value['toolTip']
+        elif value is None:
+            self._cell_data.pop((node, column, role), None)
+        else:
+            self._cell_data[(node, column, role)] = value
+
+        # a cell with any data exists
+        if self._cell_presets[column][node] < 0:
+            self._cell_presets[column][node] = 0
+
+        if emit and self._parents[node] >= ROOT_NODE:
+            self._emit_cell_changed(node=node, column=column)
+
+    def get_cell_state(self, node, column, roles=()):
+        """Return the state of the cell to set it back with set_cell_state, no item kwargs dictionary is created.
+
+        Args:
+            node (int): The row node.
+            column (int): The column number.
+            roles (tuple): The roles whose data set on the cell is kept too, example: (QtCore.Qt.SizeHintRole,)
+
+        Returns:
+            tuple: (display text, default, tool tip, preset id, ((role, data set on the cell or None),))
+
+        """
+
+        return (
+            self._texts[column][node],
+            self._defaults[column][node],
+            self._tool_tips[column][node],
+            self._cell_presets[column][node],
+            tuple((role, self._cell_data.get((node, column, role))) for role in roles)
+        )
+
+    def set_cell_state(self, node, column, state):
+        """Set the cell back to the state of get_cell_state.
+
+        Args:
+            node (int): The row node.
+            column (int): The column number.
+            state (tuple): The cell state.
+
+        """
+
+        text, default, tool_tip, preset, roles_data = state
+        self._texts[column][node] = text
+        self._defaults[column][node] = default
+        self._tool_tips[column][node] = tool_tip
+        self._cell_presets[column][node] = preset
+        for role, value in roles_data:
+            if value is None:
+                self._cell_data.pop((node, column, role), None)
+            else:
+                self._cell_data[(node, column, role)] = value
+
+        if self.is_in_model(node=node):
+            self._emit_cell_changed(node=node, column=column)
+
+    def _emit_cell_changed(self, node, column):
+        """Emit dataChanged of the cell, or nodes_changed if the views don't see its row.
+
+        """
+
+        index = self.node_index(node=node, column=column)
+        if index.isValid():
+            self.dataChanged.emit(index, index)
+        else:
+            self.nodes_changed.emit([node])
+
+    def _set_cell_from_item(self, node, column, item):
+        """Move the data of the item created by itself into the cell, the item becomes the view of the cell.
+
+        """
+
+        if item._cell is None:
+            raise ValueError('The item is already in a model.')
+
+        cell = item._cell
+        self._texts[column][node] = cell.pop(QtCore.Qt.DisplayRole, None)
+        self._tool_tips[column][node] = cell.pop(QtCore.Qt.ToolTipRole, None)
+        if PRESET_CELL_KEY in cell:
+            # item of a preset, the preset is already known
+            self._cell_presets[column][node], self._defaults[column][node] = cell.pop(PRESET_CELL_KEY)
+        else:
+            item_kwargs = cell.pop(KWARGS_ROLE, None)
+            self._cell_presets[column][node] = self.get_preset(item_kwargs=item_kwargs)
+            if item_kwargs is not None:
+                self._defaults[column][node] = item_kwargs.get('default')
+        for role, value in cell.items():
+            if value is not None:
+                self._cell_data[(node, column, role)] = value
+
+        item._model = self
+        item._node = node
+        item._column = column
+        item._cell = None
+
+    # -------------------------------- nodes --------------------------------
+    def node_index(self, node, column=0):
+        """Return the model index of the node cell, invalid index for the invisible root node,
+           and for the rows the views don't see, hidden or under a hidden row, once rows are hidden.
+
+        Args:
+            node (int): The row node.
+            column (int): The column number.
+
+        Returns:
+            QtCore.QModelIndex: The model index, its row is the row in the views.
+
+        """
+
+        if node <= ROOT_NODE or self._parents[node] < ROOT_NODE:
+            return QtCore.QModelIndex()
+
+        if not self._hidden_nodes:
+            return self.createIndex(self._rows[node], column, node)
+
+        ancestor_node = node
+        while ancestor_node > ROOT_NODE:
+            if ancestor_node in self._hidden_nodes:
+                return QtCore.QModelIndex()
+            ancestor_node = self._parents[ancestor_node]
+        if ancestor_node < ROOT_NODE:
+            return QtCore.QModelIndex()
+
+        if self._parents[node] in self._view_children:
+            return self.createIndex(self._view_rows[node], column, node)
+
+        return self.createIndex(self._rows[node], column, node)
+
+    def get_node_row(self, node):
+        return self._rows[node]
+
+    def get_parent_node(self, node):
+        return self._parents[node]
+
+    def get_children_nodes(self, node):
+        return self._children[node] or ()
+
+    def get_cell_preset(self, node, column):
+        return self._cell_presets[column][node]
+
+    def get_cell_default(self, node, column):
+        return self._defaults[column][node]
+
+    def has_children_list(self, node):
+        return self._children[node] is not None
+
+    def is_in_model(self, node):
+        """Check if the row node is in the model, not removed, taken out or under a row taken out.
+
+        Args:
+            node (int): The row node.
+
+        Returns:
+            bool: True if in the model or False if not.
+
+        """
+
+        while node > ROOT_NODE:
+            node = self._parents[node]
+
+        return node == ROOT_NODE
+
+    def get_hidden_nodes(self):
+        return frozenset(self._hidden_nodes)
+
+    def set_hidden_nodes(self, hide_nodes=(), show_nodes=()):
+        """Hide rows of the model from the views and show hidden rows back, with one layout change,
+           the views lay out only the rows they see. The hidden rows stay in the model as they are,
+           rows taken out of the model are not hidden any more.
+
+        Args:
+            hide_nodes (iterable): The rows nodes in the model to hide.
+            show_nodes (iterable): The hidden rows nodes to show.
+
+        """
+
+        hide_nodes = set(hide_nodes).difference(self._hidden_nodes)
+        show_nodes = self._hidden_nodes.intersection(show_nodes)
+        show_nodes.difference_update(hide_nodes)
+        if not hide_nodes and not show_nodes:
+            return
+
+        parents = self._parents
+        old_indexes = self._begin_layout_change()
+        if len(show_nodes) == len(self._hidden_nodes):
+            # all the rows are shown, the views see all the children rows again
+            self._hidden_nodes = set()
+            self._view_children = {}
+            self._view_rows = {}
+            parents_nodes = set()
+        else:
+            self._hidden_nodes.difference_update(show_nodes)
+            parents_nodes = set(map(parents.__getitem__, show_nodes))
+        parents_nodes.update(map(parents.__getitem__, hide_nodes))
+        self._hidden_nodes.update(hide_nodes)
+        self._end_layout_change(old_indexes=old_indexes, parents_nodes=parents_nodes)
+
+    def _has_view_rows(self, node):
+        """Check if the views see the children rows of the node as they are, no children row is hidden,
+           and the node is not hidden or under a hidden row.
+
+        """
+
+        if not self._hidden_nodes:
+            return True
+        if node in self._view_children:
+            return False
+
+        while node > ROOT_NODE:
+            if node in self._hidden_nodes:
+                return False
+            node = self._parents[node]
+
+        return True
+
+    def _update_view_children(self, node):
+        """Update the children rows the views see of the node, once its children rows are changed or hidden.
+
+        """
+
+        children = self._children[node] or ()
+        hidden_nodes = self._hidden_nodes
+        view_children = [child for child in children if child not in hidden_nodes] if hidden_nodes else children
+        if len(view_children) == len(children):
+            # the rows of the views of the nodes without parent with hidden children are not read, left as they are
+            self._view_children.pop(node, None)
+            return
+
+        self._view_children[node] = view_children
+        view_rows = self._view_rows
+        for row, child in enumerate(view_children):
+            view_rows[child] = row
+
+    def _unhide_nodes(self, nodes):
+        """Drop the hidden state of the rows taken out of the model and all their descendants.
+
+        """
+
+        if not self._hidden_nodes:
+            return
+
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            self._hidden_nodes.discard(node)
+            self._view_children.pop(node, None)
+            if self._children[node]:
+                stack.extend(self._children[node])
+
+        if not self._hidden_nodes:
+            self._view_children = {}
+            self._view_rows = {}
+
+    def _view_row_to_row(self, parent_node, row):
+        """Return the row number of the row of the views under the parent node, the rows after the last row of the
+           views are after the last row it sees.
+
+        """
+
+        view_children = self._view_children.get(parent_node)
+        if view_children is None or row < 0:
+            return row
+        if row < len(view_children):
+            return self._rows[view_children[row]]
+
+        return self._rows[view_children[-1]] + 1 if view_children else len(self._children[parent_node])
+
+    def _begin_layout_change(self):
+        """Start a layout change of the rows changed together.
+
+        Returns:
+            list: The persistent indexes, to update with _end_layout_change.
+
+        """
+
+        self.layoutAboutToBeChanged.emit()
+
+        return self.persistentIndexList()
+
+    def _end_layout_change(self, old_indexes, parents_nodes=()):
+        """Update the persistent indexes to the changed rows and end the layout change.
+           The indexes of the rows taken out or hidden, and of the rows under them, are invalid.
+
+        Args:
+            old_indexes (list): The persistent indexes of _begin_layout_change.
+            parents_nodes (iterable): The parents nodes whose children rows are changed or hidden.
+
+        """
+
+        if self._hidden_nodes or self._view_children:
+            for node in parents_nodes:
+                self._update_view_children(node=node)
+
+        self.changePersistentIndexList(
+            old_indexes, [
+                self.node_index(node=index.internalId(), column=index.column())
+                if self.is_in_model(node=index.internalId()) else QtCore.QModelIndex()
+                for index in old_indexes
+            ]
+        )
+        self.layoutChanged.emit()
+
+    def get_child_item(self, node, row, column=0):
+        """Return the item of the child cell, None if the cell is empty.
+
+        Args:
+            node (int): The parent row node.
+            row (int): The child row number.
+            column (int): The column number.
+
+        Returns:
+            Item/None: The child item.
+
+        """
+
+        children = self._children[node]
+        if not children or not 0 <= row < len(children) or not 0 <= column < self._column_count:
+            return None
+
+        child_node = children[row]
+        if self._cell_presets[column][child_node] < 0:
+            return None
+
+        return Item.from_cell(model=self, node=child_node, column=column)
+
+    def get_rows_texts(self, node, rows):
+        """Return the display texts of all the columns of the children rows, without creating their items.
+
+        Args:
+            node (int): The parent row node.
+            rows (iterable): The children rows numbers.
+
+        Returns:
+            list: The list of (child node, [columns display texts, None for the empty cells]) of the rows.
+
+        """
+
+        children = self._children[node] or ()
+        columns = range(self._column_count)
+        texts = self._texts
+        cell_presets = self._cell_presets
+
+        rows_texts = []
+        for row in rows:
+            if not 0 <= row < len(children):
+                continue
+            child_node = children[row]
+            rows_texts.append((
+                child_node,
+                [
+                    None if cell_presets[column][child_node] < 0 else
+                    '' if texts[column][child_node] is None else str(texts[column][child_node])
+                    for column in columns
+                ]
+            ))
+
+        return rows_texts
+
+    def _new_nodes(self, count):
+        """Add empty row nodes at once, not under any parent yet, the released nodes are reused first.
+
+        Args:
+            count (int): The number of nodes.
+
+        Returns:
+            list: The new nodes.
+
+        """
+
+        released_nodes = self._released_nodes
+        reused_nodes = released_nodes[len(released_nodes) - min(count, len(released_nodes)):]
+        del released_nodes[len(released_nodes) - len(reused_nodes):]
+        # the cells of the released nodes are already empty
+        for node in reused_nodes:
+            self._parents[node] = DETACHED_NODE
+
+        count -= len(reused_nodes)
+        node = len(self._parents)
+        self._parents.extend(array.array('i', [DETACHED_NODE]) * count)
+        self._rows.extend(array.array('i', [-1]) * count)
+        self._children.extend([None] * count)
+        for column in range(self._column_count):
+            self._texts[column].extend([None] * count)
+            self._defaults[column].extend([None] * count)
+            self._tool_tips[column].extend([None] * count)
+            self._cell_presets[column].extend(array.array('i', [-1]) * count)
+
+        return reused_nodes + list(range(node, node + count))
+
+    def _renumber_rows(self, children, start):
+        """Update the rows numbers of the children nodes from the start row.
+
+        """
+
+        rows = self._rows
+        for row in range(start, len(children)):
+            rows[children[row]] = row
+
+    def set_children_column_count(self, node, columns):
+        """Set the children columns count of the node, the model columns are only increased.
+
+        Args:
+            node (int): The row node.
+            columns (int): The columns count.
+
+        """
+
+        if self._children[node] is None:
+            self._children[node] = []
+        if columns > self._column_count:
+            self.setColumnCount(columns)
+
+    def insert_rows(self, parent_node, row, rows_items):
+        """Insert rows of items under the parent node.
+           Items created by themselves are moved into new rows, rows taken out of this model are inserted back.
+
+        Args:
+            parent_node (int): The parent row node.
+            row (int): The row number to insert at.
+            rows_items (list): The list of rows with list of columns items on each row [[columns items],]
+
+        Returns:
+            list: The inserted rows nodes.
+
+        """
+
+        if not rows_items:
+            return []
+
+        columns = max(len(row_items) for row_items in rows_items)
+        if columns > self._column_count:
+            self.setColumnCount(columns)
+
+        children = self._children[parent_node]
+        if children is None:
+            children = self._children[parent_node] = []
+        row = min(max(row, 0), len(children))
+
+        # nodes of the rows taken out of this model, None for the new rows, their nodes are added at once
+        taken_nodes = []
+        for row_items in rows_items:
+            taken_items = [item for item in row_items if item is not None and item._cell is None]
+            if taken_items:
+                node = taken_items[0]._node
+                if taken_items[0]._model is not self or self._parents[node] != DETACHED_NODE:
+                    raise ValueError('The row is already in a model.')
+                taken_nodes.append(node)
+            else:
+                taken_nodes.append(None)
+        new_nodes = iter(self._new_nodes(count=taken_nodes.count(None)))
+
+        # the views don't see the rows as they are under the parent, inserted with one layout change
+        view_rows = self._has_view_rows(node=parent_node)
+        if view_rows:
+            self.beginInsertRows(self.node_index(node=parent_node), row, row + len(rows_items) - 1)
+        else:
+            old_indexes = self._begin_layout_change()
+
+        nodes = []
+        for row_items, node in zip(rows_items, taken_nodes):
+            if node is None:
+                node = next(new_nodes)
+                for column, item in enumerate(row_items):
+                    if item is not None:
+                        self._set_cell_from_item(node=node, column=column, item=item)
+
+            self._parents[node] = parent_node
+            nodes.append(node)
+
+        children[row:row] = nodes
+        self._renumber_rows(children=children, start=row)
+
+        if view_rows:
+            self.endInsertRows()
+        else:
+            self._end_layout_change(old_indexes=old_indexes, parents_nodes=[parent_node])
+            self.nodes_inserted.emit(nodes, parent_node)
+
+        return nodes
+
+    def insert_rows_ranges(self, parent_node, rows_ranges):
+        """Insert the rows ranges taken out of this model back under the parent node.
+           A single range is inserted with one rows insertion, several ranges with one layout change.
+
+        Args:
+            parent_node (int): The parent row node.
+            rows_ranges (list): The list of (first row number, taken rows nodes) ranges from forward -> back,
+                                the row numbers are the rows once the previous ranges are inserted.
+
+        Returns:
+            list: The inserted rows nodes.
+
+        """
+
+        rows_ranges = [(row, list(nodes)) for row, nodes in rows_ranges if nodes]
+        if len(rows_ranges) <= 1:
+            return [
+                node for row, nodes in rows_ranges for node in self.insert_rows(
+                    parent_node=parent_node,
+                    row=row,
+                    rows_items=[[Item.from_cell(model=self, node=node, column=0)] for node in nodes]
+                )
+            ]
+
+        inserted_nodes = [node for _, nodes in rows_ranges for node in nodes]
+        if any(self._parents[node] != DETACHED_NODE for node in inserted_nodes):
+            raise ValueError('The row is already in a model.')
+
+        children = self._children[parent_node]
+        if children is None:
+            children = self._children[parent_node] = []
+
+        old_indexes = self._begin_layout_change()
+
+        start = None
+        for row, nodes in rows_ranges:
+            row = min(max(row, 0), len(children))
+            children[row:row] = nodes
+            start = row if start is None else min(start, row)
+        for node in inserted_nodes:
+            self._parents[node] = parent_node
+        self._renumber_rows(children=children, start=start)
+
+        self._end_layout_change(old_indexes=old_indexes, parents_nodes=[parent_node])
+        self.nodes_inserted.emit(inserted_nodes, parent_node)
+
+        return inserted_nodes
+
+    def append_rows(self, parent_node, rows_items):
+        """Append rows of items under the parent at once, the view gets a single rows inserted signal.
+
+        Args:
+            parent_node (int): The parent row node, ROOT_NODE for the top level rows, the hidden rows have no index.
+            rows_items (list): The list of rows with list of columns items on each row [[columns items],]
+
+        Returns:
+            list: The inserted rows nodes.
+
+        """
+
+        children = self._children[parent_node]
+
+        return self.insert_rows(parent_node=parent_node, row=len(children) if children else 0, rows_items=rows_items)
+
+    def take_row(self, parent_node, row):
+        """Take the row out of the model, its items and children stay valid and can be inserted back.
+
+        Args:
+            parent_node (int): The parent row node.
+            row (int): The row number.
+
+        Returns:
+            list: The columns items of the row.
+
+        """
+
+        nodes = self.take_rows(parent_node=parent_node, row=row, count=1)
+        if not nodes:
+            return []
+
+        return [
+            Item.from_cell(model=self, node=nodes[0], column=column) for column in range(self._column_count)
+            if self._cell_presets[column][nodes[0]] >= 0
+        ]
+
+    def take_rows(self, parent_node, row, count):
+        """Take the rows out of the model, their items and children stay valid,
+           they can be inserted back with insert_rows, or released with free_rows.
+
+        Args:
+            parent_node (int): The parent row node.
+            row (int): The first row number.
+            count (int): The number of rows.
+
+        Returns:
+            list: The taken rows nodes, empty list if the rows are out of range or the parent is not in the model.
+
+        """
+
+        children = self._children[parent_node]
+        if not children or row < 0 or count <= 0 or row + count > len(children) or \
+                not self.is_in_model(node=parent_node):
+            return []
+
+        nodes = children[row:row + count]
+        # the views don't see the rows as they are under the parent, taken with one layout change
+        view_rows = self._has_view_rows(node=parent_node)
+        if view_rows:
+            self.beginRemoveRows(self.node_index(node=parent_node), row, row + count - 1)
+        else:
+            self.nodes_about_to_be_taken.emit(nodes)
+            old_indexes = self._begin_layout_change()
+
+        del children[row:row + count]
+        self._renumber_rows(children=children, start=row)
+        self._unhide_nodes(nodes=nodes)
+        for node in nodes:
+            self._parents[node] = DETACHED_NODE
+            self._rows[node] = -1
+
+        if view_rows:
+            self.endRemoveRows()
+        else:
+            self._end_layout_change(old_indexes=old_indexes, parents_nodes=[parent_node])
+
+        return nodes
+
+    def take_rows_ranges(self, parent_node, rows_ranges):
+        """Take the rows ranges out of the model, their items and children stay valid.
+           A single range is taken with one rows removal, several ranges with one layout change,
+           the persistent indexes are updated once instead of once for every range.
+
+        Args:
+            parent_node (int): The parent row node.
+            rows_ranges (list): The list of (first row, count) ranges, not overlapping.
+
+        Returns:
+            list: The list of (first row, taken rows nodes) ranges from back -> forward,
+                  the ranges out of range are skipped, empty list if the parent is not in the model.
+
+        """
+
+        children = self._children[parent_node]
+        if not children or not self.is_in_model(node=parent_node):
+            return []
+
+        rows_ranges = sorted(
+            ((row, count) for row, count in rows_ranges if count > 0 and row >= 0 and row + count <= len(children)),
+            reverse=True
+        )
+        if len(rows_ranges) <= 1:
+            return [
+                (row, self.take_rows(parent_node=parent_node, row=row, count=count)) for row, count in rows_ranges
+            ]
+
+        taken_ranges = [(row, children[row:row + count]) for row, count in rows_ranges]
+        nodes = [node for _, range_nodes in taken_ranges for node in range_nodes]
+        self.nodes_about_to_be_taken.emit(nodes)
+
+        old_indexes = self._begin_layout_change()
+
+        # from back -> forward, the rows numbers of the next ranges are unchanged
+        for row, range_nodes in taken_ranges:
+            del children[row:row + len(range_nodes)]
+        self._unhide_nodes(nodes=nodes)
+        for node in nodes:
+            self._parents[node] = DETACHED_NODE
+            self._rows[node] = -1
+        self._renumber_rows(children=children, start=rows_ranges[-1][0])
+
+        self._end_layout_change(old_indexes=old_indexes, parents_nodes=[parent_node])
+
+        return taken_ranges
+
+    def free_rows(self, nodes):
+        """Release the cells of the rows taken out of the model and all their descendants,
+           they can't be inserted back any more.
+
+        Args:
+            nodes (list): The taken out rows nodes, the rows not taken out are skipped.
+
+        """
+
+        self._free_nodes(nodes=[node for node in nodes if self._parents[node] == DETACHED_NODE])
+
+    def remove_rows(self, parent_node, row, count):
+        """Remove the rows and all their descendants from the model.
+
+        Args:
+            parent_node (int): The parent row node.
+            row (int): The first row number.
+            count (int): The number of rows.
+
+        Returns:
+            bool: True if removed or False if the rows are out of range.
+
+        """
+
+        children = self._children[parent_node]
+        if not children or row < 0 or count <= 0 or row + count > len(children):
+            return False
+
+        nodes = children[row:row + count]
+        # the views don't see the rows as they are under the parent, removed with one layout change
+        view_rows = self._has_view_rows(node=parent_node)
+        if view_rows:
+            self.beginRemoveRows(self.node_index(node=parent_node), row, row + count - 1)
+        else:
+            self.nodes_about_to_be_taken.emit(nodes)
+            old_indexes = self._begin_layout_change()
+
+        del children[row:row + count]
+        self._renumber_rows(children=children, start=row)
+        self._free_nodes(nodes=nodes)
+
+        if view_rows:
+            self.endRemoveRows()
+        else:
+            self._end_layout_change(old_indexes=old_indexes, parents_nodes=[parent_node])
+        self.nodes_removed.emit(nodes)
+
+        return True
+
+    def move_rows(self, parent_node, row, count, destination_node, destination_row):
+        """Move the rows and all their descendants under the destination node, their items stay valid.
+
+        Args:
+            parent_node (int): The parent row node.
+            row (int): The first row number.
+            count (int): The number of rows.
+            destination_node (int): The destination parent row node.
+            destination_row (int): The destination row number, counted before the rows are moved.
+
+        Returns:
+            bool: True if moved or False if the rows are out of range, the parent or the destination is not in the
+                  model, or the destination is one of the rows or under them.
+
+        """
+
+        if not self.is_in_model(node=parent_node) or not self.is_in_model(node=destination_node):
+            return False
+
+        children = self._children[parent_node]
+        if not children or row < 0 or count <= 0 or row + count > len(children):
+            return False
+
+        # the views don't see the rows as they are under the parents, moved with one layout change
+        if not self._has_view_rows(node=parent_node) or not self._has_view_rows(node=destination_node):
+            return bool(self._move_rows_layout(
+                parent_node=parent_node,
+                rows=list(range(row, row + count)),
+                destination_node=destination_node,
+                destination_row=destination_row
+            ))
+
+        destination_children = self._children[destination_node]
+        if destination_children is None:
+            destination_children = self._children[destination_node] = []
+        destination_row = min(max(destination_row, 0), len(destination_children))
+
+        # refused if the destination is inside the moved rows
+        if not self.beginMoveRows(
+            self.node_index(node=parent_node), row, row + count - 1,
+            self.node_index(node=destination_node), destination_row
+        ):
+            return False
+
+        nodes = children[row:row + count]
+        del children[row:row + count]
+        if destination_children is children and destination_row > row:
+            destination_row -= count
+        destination_children[destination_row:destination_row] = nodes
+        for node in nodes:
+            self._parents[node] = destination_node
+
+        self._renumber_rows(children=children, start=row)
+        self._renumber_rows(children=destination_children, start=destination_row)
+        self.endMoveRows()
+        self.nodes_moved.emit(nodes, destination_node)
+
+        return True
+
+    def move_rows_ranges(self, parent_node, rows_ranges, destination_node, destination_row):
+        """Move the rows ranges and all their descendants under the destination node, keeping their order,
+           their items stay valid. A single range is moved with one rows move, several ranges with one layout change,
+           the persistent indexes are updated once instead of once for every range.
+
+        Args:
+            parent_node (int): The parent row node.
+            rows_ranges (list): The list of (first row, count) ranges.
+            destination_node (int): The destination parent row node.
+            destination_row (int): The destination row number, counted before the rows are moved.
+
+        Returns:
+            int: The number of moved rows, 0 if the rows can not be moved as move_rows.
+
+        """
+
+        if len(rows_ranges) == 1:
+            row, count = rows_ranges[0]
+            return count if self.move_rows(
+                parent_node=parent_node,
+                row=row,
+                count=count,
+                destination_node=destination_node,
+                destination_row=destination_row
+            ) else 0
+
+        if not self.is_in_model(node=parent_node) or not self.is_in_model(node=destination_node):
+            return 0
+
+        return self._move_rows_layout(
+            parent_node=parent_node,
+            rows=sorted(set(row for first, count in rows_ranges for row in range(first, first + count))),
+            destination_node=destination_node,
+            destination_row=destination_row
+        )
+
+    def _move_rows_layout(self, parent_node, rows, destination_node, destination_row):
+        """Move the rows with one layout change, see move_rows_ranges.
+
+        Args:
+            parent_node (int): The parent row node, in the model.
+            rows (list): The rows numbers in ascending order.
+            destination_node (int): The destination parent row node, in the model.
+            destination_row (int): The destination row number, counted before the rows are moved.
+
+        Returns:
+            int: The number of moved rows, 0 if the rows can not be moved.
+
+        """
+
+        children = self._children[parent_node] or []
+        if not rows or rows[0] < 0 or rows[-1] >= len(children):
+            return 0
+
+        nodes = [children[row] for row in rows]
+        moved_nodes = set(nodes)
+        node = destination_node
+        while node != ROOT_NODE:
+            if node in moved_nodes:
+                return 0
+            node = self._parents[node]
+
+        destination_children = self._children[destination_node]
+        if destination_children is None:
+            destination_children = self._children[destination_node] = []
+        destination_row = min(max(destination_row, 0), len(destination_children))
+
+        old_indexes = self._begin_layout_change()
+
+        if destination_children is children:
+            destination_row -= sum(1 for row in rows if row < destination_row)
+        children[:] = [node for node in children if node not in moved_nodes]
+        destination_children[destination_row:destination_row] = nodes
+        for node in nodes:
+            self._parents[node] = destination_node
+
+        self._renumber_rows(children=children, start=rows[0])
+        self._renumber_rows(children=destination_children, start=destination_row)
+
+        self._end_layout_change(old_indexes=old_indexes, parents_nodes=set([parent_node, destination_node]))
+        self.nodes_moved.emit(nodes, destination_node)
+
+        return len(nodes)
+
+    def move_nodes(self, nodes, destination_node, rows):
+        """Move the rows under the destination node to the rows numbers, from wherever they are in the model,
+           example: to move the rows moved by move_rows_ranges back. Rows moved together from another parent are moved
+           with one rows move, the others with one layout change, their items stay valid.
+
+        Args:
+            nodes (list): The rows nodes, not under each other.
+            destination_node (int): The destination parent row node.
+            rows (list): The rows numbers of the nodes after moving, in ascending order.
+
+        Returns:
+            bool: True if moved or False if any row or the destination is not in the model,
+                  or the destination is one of the rows or under them.
+
+        """
+
+        nodes = list(nodes)
+        if not nodes or not self.is_in_model(node=destination_node) or \
+                not all(self.is_in_model(node=node) for node in nodes):
+            return False
+
+        moved_nodes = set(nodes)
+        node = destination_node
+        while node != ROOT_NODE:
+            if node in moved_nodes:
+                return False
+            node = self._parents[node]
+
+        parent_node = self._parents[nodes[0]]
+        row = self._rows[nodes[0]]
+        parents_nodes = set(self._parents[node] for node in nodes)
+        if parent_node != destination_node and rows[-1] - rows[0] == len(nodes) - 1 and \
+                self._children[parent_node][row:row + len(nodes)] == nodes:
+            return self.move_rows(
+                parent_node=parent_node,
+                row=row,
+                count=len(nodes),
+                destination_node=destination_node,
+                destination_row=rows[0]
+            )
+
+        destination_children = self._children[destination_node]
+        if destination_children is None:
+            destination_children = self._children[destination_node] = []
+
+        old_indexes = self._begin_layout_change()
+
+        for parent_node in parents_nodes:
+            children = self._children[parent_node]
+            children[:] = [node for node in children if node not in moved_nodes]
+            self._renumber_rows(children=children, start=0)
+        for node, row in zip(nodes, rows):
+            destination_children.insert(row, node)
+            self._parents[node] = destination_node
+        self._renumber_rows(children=destination_children, start=0)
+
+        parents_nodes.add(destination_node)
+        self._end_layout_change(old_indexes=old_indexes, parents_nodes=parents_nodes)
+        self.nodes_moved.emit(nodes, destination_node)
+
+        return True
+
+    def _free_nodes(self, nodes):
+        """Release the cells of the removed nodes and all their descendants, the nodes are reused by _new_nodes.
+
+        """
+
+        removed_nodes = set()
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            removed_nodes.add(node)
+            self._parents[node] = REMOVED_NODE
+            self._rows[node] = -1
+            for column in range(self._column_count):
+                self._texts[column][node] = None
+                self._defaults[column][node] = None
+                self._tool_tips[column][node] = None
+                self._cell_presets[column][node] = -1
+            if self._children[node]:
+                stack.extend(self._children[node])
+            self._children[node] = None
+
+        if self._cell_data:
+            for key in [key for key in self._cell_data if key[0] in removed_nodes]:
+                del self._cell_data[key]
+        if self._fetch_callbacks:
+            for node in removed_nodes.intersection(self._fetch_callbacks):
+                del self._fetch_callbacks[node]
+        if self._hidden_nodes:
+            self._hidden_nodes.difference_update(removed_nodes)
+            for node in removed_nodes.intersection(self._view_children):
+                del self._view_children[node]
+            if not self._hidden_nodes:
+                self._view_children = {}
+                self._view_rows = {}
+        self._released_nodes.extend(removed_nodes)
+
+    def set_fetch_callback(self, node, callback):
+        """Set the callback adding the children of the row, the row has children until it is fetched.
+           The view fetches when the row is expanded, and again when the expanded row is scrolled to its end.
+
+        Args:
+            node (int): The row node, ROOT_NODE for the top level rows, the hidden rows have no index.
+            callback (function/None): Takes the row first column item, adds its children rows,
+                                      returns True if there are more children rows to add on the next fetch.
+                                      None to remove the callback.
+
+        """
+
+        if callback is None:
+            self._fetch_callbacks.pop(node, None)
+        else:
+            self._fetch_callbacks[node] = callback
+
+    def set_child(self, parent_node, row, column, item):
+        """Set the item into the child cell, empty rows are added up to the row.
+
+        Args:
+            parent_node (int): The parent row node.
+            row (int): The child row number.
+            column (int): The column number.
+            item (Item): The item created by itself.
+
+        """
+
+        children = self._children[parent_node] or []
+        if row >= len(children):
+            rows_items = [[] for _ in range(row - len(children))]
+            rows_items.append([None] * column + [item])
+            self.insert_rows(parent_node=parent_node, row=len(children), rows_items=rows_items)
+            return
+
+        if column >= self._column_count:
+            self.setColumnCount(column + 1)
+
+        node = children[row]
+        self._set_cell_from_item(node=node, column=column, item=item)
+        self._emit_cell_changed(node=node, column=column)
+
+    def clone_rows(self, nodes, leaves=True, defaults=None):
+        """Create copies of the rows, and all their descendants if leaves, not under any parent and without any signal,
+           insert them with insert_rows, see take_row. The nodes and the cells are added at once.
+
+        Args:
+            nodes (list): The rows nodes to clone.
+            leaves (bool): Clone the descendants rows too, or only the rows.
+            defaults (dict/None): (row node, column) to the new default value of the copied cell, its display text is
+                                  the string of the value, example: the unique names. None to copy all the cells as they
+                                  are.
+
+        Returns:
+            list: The cloned rows nodes, in the nodes order.
+
+        """
+
+        # source nodes in breadth first order, with the position of their parent copy, -1 for the cloned rows
+        sources = list(nodes)
+        source_parents = [-1] * len(sources)
+        if leaves:
+            position = 0
+            while position < len(sources):
+                children = self._children[sources[position]]
+                if children:
+                    sources.extend(children)
+                    source_parents.extend([position] * len(children))
+                position += 1
+
+        if not sources:
+            return []
+
+        new_nodes = self._new_nodes(count=len(sources))
+        parents = self._parents
+        rows = self._rows
+        children = self._children
+        for position, parent_position in enumerate(source_parents):
+            if parent_position < 0:
+                continue
+            node = new_nodes[position]
+            parent_node = new_nodes[parent_position]
+            if children[parent_node] is None:
+                children[parent_node] = []
+            parents[node] = parent_node
+            rows[node] = len(children[parent_node])
+            children[parent_node].append(node)
+
+        for column in range(self._column_count):
+            for values in [self._texts[column], self._defaults[column], self._tool_tips[column],
+                           self._cell_presets[column]]:
+                for node, source in zip(new_nodes, sources):
+                    values[node] = values[source]
+
+        if defaults:
+            copies = dict(zip(sources, new_nodes))
+            for (node, column), default in defaults.items():
+                self._defaults[column][copies[node]] = default
+                self._texts[column][copies[node]] = str(default)
+
+        if self._cell_data:
+            copies = {}
+            for node, copy_node in zip(sources, new_nodes):
+                copies.setdefault(node, []).append(copy_node)
+            for (node, column, role), value in list(self._cell_data.items()):
+                for copy_node in copies.get(node, ()):
+                    self._cell_data[(copy_node, column, role)] = value
+
+        return new_nodes[:len(nodes)]
+
+    def copy_rows(self, nodes, parent_node, row):
+        """Insert copies of the rows and all their descendants under the parent node.
+
+        Args:
+            nodes (list): The rows nodes to copy.
+            parent_node (int): The parent row node.
+            row (int): The row number to insert at.
+
+        Returns:
+            list: The copied rows nodes.
+
+        """
+
+        return self.insert_rows(
+            parent_node=parent_node,
+            row=row,
+            rows_items=[[Item.from_cell(model=self, node=node, column=0)] for node in self.clone_rows(nodes=nodes)]
+        )
+
+    # -------------------------------- QtGui.QStandardItemModel compatible --------------------------------
+    def invisibleRootItem(self):
+        return Item.from_cell(model=self, node=ROOT_NODE, column=0)
+
+    def item(self, row, column=0):
+        return self.get_child_item(node=ROOT_NODE, row=row, column=column)
+
+    def itemFromIndex(self, index):
+        if not index.isValid() or index.model() is not self:
+            return None
+        return Item.from_cell(model=self, node=index.internalId(), column=index.column())
+
+    def indexFromItem(self, item):
+        return item.index()
+
+    def appendRow(self, items):
+        self.insert_rows(parent_node=ROOT_NODE, row=len(self._children[ROOT_NODE]), rows_items=[items])
+
+    def insertRow(self, row, items):
+        self.insert_rows(parent_node=ROOT_NODE, row=row, rows_items=[items])
+
+    def takeRow(self, row):
+        return self.take_row(parent_node=ROOT_NODE, row=row)
+
+    def setColumnCount(self, columns):
+        """Set the columns count, the data of the removed columns is dropped.
+
+        Args:
+            columns (int): The columns count.
+
+        """
+
+        if columns > self._column_count:
+            self.beginInsertColumns(QtCore.QModelIndex(), self._column_count, columns - 1)
+            self._add_columns(columns=columns)
+            self.endInsertColumns()
+
+        elif columns < self._column_count:
+            self.beginRemoveColumns(QtCore.QModelIndex(), columns, self._column_count - 1)
+            for columns_arrays in [self._texts, self._defaults, self._tool_tips, self._cell_presets]:
+                del columns_arrays[columns:]
+            for key in [key for key in self._cell_data if key[1] >= columns]:
+                del self._cell_data[key]
+            for section in [section for section in self._header_items if section >= columns]:
+                del self._header_items[section]
+            self._column_count = columns
+            self.endRemoveColumns()
+
+    def setHorizontalHeaderItem(self, column, item):
+        if column >= self._column_count:
+            self.setColumnCount(column + 1)
+        self._header_items[column] = item
+        self.headerDataChanged.emit(QtCore.Qt.Horizontal, column, column)
+
+    def horizontalHeaderItem(self, column):
+        return self._header_items.get(column)
+
+    def clear(self):
+        """Remove all the rows, columns and headers, the items of the cleared rows are not valid any more.
+
+        """
+
+        self.beginResetModel()
+        self._reset_storage(columns=0)
+        self.endResetModel()
+
+    # -------------------------------- QtCore.QAbstractItemModel --------------------------------
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            if parent.column() != 0:
+                return QtCore.QModelIndex()
+            node = parent.internalId()
+        else:
+            node = ROOT_NODE
+        # the children rows the views see
+        children = self._view_children.get(node, self._children[node])
+
+        if not children or not 0 <= row < len(children) or not 0 <= column < self._column_count:
+            return QtCore.QModelIndex()
+
+        return self.createIndex(row, column, children[row])
+
+    def parent(self, index=None):
+        # QObject.parent() without index
+        if index is None:
+            return super(ItemModel, self).parent()
+
+        # the invalid index is the root node, its parent is detached
+        node = self._parents[index.internalId()]
+        if node <= ROOT_NODE or self._parents[node] < ROOT_NODE:
+            return QtCore.QModelIndex()
+
+        # the parent of a row the views see is seen too
+        if self._parents[node] in self._view_children:
+            return self.createIndex(self._view_rows[node], 0, node)
+
+        return self.createIndex(self._rows[node], 0, node)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            if parent.column() != 0:
+                return 0
+            node = parent.internalId()
+            return len(self._view_children.get(node, self._children[node]) or ())
+
+        return len(self._view_children.get(ROOT_NODE, self._children[ROOT_NODE]))
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return self._column_count
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        # asked for the laid out rows, kept short, the invalid index is the root node and column -1
+        node = parent.internalId()
+        return parent.column() < 1 and (
+            bool(self._view_children.get(node, self._children[node])) or node in self._fetch_callbacks
+        )
+
+    def canFetchMore(self, parent):
+        if parent.isValid():
+            return not parent.column() and parent.internalId() in self._fetch_callbacks
+
+        return ROOT_NODE in self._fetch_callbacks
+
+    def fetchMore(self, parent):
+        node = parent.internalId() if parent.isValid() else ROOT_NODE
+        # taken out while fetching, the rows inserted by the callback may lay out and ask to fetch again
+        callback = self._fetch_callbacks.pop(node, None)
+        if callback is not None and callback(Item.from_cell(model=self, node=node, column=0)):
+            self._fetch_callbacks[node] = callback
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        node = index.internalId()
+        column = index.column()
+        # style roles straight from the preset style, unless a cell has its own roles data
+        if role in STYLE_ROLES and not self._cell_data:
+            preset = self._cell_presets[column][node]
+            return self._get_preset_style(preset).get(role) if preset > 0 else None
+
+        return self.get_cell_data(node=node, column=column, role=role)
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid():
+            return False
+        self.set_cell_data(node=index.internalId(), column=index.column(), value=value, role=role)
+        return True
+
+    def flags(self, index):
+        # asked twice for every row on the layout, kept short, the invalid index is the root node.
+        # rows without children and nothing to fetch are flagged, so the views don't ask hasChildren of them,
+        # rows inserted under them lay them out again.
+        node = index.internalId()
+        if not node:
+            return QtCore.Qt.ItemIsDropEnabled
+
+        preset = self._cell_presets[index.column()][node]
+        if preset < 0:
+            preset = 0
+        if self._children[node] or node in self._fetch_callbacks:
+            return self._presets_flags[preset]
+
+        return self._presets_leaf_flags[preset]
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and section in self._header_items:
+            return self._header_items[section].data(role)
+
+        # same as QtGui.QStandardItemModel without header item
+        if role == QtCore.Qt.DisplayRole:
+            return section + 1
+
+        return None
+
+    # the rows of the views arguments are the rows they see
+    def removeRows(self, row, count, parent=QtCore.QModelIndex()):
+        parent_node = parent.internalId() if parent.isValid() else ROOT_NODE
+        view_children = self._view_children.get(parent_node)
+        if view_children is None:
+            return self.remove_rows(parent_node=parent_node, row=row, count=count)
+
+        if row < 0 or count <= 0 or row + count > len(view_children):
+            return False
+        # the rows seen together may be apart in the model, from back -> forward
+        for first, count in get_rows_ranges(rows=[self._rows[node] for node in view_children[row:row + count]]):
+            self.remove_rows(parent_node=parent_node, row=first, count=count)
+
+        return True
+
+    def moveRows(self, source_parent, source_row, count, destination_parent, destination_child):
+        parent_node = source_parent.internalId() if source_parent.isValid() else ROOT_NODE
+        destination_node = destination_parent.internalId() if destination_parent.isValid() else ROOT_NODE
+        view_children = self._view_children.get(parent_node)
+        if view_children is None and destination_node not in self._view_children:
+            return self.move_rows(
+                parent_node=parent_node,
+                row=source_row,
+                count=count,
+                destination_node=destination_node,
+                destination_row=destination_child
+            )
+
+        if view_children is None:
+            view_children = self._children[parent_node] or []
+        rows = [self._rows[node] for node in view_children[max(source_row, 0):source_row + count]]
+        return count > 0 and len(rows) == count and self.move_rows_ranges(
+            parent_node=parent_node,
+            rows_ranges=get_rows_ranges(rows=rows),
+            destination_node=destination_node,
+            destination_row=self._view_row_to_row(parent_node=destination_node, row=destination_child)
+        ) == count
+
+    def supportedDropActions(self):
+        return QtCore.Qt.CopyAction | QtCore.Qt.MoveAction
+
+    def mimeTypes(self):
+        return [ROWS_MIME_TYPE]
+
+    def mimeData(self, indexes):
+        nodes = []
+        for index in indexes:
+            node = index.internalId()
+            if node not in nodes:
+                nodes.append(node)
+
+        mime_data = QtCore.QMimeData()
+        mime_data.setData(ROWS_MIME_TYPE, QtCore.QByteArray(' '.join(str(node) for node in nodes).encode('ascii')))
+
+        return mime_data
+
+    def dropMimeData(self, data, action, row, column, parent):
+        if action == QtCore.Qt.IgnoreAction:
+            return True
+        if not data.hasFormat(ROWS_MIME_TYPE):
+            return False
+
+        nodes = [int(node) for node in bytes(data.data(ROWS_MIME_TYPE).data()).decode('ascii').split()]
+        nodes = [node for node in nodes if self._parents[node] >= ROOT_NODE]
+        parent_node = parent.internalId() if parent.isValid() else ROOT_NODE
+
+        # can't drop the rows into themselves
+        ancestor_node = parent_node
+        while ancestor_node > ROOT_NODE:
+            if ancestor_node in nodes:
+                return False
+            ancestor_node = self._parents[ancestor_node]
+
+        if row < 0:
+            row = len(self._children[parent_node] or ())
+        else:
+            row = self._view_row_to_row(parent_node=parent_node, row=row)
+
+        self.copy_rows(nodes=nodes, parent_node=parent_node, row=row)
+
+        return True
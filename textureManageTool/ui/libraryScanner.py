@@ -0,0 +1,148 @@
+import threading
+
+from Qt import QtCore
+from utils import textureCatalog
+
+
+class LibraryScanWorkerSignals(QtCore.QObject):
+    """Signals for LibraryScanWorker, QRunnable is not a QObject so it can't emit by itself.
+
+    """
+
+    changes_found = QtCore.Signal(int, object, object)
+    finished = QtCore.Signal(int)
+
+
+class LibraryScanWorker(QtCore.QRunnable):
+    """Update the library catalog in the thread pool, emit the changed textures in batches.
+
+    """
+
+    def __init__(self, scan_id, catalog_path, path, extensions, cancel_event, folders=None):
+        """Initial setting for LibraryScanWorker.
+
+        Args:
+            scan_id (int): The id of the scan, to drop the batches if the scan is out of date.
+            catalog_path (str): The catalog database file path, the worker opens its own connection.
+            path (str): The library root path.
+            extensions (set): Lower case file extensions to find.
+            cancel_event (threading.Event): Stop walking once it is set.
+            folders (list/None): Only rescan these folders under the library root, None for the whole root.
+
+        """
+
+        super(LibraryScanWorker, self).__init__()
+
+        self.scan_id = scan_id
+        self.catalog_path = catalog_path
+        self.path = path
+        self.extensions = extensions
+        self.cancel_event = cancel_event
+        self.folders = folders
+        self.signals = LibraryScanWorkerSignals()
+
+    def run(self):
+        """Update the catalog, only the changed folders are listed.
+
+        """
+
+        catalog = textureCatalog.TextureCatalog(catalog_path=self.catalog_path)
+        try:
+            for changed_records, removed_paths in catalog.update(
+                    root=self.path, extensions=self.extensions, cancel_event=self.cancel_event, folders=self.folders
+            ):
+                if self.cancel_event.is_set():
+                    return
+                self.signals.changes_found.emit(self.scan_id, changed_records, removed_paths)
+        finally:
+            catalog.close()
+
+        self.signals.finished.emit(self.scan_id)
+
+
+class LibraryScanner(QtCore.QObject):
+    """Update the library catalog in the background, one scan at a time.
+
+    """
+
+    changes_found = QtCore.Signal(object, object)
+    finished = QtCore.Signal()
+
+    def __init__(self, parent=None):
+        """Initial setting for LibraryScanner.
+
+        Args:
+            parent (QtCore.QObject/None): Parent object.
+
+        """
+
+        super(LibraryScanner, self).__init__(parent)
+
+        self.thread_pool = QtCore.QThreadPool.globalInstance()
+        # increase on every scan, so the batches of the cancelled scans can be ignored.
+        self.scan_id = 0
+        self.cancel_event = threading.Event()
+        self.worker_signals = None
+        self.scanning = False
+
+    def scan(self, catalog_path, path, extensions, folders=None):
+        """Cancel the running scan, start updating the path in the catalog.
+
+        Args:
+            catalog_path (str): The catalog database file path.
+            path (str): The library root path.
+            extensions (set): Lower case file extensions to find.
+            folders (list/None): Only rescan these folders under the library root, None for the whole root.
+
+        """
+
+        self.cancel()
+        self.scanning = True
+
+        worker = LibraryScanWorker(
+            scan_id=self.scan_id,
+            catalog_path=catalog_path,
+            path=path,
+            extensions=extensions,
+            cancel_event=self.cancel_event,
+            folders=folders
+        )
+        worker.signals.changes_found.connect(self.on_changes_found)
+        worker.signals.finished.connect(self.on_finished)
+        self.worker_signals = worker.signals
+        self.thread_pool.start(worker)
+
+    def cancel(self):
+        """Cancel the running scan, no more batches are emitted.
+
+        """
+
+        self.cancel_event.set()
+        self.cancel_event = threading.Event()
+        self.scan_id += 1
+        self.scanning = False
+
+    def on_changes_found(self, scan_id, changed_records, removed_paths):
+        """Forward the changes of the current scan.
+
+        Args:
+            scan_id (int): The id of the scan.
+            changed_records (list): New or modified textures records in textureCatalog.CATALOG_FIELDS order.
+            removed_paths (list): Paths of the textures no longer on the disk.
+
+        """
+
+        if scan_id == self.scan_id:
+            self.changes_found.emit(changed_records, removed_paths)
+
+    def on_finished(self, scan_id):
+        """Forward the finish of the current scan.
+
+        Args:
+            scan_id (int): The id of the scan.
+
+        """
+
+        if scan_id == self.scan_id:
+            self.scanning = False
+            self.finished.emit()
@@ -0,0 +1,391 @@
+import threading
+
+from Qt import QtCore, QtGui
+from utils import textureUtils, tiffUtils, imageUtils
+
+
+# coarse stage decodes at 1 / COARSE_FACTOR of the preview size
+COARSE_FACTOR = 8
+
+
+def scaled_image_size(image_size, target_size):
+    """Return the image size fitted inside the target size, keeping aspect ratio and never upscaling.
+
+    Args:
+        image_size (QtCore.QSize): The original image size.
+        target_size (QtCore.QSize): The size to fit in, usually the preview label size.
+
+    Returns:
+        QtCore.QSize: The fitted image size.
+
+    """
+
+    if not image_size.isValid() or image_size.isEmpty():
+        return QtCore.QSize()
+
+    if image_size.width() <= target_size.width() and image_size.height() <= target_size.height():
+        return QtCore.QSize(image_size)
+
+    return image_size.scaled(target_size, QtCore.Qt.KeepAspectRatio)
+
+
+def coarse_image_size(target_size):
+    """Return the size the coarse stage fits in.
+
+    Args:
+        target_size (QtCore.QSize): The preview size.
+
+    Returns:
+        QtCore.QSize: The target size COARSE_FACTOR times smaller.
+
+    """
+
+    return QtCore.QSize(target_size.width() // COARSE_FACTOR, target_size.height() // COARSE_FACTOR)
+
+
+def read_scaled_image(texture_file_path, target_size, mip_levels=None):
+    """Decode the image file directly at the size it is going to be displayed,
+       so the image reader can downscale while decoding (jpeg) instead of decoding full resolution first.
+       Tiled tiff / .tx files only decode the smallest mip level that still covers the target size.
+
+    Args:
+        texture_file_path (str): The path of the image file.
+        target_size (QtCore.QSize): The size to fit in, usually the preview label size.
+        mip_levels (list/None): The tiff mip levels from tiffUtils.get_mip_levels, read from the file if None.
+
+    Returns:
+        QtGui.QImage: The decoded image, null image if it can't be read.
+
+    """
+
+    reader = QtGui.QImageReader(texture_file_path)
+    reader.setAutoTransform(True)
+
+    if tiffUtils.is_tiff_file(texture_file_path=texture_file_path):
+        # .tx extension is not known by the image reader
+        reader.setFormat(b'tiff')
+
+        if mip_levels is None:
+            mip_levels = tiffUtils.get_mip_levels(texture_file_path=texture_file_path)
+        mip_level = tiffUtils.pick_mip_level(
+            levels=mip_levels,
+            width=target_size.width(),
+            height=target_size.height()
+        )
+        if mip_level and mip_level['index']:
+            reader.jumpToImage(mip_level['index'])
+
+    scaled_size = scaled_image_size(image_size=reader.size(), target_size=target_size)
+    if scaled_size.isValid():
+        reader.setScaledSize(scaled_size)
+
+    return reader.read()
+
+
+def read_thumbnail_image(texture_file_path):
+    """Decode the embedded exif thumbnail of the image file.
+
+    Args:
+        texture_file_path (str): The path of the image file.
+
+    Returns:
+        QtGui.QImage: The thumbnail image, null image if the image doesn't carry one.
+
+    """
+
+    thumbnail_image = QtGui.QImage()
+    thumbnail_data = textureUtils.get_image_thumbnail(texture_file_path=texture_file_path)
+    if thumbnail_data:
+        thumbnail_image.loadFromData(thumbnail_data)
+
+    return thumbnail_image
+
+
+def read_coarse_image(texture_file_path, target_size, mip_levels=None):
+    """Decode a heavily subsampled image, only if the format can do it much cheaper than the full preview,
+       from a low mip level of tiled tiff / .tx files or from the scaled jpeg decode.
+
+    Args:
+        texture_file_path (str): The path of the image file.
+        target_size (QtCore.QSize): The preview size, the coarse image is COARSE_FACTOR times smaller.
+        mip_levels (list/None): The tiff mip levels from tiffUtils.get_mip_levels, read from the file if None.
+
+    Returns:
+        QtGui.QImage: The coarse image, null image if the format has no cheap way to decode it.
+
+    """
+
+    if tiffUtils.is_tiff_file(texture_file_path=texture_file_path):
+        if mip_levels is None:
+            mip_levels = tiffUtils.get_mip_levels(texture_file_path=texture_file_path)
+        cheap = len(mip_levels) > 1
+    else:
+        cheap = QtGui.QImageReader(texture_file_path).supportsOption(QtGui.QImageIOHandler.ScaledSize)
+
+    if not cheap:
+        return QtGui.QImage()
+
+    return read_scaled_image(
+        texture_file_path=texture_file_path,
+        target_size=coarse_image_size(target_size=target_size),
+        mip_levels=mip_levels
+    )
+
+
+def array_to_image(pixels):
+    """Convert 8 bits display pixels into QImage.
+
+    Args:
+        pixels (numpy.ndarray): Contiguous uint8 pixels in (rows, columns, 3 / 4) shape, rgb or rgba.
+
+    Returns:
+        QtGui.QImage: The image owning a copy of the pixels.
+
+    """
+
+    rows, columns, channels_count = pixels.shape
+    image_format = QtGui.QImage.Format_RGBA8888 if channels_count == 4 else QtGui.QImage.Format_RGB888
+
+    return QtGui.QImage(pixels.tobytes(), columns, rows, columns * channels_count, image_format).copy()
+
+
+# preview stages from coarse to fine, every larger stage replaces the previous one in the preview label.
+PREVIEW_STAGES = [
+    lambda texture_file_path, target_size, mip_levels: read_thumbnail_image(texture_file_path=texture_file_path),
+    read_coarse_image,
+    read_scaled_image
+]
+
+
+class PreviewWorkerSignals(QtCore.QObject):
+    """Signals for PreviewWorker, QRunnable is not a QObject so it can't emit by itself.
+
+    """
+
+    stage_finished = QtCore.Signal(int, int, QtGui.QImage)
+    float_image_finished = QtCore.Signal(int, object)
+
+
+class PreviewWorker(QtCore.QRunnable):
+    """Decode the preview stages in the thread pool, from coarse to fine.
+
+    """
+
+    def __init__(self, request_id, texture_file_path, target_size, cancel_event):
+        """Initial setting for PreviewWorker.
+
+        Args:
+            request_id (int): The id of the preview request, to drop the result if it is out of date.
+            texture_file_path (str): The path of the image file.
+            target_size (QtCore.QSize): The size to fit in, usually the preview label size.
+            cancel_event (threading.Event): Stop before the next stage once it is set.
+
+        """
+
+        super(PreviewWorker, self).__init__()
+
+        self.request_id = request_id
+        self.texture_file_path = texture_file_path
+        self.target_size = QtCore.QSize(target_size)
+        self.cancel_event = cancel_event
+        self.signals = PreviewWorkerSignals()
+
+    def run(self):
+        """Decode image stages, QImage (unlike QPixmap) is safe to create outside the ui thread.
+           High dynamic range / high bit depth textures decode a reduced resolution float image instead,
+           tone mapped in the ui thread so the exposure can change without decoding again.
+
+        """
+
+        if imageUtils.needs_float_preview(texture_file_path=self.texture_file_path):
+            float_image = imageUtils.read_float_image(
+                texture_file_path=self.texture_file_path,
+                width=self.target_size.width(),
+                height=self.target_size.height()
+            )
+            if float_image is not None:
+                if not self.cancel_event.is_set():
+                    self.signals.float_image_finished.emit(self.request_id, float_image)
+                return
+            # the float decoder can't read it (compressed / planar tiff, missing exr library), try the image reader
+
+        # tiff directories are parsed once for all the stages
+        mip_levels = None
+        if tiffUtils.is_tiff_file(texture_file_path=self.texture_file_path):
+            mip_levels = tiffUtils.get_mip_levels(texture_file_path=self.texture_file_path)
+
+        shown_size = QtCore.QSize(0, 0)
+        for stage, read_stage in enumerate(PREVIEW_STAGES):
+            if self.cancel_event.is_set():
+                return
+
+            # no coarse decode if the embedded thumbnail is already as large
+            if read_stage is read_coarse_image:
+                coarse_size = coarse_image_size(target_size=self.target_size)
+                if shown_size.width() >= coarse_size.width() or shown_size.height() >= coarse_size.height():
+                    continue
+
+            image = read_stage(
+                texture_file_path=self.texture_file_path, target_size=self.target_size, mip_levels=mip_levels
+            )
+            if not image.isNull() and not self.cancel_event.is_set():
+                shown_size = image.size()
+                self.signals.stage_finished.emit(self.request_id, stage, image)
+
+
+class PreviewLoader(QtCore.QObject):
+    """Load texture into a preview label progressively without blocking the ui.
+       The embedded thumbnail / low mip level shows first, the preview size decode replaces it when it is ready.
+
+    """
+
+    def __init__(self, label, parent=None):
+        """Initial setting for PreviewLoader.
+
+        Args:
+            label (QtWidgets.QLabel): The preview label to display the texture.
+            parent (QtCore.QObject/None): Parent object.
+
+        """
+
+        super(PreviewLoader, self).__init__(parent)
+
+        self.label = label
+        # the path of the texture being previewed
+        self.texture_file_path = ''
+        self.thread_pool = QtCore.QThreadPool.globalInstance()
+        # increase on every request, so the finished out of date requests can be ignored.
+        self.request_id = 0
+        # the finest stage shown of the current request and its image size
+        self.shown_stage = -1
+        self.shown_size = QtCore.QSize(0, 0)
+        # cancel event and signals of the running worker
+        self.cancel_event = threading.Event()
+        self.worker_signals = None
+        # reduced resolution float image of high dynamic range textures, (pixels, linear)
+        self.float_image = None
+        # exposure in stops for float images
+        self.exposure = 0.0
+
+    def load(self, texture_file_path):
+        """Cancel the running request, start decoding the texture stages in the background.
+
+        Args:
+            texture_file_path (str): The path of the image file.
+
+        """
+
+        self.clear()
+        self.texture_file_path = texture_file_path
+
+        worker = PreviewWorker(
+            request_id=self.request_id,
+            texture_file_path=texture_file_path,
+            target_size=self.label.size(),
+            cancel_event=self.cancel_event
+        )
+        worker.signals.stage_finished.connect(self.on_stage_finished)
+        worker.signals.float_image_finished.connect(self.on_float_image_finished)
+        self.worker_signals = worker.signals
+        self.thread_pool.start(worker)
+
+    def cancel(self):
+        """Cancel the running request, the current stage finishes but nothing more is decoded or shown.
+
+        """
+
+        self.cancel_event.set()
+        self.cancel_event = threading.Event()
+        self.request_id += 1
+        self.shown_stage = -1
+        self.shown_size = QtCore.QSize(0, 0)
+        self.float_image = None
+
+    def clear(self):
+        """Cancel the running request and clear the preview label.
+
+        """
+
+        self.cancel()
+        self.texture_file_path = ''
+        self.label.setPixmap(QtGui.QPixmap())
+
+    def set_image(self, image, transformation=QtCore.Qt.SmoothTransformation):
+        """Fit the image into the preview label.
+
+        Args:
+            image (QtGui.QImage): The image to display, clear the label if it is null.
+            transformation (QtCore.Qt.TransformationMode): Scale transformation mode.
+
+        """
+
+        if image.isNull():
+            self.label.setPixmap(QtGui.QPixmap())
+            return
+
+        pixmap = QtGui.QPixmap.fromImage(image)
+        self.label.setPixmap(pixmap.scaled(self.label.size(), QtCore.Qt.KeepAspectRatio, transformation))
+
+    def on_stage_finished(self, request_id, stage, image):
+        """Replace the shown image if the request is still the current one and the stage is finer,
+           the coarse stages only replace a smaller image, so a large thumbnail is not replaced by a coarser one.
+
+        Args:
+            request_id (int): The id of the request.
+            stage (int): The index of the finished stage in PREVIEW_STAGES.
+            image (QtGui.QImage): The decoded image.
+
+        """
+
+        if request_id != self.request_id or stage <= self.shown_stage:
+            return
+
+        final = stage == len(PREVIEW_STAGES) - 1
+        if not final and image.width() <= self.shown_size.width() and image.height() <= self.shown_size.height():
+            return
+
+        self.shown_stage = stage
+        self.shown_size = image.size()
+        if final:
+            self.set_image(image=image)
+        else:
+            # coarse stages are upscaled, no need to be smooth.
+            self.set_image(image=image, transformation=QtCore.Qt.FastTransformation)
+
+    def on_float_image_finished(self, request_id, float_image):
+        """Keep the float image of the current request and show it tone mapped.
+
+        Args:
+            request_id (int): The id of the request.
+            float_image (tuple): (pixels, linear), see imageUtils.read_float_image.
+
+        """
+
+        if request_id != self.request_id:
+            return
+
+        self.shown_stage = len(PREVIEW_STAGES) - 1
+        self.float_image = float_image
+        self.update_float_image()
+
+    def set_exposure(self, exposure):
+        """Set the exposure of float images, tone map the current one again.
+
+        Args:
+            exposure (float): Exposure in stops.
+
+        """
+
+        self.exposure = exposure
+        self.update_float_image()
+
+    def update_float_image(self):
+        """Tone map the current float image with the current exposure and show it.
+
+        """
+
+        if self.float_image is None:
+            return
+
+        pixels, linear = self.float_image
+        self.set_image(image=array_to_image(imageUtils.tone_map(pixels=pixels, linear=linear, exposure=self.exposure)))
@@ -0,0 +1,295 @@
+from Qt import QtWidgets, QtCore, QtGui
+from utils import imageUtils
+
+import previewLoader
+
+np = imageUtils.np
+
+
+# both textures are decoded to fit in this size, the candidate matched to the current texture shape.
+COMPARE_SIZE = 512
+# difference view gain, small errors are hard to see otherwise
+DIFFERENCE_GAIN = 4.0
+# compare view modes
+COMPARE_MODES = ['Split', 'Difference', 'Current', 'Candidate']
+
+
+def image_to_array(image):
+    """Convert QImage into float rgb pixels in [0, 1].
+
+    Args:
+        image (QtGui.QImage): The image.
+
+    Returns:
+        numpy.ndarray: Float32 pixels in (rows, columns, 3) shape.
+
+    """
+
+    image = image.convertToFormat(QtGui.QImage.Format_RGB888)
+    bits = image.constBits()
+    # PyQt returns a sized-less pointer, PySide a buffer
+    if hasattr(bits, 'setsize'):
+        bits.setsize(image.bytesPerLine() * image.height())
+
+    # rows are padded to 4 bytes
+    pixels = np.frombuffer(bits, dtype=np.uint8).reshape(image.height(), image.bytesPerLine())
+    pixels = pixels[:, :image.width() * 3].reshape(image.height(), image.width(), 3)
+
+    return pixels.astype(np.float32) / 255.0
+
+
+def read_display_pixels(texture_file_path, size, keep_aspect_ratio=True):
+    """Decode the texture at reduced resolution into display (srgb) encoded float rgb pixels.
+
+    Args:
+        texture_file_path (str): The path of the image file.
+        size (QtCore.QSize): The size to fit in, or the exact size if not keep_aspect_ratio.
+        keep_aspect_ratio (bool): Fit in size keeping aspect ratio, or resize to the exact size.
+
+    Returns:
+        numpy.ndarray/None: Float32 pixels in (rows, columns, 3) shape, None if it can't be decoded.
+
+    """
+
+    if imageUtils.needs_float_preview(texture_file_path=texture_file_path):
+        float_image = imageUtils.read_float_image(
+            texture_file_path=texture_file_path, width=size.width(), height=size.height()
+        )
+        if float_image is None:
+            return None
+        pixels, linear = float_image
+        pixels = imageUtils.tone_map(pixels=pixels, linear=linear)[..., :3].astype(np.float32) / 255.0
+
+        if keep_aspect_ratio:
+            fitted_size = QtCore.QSize(pixels.shape[1], pixels.shape[0]).scaled(size, QtCore.Qt.KeepAspectRatio)
+        else:
+            fitted_size = size
+
+        return imageUtils.resize_nearest(pixels=pixels, rows=fitted_size.height(), columns=fitted_size.width())
+
+    if keep_aspect_ratio:
+        image = previewLoader.read_scaled_image(texture_file_path=texture_file_path, target_size=size)
+    else:
+        reader = QtGui.QImageReader(texture_file_path)
+        reader.setAutoTransform(True)
+        reader.setScaledSize(size)
+        image = reader.read()
+
+    if image.isNull():
+        return None
+
+    return image_to_array(image=image)
+
+
+class CompareWorkerSignals(QtCore.QObject):
+    """Signals for CompareWorker, QRunnable is not a QObject so it can't emit by itself.
+
+    """
+
+    finished = QtCore.Signal(int, object, object)
+
+
+class CompareWorker(QtCore.QRunnable):
+    """Decode the current and candidate textures at matched reduced resolution in the thread pool.
+
+    """
+
+    def __init__(self, request_id, current_file_path, candidate_file_path, current_pixels):
+        """Initial setting for CompareWorker.
+
+        Args:
+            request_id (int): The id of the compare request, to drop the result if it is out of date.
+            current_file_path (str): The path of the current texture.
+            candidate_file_path (str): The path of the candidate texture.
+            current_pixels (numpy.ndarray/None): Already decoded current texture pixels, None to decode.
+
+        """
+
+        super(CompareWorker, self).__init__()
+
+        self.request_id = request_id
+        self.current_file_path = current_file_path
+        self.candidate_file_path = candidate_file_path
+        self.current_pixels = current_pixels
+        self.signals = CompareWorkerSignals()
+
+    def run(self):
+        """Decode textures, the candidate is resized to the current texture shape.
+
+        """
+
+        current_pixels = self.current_pixels
+        if current_pixels is None:
+            current_pixels = read_display_pixels(
+                texture_file_path=self.current_file_path, size=QtCore.QSize(COMPARE_SIZE, COMPARE_SIZE)
+            )
+
+        candidate_pixels = None
+        if current_pixels is not None:
+            candidate_pixels = read_display_pixels(
+                texture_file_path=self.candidate_file_path,
+                size=QtCore.QSize(current_pixels.shape[1], current_pixels.shape[0]),
+                keep_aspect_ratio=False
+            )
+
+        self.signals.finished.emit(self.request_id, current_pixels, candidate_pixels)
+
+
+class TextureCompareDialog(QtWidgets.QDialog):
+    """A/B compare between the current texture and the candidate texture in the textures labs.
+
+    """
+
+    def __init__(self, parent=None):
+        """Initial setting for TextureCompareDialog.
+
+        Args:
+            parent (QtWidgets.QWidget/None): Parent widget.
+
+        """
+
+        super(TextureCompareDialog, self).__init__(parent)
+
+        self.setWindowTitle('Texture Compare')
+        self.resize(COMPARE_SIZE + 40, COMPARE_SIZE + 200)
+
+        self.thread_pool = QtCore.QThreadPool.globalInstance()
+        # increase on every request, so the finished out of date requests can be ignored.
+        self.request_id = 0
+        self.worker_signals = None
+        # decoded current texture, kept while only the candidate changes.
+        self.current_file_path = ''
+        self.candidate_file_path = ''
+        self.current_pixels = None
+        self.candidate_pixels = None
+        self.compare_result = None
+
+        # widgets -----------------------------------------------------------
+        self.mode_comboBox = QtWidgets.QComboBox()
+        self.mode_comboBox.addItems(COMPARE_MODES)
+
+        self.wipe_slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
+        self.wipe_slider.setRange(0, 1000)
+        self.wipe_slider.setValue(500)
+
+        self.image_label = QtWidgets.QLabel()
+        self.image_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.image_label.setMinimumSize(COMPARE_SIZE, COMPARE_SIZE)
+        self.image_label.setStyleSheet('background-color: rgb(50, 50, 50);')
+
+        self.stats_textEdit = QtWidgets.QTextEdit()
+        self.stats_textEdit.setReadOnly(True)
+        self.stats_textEdit.setFont(QtGui.QFont('Courier New', 9))
+        self.stats_textEdit.setFixedHeight(90)
+
+        options_layout = QtWidgets.QHBoxLayout()
+        options_layout.addWidget(self.mode_comboBox)
+        options_layout.addWidget(self.wipe_slider)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addLayout(options_layout)
+        layout.addWidget(self.image_label)
+        layout.addWidget(self.stats_textEdit)
+
+        self.mode_comboBox.currentIndexChanged.connect(self.update_view)
+        self.wipe_slider.valueChanged.connect(self.update_view)
+
+    def set_textures(self, current_file_path, candidate_file_path):
+        """Compare the current texture with the candidate texture, decoded in the background.
+
+        Args:
+            current_file_path (str): The path of the current texture.
+            candidate_file_path (str): The path of the candidate texture.
+
+        """
+
+        self.request_id += 1
+
+        if current_file_path != self.current_file_path:
+            self.current_file_path = current_file_path
+            self.current_pixels = None
+        self.candidate_file_path = candidate_file_path
+
+        worker = CompareWorker(
+            request_id=self.request_id,
+            current_file_path=current_file_path,
+            candidate_file_path=candidate_file_path,
+            current_pixels=self.current_pixels
+        )
+        worker.signals.finished.connect(self.on_worker_finished)
+        self.worker_signals = worker.signals
+        self.thread_pool.start(worker)
+
+    def reload_textures(self, texture_file_paths):
+        """Decode the compared textures again if any of them is modified on the disk.
+
+        Args:
+            texture_file_paths (set): The modified textures paths.
+
+        """
+
+        if self.current_file_path in texture_file_paths or self.candidate_file_path in texture_file_paths:
+            current_file_path = self.current_file_path
+            # drop the decoded current texture
+            self.current_file_path = ''
+            self.set_textures(current_file_path=current_file_path, candidate_file_path=self.candidate_file_path)
+
+    def on_worker_finished(self, request_id, current_pixels, candidate_pixels):
+        """Compute the difference and the statistics of the current request, update the view.
+
+        Args:
+            request_id (int): The id of the request.
+            current_pixels (numpy.ndarray/None): The decoded current texture pixels.
+            candidate_pixels (numpy.ndarray/None): The decoded candidate texture pixels.
+
+        """
+
+        if request_id != self.request_id:
+            return
+
+        self.current_pixels = current_pixels
+        self.candidate_pixels = candidate_pixels
+
+        if current_pixels is None or candidate_pixels is None:
+            self.compare_result = None
+            self.stats_textEdit.setText('Can not decode textures to compare.')
+        else:
+            self.compare_result = imageUtils.compare_images(pixels_a=current_pixels, pixels_b=candidate_pixels)
+
+            stats_info = '{:10}{:>10}{:>10}{:>10}\r'.format('Channel', 'Mean', 'Max', 'PSNR')
+            for i, channel in enumerate('RGB'):
+                stats_info += '{:10}{:>10.4f}{:>10.4f}{:>10.2f}\r'.format(
+                    channel,
+                    self.compare_result['mean'][i],
+                    self.compare_result['max'][i],
+                    self.compare_result['psnr'][i]
+                )
+            self.stats_textEdit.setText(stats_info)
+
+        self.update_view()
+
+    def update_view(self, *args):
+        """Show the compare view of the current mode.
+
+        """
+
+        if self.compare_result is None:
+            self.image_label.setPixmap(QtGui.QPixmap())
+            return
+
+        mode = self.mode_comboBox.currentText()
+        if mode == 'Split':
+            pixels = imageUtils.split_wipe(
+                pixels_a=self.current_pixels,
+                pixels_b=self.candidate_pixels,
+                position=self.wipe_slider.value() / 1000.0
+            )
+        elif mode == 'Difference':
+            pixels = self.compare_result['difference'] * DIFFERENCE_GAIN
+        elif mode == 'Current':
+            pixels = self.current_pixels
+        else:
+            pixels = self.candidate_pixels
+
+        display_pixels = np.ascontiguousarray(np.clip(pixels * 255.0 + 0.5, 0, 255).astype(np.uint8))
+        self.image_label.setPixmap(QtGui.QPixmap.fromImage(previewLoader.array_to_image(pixels=display_pixels)))
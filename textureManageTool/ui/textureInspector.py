@@ -0,0 +1,575 @@
+import math, threading
+from collections import OrderedDict
+
+from Qt import QtWidgets, QtCore, QtGui
+from utils import tiffUtils
+
+import previewLoader
+
+
+# tile size of the image reader tile source, tiled tiff uses its own tile size
+TILE_SIZE = 256
+# default tile cache budget
+TILE_CACHE_BYTES = 256 * 1024 * 1024
+# overview image size, drawn under the tiles that are not decoded yet
+OVERVIEW_SIZE = 1024
+
+
+class TileCache(object):
+    """Least recently used cache of decoded tiles, bounded by the total image bytes.
+
+    """
+
+    def __init__(self, max_bytes=TILE_CACHE_BYTES):
+        """Initial setting for TileCache.
+
+        Args:
+            max_bytes (int): Drop the least recently used tiles once the cached tiles bytes exceed it.
+
+        """
+
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.tiles = OrderedDict()
+
+    def __contains__(self, key):
+        """Check if the tile is cached, without marking it as recently used.
+
+        """
+
+        return key in self.tiles
+
+    def get(self, key):
+        """Return the cached tile and mark it as most recently used.
+
+        Args:
+            key (tuple): (level, tile column, tile row).
+
+        Returns:
+            QtGui.QImage/None: The cached tile, None if not cached.
+
+        """
+
+        tile = self.tiles.pop(key, None)
+        if tile is not None:
+            self.tiles[key] = tile
+
+        return tile
+
+    def put(self, key, tile):
+        """Cache the tile, drop the least recently used tiles if over budget.
+
+        Args:
+            key (tuple): (level, tile column, tile row).
+            tile (QtGui.QImage): The decoded tile.
+
+        """
+
+        old_tile = self.tiles.pop(key, None)
+        if old_tile is not None:
+            self.bytes -= old_tile.bytesPerLine() * old_tile.height()
+
+        self.tiles[key] = tile
+        self.bytes += tile.bytesPerLine() * tile.height()
+
+        while self.bytes > self.max_bytes and len(self.tiles) > 1:
+            _, dropped_tile = self.tiles.popitem(last=False)
+            self.bytes -= dropped_tile.bytesPerLine() * dropped_tile.height()
+
+    def clear(self):
+        """Drop all the cached tiles.
+
+        """
+
+        self.tiles.clear()
+        self.bytes = 0
+
+
+class ImageReaderTileSource(object):
+    """Tile source for any image format QImageReader can read.
+       Levels are power of two downscales. Formats with native clip rect support (jpeg) decode every tile with
+       clip rect and scaled size, without decoding the whole image. The other formats (png, strip tiff) would decode
+       the whole image for every clip rect, so the level is decoded once and the tiles are cut from it,
+       only the last decoded level is kept.
+
+    """
+
+    def __init__(self, texture_file_path):
+        """Initial setting for ImageReaderTileSource.
+
+        Args:
+            texture_file_path (str): The path of the image file.
+
+        """
+
+        self.texture_file_path = texture_file_path
+
+        reader = QtGui.QImageReader(texture_file_path)
+        size = reader.size()
+        self.width, self.height = max(size.width(), 0), max(size.height(), 0)
+        self.native_clip = (
+            reader.supportsOption(QtGui.QImageIOHandler.ClipRect) and
+            reader.supportsOption(QtGui.QImageIOHandler.ScaledClipRect)
+        )
+
+        # the last decoded level image of the formats without native clip rect, (level, image)
+        # shared by the tile workers, the lock makes the other workers wait instead of decoding the level again.
+        self.level_image = (None, QtGui.QImage())
+        self.level_lock = threading.Lock()
+
+        # levels: [(level width, level height, tile width, tile height),]
+        self.levels = []
+        width, height = self.width, self.height
+        while width and height:
+            self.levels.append((width, height, TILE_SIZE, TILE_SIZE))
+            if width <= TILE_SIZE and height <= TILE_SIZE:
+                break
+            width, height = max(width // 2, 1), max(height // 2, 1)
+
+    def read_tile(self, level, tile_x, tile_y):
+        """Decode a single tile.
+
+        Args:
+            level (int): The level index.
+            tile_x (int): The tile column.
+            tile_y (int): The tile row.
+
+        Returns:
+            QtGui.QImage: The decoded tile.
+
+        """
+
+        level_width, level_height, tile_width, tile_height = self.levels[level]
+
+        tile_rect = QtCore.QRect(tile_x * tile_width, tile_y * tile_height, tile_width, tile_height)
+        tile_rect = tile_rect.intersected(QtCore.QRect(0, 0, level_width, level_height))
+
+        if not self.native_clip:
+            with self.level_lock:
+                if self.level_image[0] != level:
+                    # release the previous level before decoding, so only a single level is held at once.
+                    self.level_image = (None, QtGui.QImage())
+                    self.level_image = (level, self._read_level(level=level))
+                return self.level_image[1].copy(tile_rect)
+
+        reader = QtGui.QImageReader(self.texture_file_path)
+        reader.setAutoTransform(False)
+        if level:
+            reader.setScaledSize(QtCore.QSize(level_width, level_height))
+            reader.setScaledClipRect(tile_rect)
+        else:
+            reader.setClipRect(tile_rect)
+
+        return reader.read()
+
+    def _read_level(self, level):
+        """Decode the whole level image.
+
+        Args:
+            level (int): The level index.
+
+        Returns:
+            QtGui.QImage: The level image, null image if it can't be read.
+
+        """
+
+        level_width, level_height = self.levels[level][:2]
+
+        reader = QtGui.QImageReader(self.texture_file_path)
+        reader.setAutoTransform(False)
+        if level:
+            reader.setScaledSize(QtCore.QSize(level_width, level_height))
+
+        return reader.read()
+
+
+class TiffTileSource(object):
+    """Tile source for tiled tiff / .tx files, reads the native tiles of the mip levels straight from the file.
+
+    """
+
+    def __init__(self, texture_file_path, levels):
+        """Initial setting for TiffTileSource.
+
+        Args:
+            texture_file_path (str): The path of the tiff file.
+            levels (list): The list of mip levels dictionaries, see tiffUtils.get_mip_levels.
+
+        """
+
+        self.texture_file_path = texture_file_path
+        self.tiff_levels = levels
+        self.width, self.height = levels[0]['width'], levels[0]['height']
+        self.levels = [
+            (level['width'], level['height'], level['tile_width'], level['tile_height']) for level in levels
+        ]
+
+    def read_tile(self, level, tile_x, tile_y):
+        """Decode a single tile.
+
+        Args:
+            level (int): The level index.
+            tile_x (int): The tile column.
+            tile_y (int): The tile row.
+
+        Returns:
+            QtGui.QImage: The decoded tile, cropped to the level size on the edges.
+
+        """
+
+        tiff_level = self.tiff_levels[level]
+        tile_width, tile_height = tiff_level['tile_width'], tiff_level['tile_height']
+        samples_per_pixel = tiff_level['samples_per_pixel']
+
+        data = tiffUtils.read_tile_data(
+            texture_file_path=self.texture_file_path, level=tiff_level, tile_x=tile_x, tile_y=tile_y
+        )
+
+        image_format = {
+            1: QtGui.QImage.Format_Grayscale8,
+            3: QtGui.QImage.Format_RGB888,
+            4: QtGui.QImage.Format_RGBA8888
+        }[samples_per_pixel]
+        # copy, so the image owns its pixels after data is released
+        tile = QtGui.QImage(bytes(data), tile_width, tile_height, tile_width * samples_per_pixel, image_format).copy(
+            0,
+            0,
+            min(tile_width, tiff_level['width'] - tile_x * tile_width),
+            min(tile_height, tiff_level['height'] - tile_y * tile_height)
+        )
+
+        return tile
+
+
+def create_tile_source(texture_file_path):
+    """Create the cheapest tile source for the image file.
+
+    Args:
+        texture_file_path (str): The path of the image file.
+
+    Returns:
+        TiffTileSource/ImageReaderTileSource: The tile source.
+
+    """
+
+    if tiffUtils.is_tiff_file(texture_file_path=texture_file_path):
+        levels = tiffUtils.get_mip_levels(texture_file_path=texture_file_path)
+        # the lzw and not tiled tiffs are decoded by the qt image reader, a level at once
+        if levels and all(tiffUtils.can_read_tiles(level=level) for level in levels):
+            return TiffTileSource(texture_file_path=texture_file_path, levels=levels)
+
+    return ImageReaderTileSource(texture_file_path=texture_file_path)
+
+
+class TileWorkerSignals(QtCore.QObject):
+    """Signals for TileWorker, QRunnable is not a QObject so it can't emit by itself.
+
+    """
+
+    finished = QtCore.Signal(int, object, QtGui.QImage)
+
+
+class TileWorker(QtCore.QRunnable):
+    """Decode a tile in the thread pool.
+
+    """
+
+    def __init__(self, source_id, tile_source, key, wanted_tiles):
+        """Initial setting for TileWorker.
+
+        Args:
+            source_id (int): The id of the tile source, to drop the tile if the texture changed.
+            tile_source (TiffTileSource/ImageReaderTileSource): The tile source.
+            key (tuple): (level, tile column, tile row).
+            wanted_tiles (set): The currently visible tiles keys, skip decoding if the key scrolled out of view.
+
+        """
+
+        super(TileWorker, self).__init__()
+
+        self.source_id = source_id
+        self.tile_source = tile_source
+        self.key = key
+        self.wanted_tiles = wanted_tiles
+        self.signals = TileWorkerSignals()
+
+    def run(self):
+        """Decode tile.
+
+        """
+
+        tile = QtGui.QImage()
+        if self.key in self.wanted_tiles:
+            try:
+                tile = self.tile_source.read_tile(*self.key)
+            except (IOError, OSError, ValueError):
+                pass
+
+        self.signals.finished.emit(self.source_id, self.key, tile)
+
+
+class OverviewWorkerSignals(QtCore.QObject):
+    """Signals for OverviewWorker, QRunnable is not a QObject so it can't emit by itself.
+
+    """
+
+    finished = QtCore.Signal(int, QtGui.QImage)
+
+
+class OverviewWorker(QtCore.QRunnable):
+    """Decode the overview image in the thread pool.
+
+    """
+
+    def __init__(self, source_id, texture_file_path):
+        """Initial setting for OverviewWorker.
+
+        Args:
+            source_id (int): The id of the tile source, to drop the overview if the texture changed.
+            texture_file_path (str): The path of the image file.
+
+        """
+
+        super(OverviewWorker, self).__init__()
+
+        self.source_id = source_id
+        self.texture_file_path = texture_file_path
+        self.signals = OverviewWorkerSignals()
+
+    def run(self):
+        """Decode overview.
+
+        """
+
+        image = previewLoader.read_scaled_image(
+            texture_file_path=self.texture_file_path, target_size=QtCore.QSize(OVERVIEW_SIZE, OVERVIEW_SIZE)
+        )
+
+        self.signals.finished.emit(self.source_id, image)
+
+
+class TextureInspector(QtWidgets.QGraphicsView):
+    """Zoom / pan texture inspector, only decodes the visible tiles at the needed resolution.
+
+    """
+
+    def __init__(self, parent=None):
+        """Initial setting for TextureInspector.
+
+        Args:
+            parent (QtWidgets.QWidget/None): Parent widget.
+
+        """
+
+        super(TextureInspector, self).__init__(parent)
+
+        self.setScene(QtWidgets.QGraphicsScene(self))
+        self.setBackgroundBrush(QtGui.QColor(50, 50, 50))
+        self.setDragMode(self.ScrollHandDrag)
+        self.setTransformationAnchor(self.AnchorUnderMouse)
+        self.setViewportUpdateMode(self.FullViewportUpdate)
+        self.setRenderHint(QtGui.QPainter.SmoothPixmapTransform, True)
+
+        self.thread_pool = QtCore.QThreadPool.globalInstance()
+        self.tile_cache = TileCache()
+        self.tile_source = None
+        self.texture_file_path = ''
+        # increase every time the texture changes, so the tiles of the previous texture can be ignored.
+        self.source_id = 0
+        self.overview_image = QtGui.QImage()
+        # overview worker signals to keep alive until it is finished
+        self.overview_signals = None
+        # tiles keys being decoded, and the workers signals to keep alive until they are finished.
+        self.pending_tiles = {}
+        # currently visible tiles keys, read by the workers to skip tiles scrolled out of view.
+        self.wanted_tiles = set()
+
+    def set_texture(self, texture_file_path):
+        """Show a new texture, fit in view.
+
+        Args:
+            texture_file_path (str): The path of the image file.
+
+        """
+
+        self.source_id += 1
+        self.texture_file_path = texture_file_path
+        self.tile_cache.clear()
+        self.pending_tiles = {}
+        self.wanted_tiles = set()
+
+        self.tile_source = create_tile_source(texture_file_path=texture_file_path)
+
+        # the overview is decoded in the background too, the tiles show as soon as they are ready.
+        self.overview_image = QtGui.QImage()
+        worker = OverviewWorker(source_id=self.source_id, texture_file_path=texture_file_path)
+        worker.signals.finished.connect(self.on_overview_finished)
+        self.overview_signals = worker.signals
+        self.thread_pool.start(worker)
+
+        self.scene().setSceneRect(0, 0, self.tile_source.width, self.tile_source.height)
+        self.fitInView(self.sceneRect(), QtCore.Qt.KeepAspectRatio)
+
+    def wheelEvent(self, event):
+        """Zoom in / out under the mouse.
+
+        """
+
+        factor = 1.25 if event.angleDelta().y() > 0 else 0.8
+        self.scale(factor, factor)
+
+    def _pick_level(self):
+        """Pick the smallest level which still has at least one texel per screen pixel at the current zoom.
+
+        Returns:
+            int: The level index.
+
+        """
+
+        zoom = self.transform().m11()
+        needed_width = self.tile_source.width * zoom
+
+        picked_level = 0
+        for i, level in enumerate(self.tile_source.levels):
+            if level[0] >= needed_width:
+                picked_level = i
+
+        return picked_level
+
+    def drawBackground(self, painter, rect):
+        """Draw the overview image, then the visible tiles on top, request the missing ones.
+
+        """
+
+        super(TextureInspector, self).drawBackground(painter, rect)
+
+        if not self.tile_source or not self.tile_source.levels:
+            return
+
+        scene_rect = self.sceneRect()
+        if not self.overview_image.isNull():
+            painter.drawImage(scene_rect, self.overview_image)
+
+        level = self._pick_level()
+        level_width, level_height, tile_width, tile_height = self.tile_source.levels[level]
+        # level pixel to scene (full resolution) pixel
+        scale_x = float(self.tile_source.width) / level_width
+        scale_y = float(self.tile_source.height) / level_height
+
+        visible_rect = rect.intersected(scene_rect)
+        first_x = max(int(visible_rect.left() / scale_x) // tile_width, 0)
+        first_y = max(int(visible_rect.top() / scale_y) // tile_height, 0)
+        last_x = min(int(math.ceil(visible_rect.right() / scale_x)) // tile_width, (level_width - 1) // tile_width)
+        last_y = min(int(math.ceil(visible_rect.bottom() / scale_y)) // tile_height, (level_height - 1) // tile_height)
+
+        wanted_tiles = set()
+        for tile_y in range(first_y, last_y + 1):
+            for tile_x in range(first_x, last_x + 1):
+                key = (level, tile_x, tile_y)
+                wanted_tiles.add(key)
+
+                tile = self.tile_cache.get(key)
+                if tile is None:
+                    self._request_tile(key=key)
+                elif not tile.isNull():
+                    target_rect = QtCore.QRectF(
+                        tile_x * tile_width * scale_x,
+                        tile_y * tile_height * scale_y,
+                        tile.width() * scale_x,
+                        tile.height() * scale_y
+                    )
+                    painter.drawImage(target_rect, tile)
+
+        # the workers read the set from the pool threads, the still visible tiles are never out of it in between
+        self.wanted_tiles.intersection_update(wanted_tiles)
+        self.wanted_tiles.update(wanted_tiles)
+
+    def _request_tile(self, key):
+        """Decode the tile in the thread pool if it is not being decoded yet.
+
+        Args:
+            key (tuple): (level, tile column, tile row).
+
+        """
+
+        if key in self.pending_tiles:
+            return
+
+        # mark it as wanted now, the worker may start before drawBackground finishes.
+        self.wanted_tiles.add(key)
+
+        worker = TileWorker(
+            source_id=self.source_id, tile_source=self.tile_source, key=key, wanted_tiles=self.wanted_tiles
+        )
+        worker.signals.finished.connect(self.on_tile_finished)
+        self.pending_tiles[key] = worker.signals
+        self.thread_pool.start(worker)
+
+    def on_overview_finished(self, source_id, image):
+        """Keep the decoded overview image and repaint.
+
+        Args:
+            source_id (int): The id of the tile source the overview belongs to.
+            image (QtGui.QImage): The decoded overview, null if it can't be read.
+
+        """
+
+        if source_id != self.source_id:
+            return
+
+        self.overview_signals = None
+        self.overview_image = image
+        self.viewport().update()
+
+    def on_tile_finished(self, source_id, key, tile):
+        """Cache the decoded tile and repaint.
+
+        Args:
+            source_id (int): The id of the tile source the tile belongs to.
+            key (tuple): (level, tile column, tile row).
+            tile (QtGui.QImage): The decoded tile, null if skipped or failed.
+
+        """
+
+        if source_id != self.source_id:
+            return
+
+        self.pending_tiles.pop(key, None)
+        # skipped tiles are requested again when they become visible.
+        if not tile.isNull():
+            self.tile_cache.put(key=key, tile=tile)
+            self.viewport().update()
+
+
+class TextureInspectorDialog(QtWidgets.QDialog):
+    """Window holding the TextureInspector.
+
+    """
+
+    def __init__(self, parent=None):
+        """Initial setting for TextureInspectorDialog.
+
+        Args:
+            parent (QtWidgets.QWidget/None): Parent widget.
+
+        """
+
+        super(TextureInspectorDialog, self).__init__(parent)
+
+        self.resize(900, 900)
+
+        self.inspector = TextureInspector(parent=self)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.inspector)
+
+    def set_texture(self, texture_file_path):
+        """Show a new texture.
+
+        Args:
+            texture_file_path (str): The path of the image file.
+
+        """
+
+        self.setWindowTitle('Texture Inspector - {}'.format(texture_file_path))
+        self.inspector.set_texture(texture_file_path=texture_file_path)
@@ -12,8 +12,8 @@ from functools import partial
 
 from maya import cmds
 from Qt import QtWidgets, QtCore, QtGui, QtCompat, QtOpenGL
-import DATA_ITEMS, treeView
-from utils import fileManage, geoUtils, textureUtils
+import DATA_ITEMS, treeView, previewLoader, textureInspector, textureCompare, libraryScanner, undoStack
+from utils import fileManage, geoUtils, textureUtils, textureCatalog, nameSearch
 
 
 # Get the current maya root workspace
@@ -24,6 +24,12 @@ current_module_path = os.path.abspath(os.path.dirname(__file__))
 ui_file = current_module_path + '/texturesManageUI.ui'
 # initial DATA ITEMS
 DATA_ITEMS = DATA_ITEMS.DATA_ITEMS
+# milliseconds to wait for a burst of textures labs folders changes to settle before rescanning
+TEXTURES_LABS_WATCH_DELAY = 500
+# maximum number of textures listed by the textures labs library search
+TEXTURES_LABS_SEARCH_LIMIT = 200
+# textures labs library search minimum resolutions, (label, minimum width and height)
+TEXTURES_LABS_SEARCH_RESOLUTIONS = (('Any size', 0), ('1K+', 1024), ('2K+', 2048), ('4K+', 4096), ('8K+', 8192))
 
 
 # -------------------------------- Main UI Window --------------------------------
@@ -61,6 +67,58 @@ class TexturesManage(QtWidgets.QMainWindow):
         self.texturesLabsTreeView = None
         self.setup_treeview_widget()
 
+        # initial textures labs catalog, scanner and loaded state
+        self.texturesLabsCatalog = textureCatalog.TextureCatalog(catalog_path=textureCatalog.default_catalog_path())
+        self.texturesLabsScanner = libraryScanner.LibraryScanner(parent=self)
+        self.textures_labs_path = ''
+        self.textures_labs_folders_items = {}
+        self.textures_labs_files_items = {}
+        self.textures_labs_loaded_folders = set()
+        # textures versions of the loaded folders, by (folder, base name, extension), latest version first
+        self.textures_labs_versions = {}
+        self.textures_labs_versions_items = {}
+        self.textures_labs_changes_count = 0
+
+        # library search above the textures labs filter field, searches the whole catalog, not only the loaded folders
+        self.texturesLabsSearch_lineEdit = None
+        self.texturesLabsSearch_comboBox = None
+        self.texturesLabsSearch_completer = None
+        self.textures_labs_search_paths = []
+        self.create_textures_labs_search_field(layout=self.ui.texturesLabs_treeView_verticalLayout)
+
+        # watch the loaded textures labs folders and their textures, changes are rescanned once a burst settles,
+        # folders only notify added, removed and renamed files, textures overwritten in place are watched themselves
+        self.texturesLabsWatcher = QtCore.QFileSystemWatcher(self)
+        self.texturesLabsWatch_timer = QtCore.QTimer(self)
+        self.texturesLabsWatch_timer.setSingleShot(True)
+        self.texturesLabsWatch_timer.setInterval(TEXTURES_LABS_WATCH_DELAY)
+        self.textures_labs_changed_folders = set()
+
+        # initial preview loaders
+        self.texturesPreviewLoader = previewLoader.PreviewLoader(label=self.ui.texturesPreview_label, parent=self)
+        self.texturesLabsPreviewLoader = previewLoader.PreviewLoader(
+            label=self.ui.texturesLabsPreview_label, parent=self
+        )
+
+        # exposure sliders for high dynamic range / high bit depth textures preview
+        self.texturesExposure_slider = self.create_exposure_slider(
+            layout=self.ui.texturesPreview_groupBox_horizontalLayout, preview_loader=self.texturesPreviewLoader
+        )
+        self.texturesLabsExposure_slider = self.create_exposure_slider(
+            layout=self.ui.texturesLabsPreview_groupBox_horizontalLayout, preview_loader=self.texturesLabsPreviewLoader
+        )
+
+        # initial texture compare, the labs space holder button becomes compare button.
+        self.textureCompareDialog = None
+        self.ui.texturesLabsSpaceHolder_pushButton.setText('Compare')
+        self.ui.texturesLabsSpaceHolder_pushButton.setEnabled(textureCompare.np is not None)
+
+        # initial texture inspector, double click on preview label to open it.
+        self.textureInspectorDialog = None
+        for preview_label in [self.ui.texturesPreview_label, self.ui.texturesLabsPreview_label]:
+            preview_label.setToolTip('Double click to inspect the texture')
+            preview_label.installEventFilter(self)
+
         # initial status bar message
         self.ui.statusbar.showMessage("Welcome to Frank's Textures Manage V1.0! ---------- ")
 
@@ -104,6 +162,14 @@ class TexturesManage(QtWidgets.QMainWindow):
         self.geometriesTreeView.setDragEnabled(False)
         self.geometriesTreeView.setDragDropMode(self.geometriesTreeView.NoDragDrop)
         self.geometriesTreeView.setSelectionMode(self.geometriesTreeView.SingleSelection)
+        # set the rows preset, (type, geometry)
+        self.geometriesTreeView.add_row_preset(
+            preset='geometry',
+            columns_kwargs=[
+                self.get_column_kwargs(bg_color=[50, 50, 50], column_size=125),
+                self.get_column_kwargs(bg_color=[40, 40, 40], column_size=250)
+            ]
+        )
 
         # shadersTreeView --------------------------------------------------------------------
         self.shadersTreeView = treeView.TreeView(color_setting=treeview_color_setting)
@@ -120,6 +186,14 @@ class TexturesManage(QtWidgets.QMainWindow):
         self.shadersTreeView.setDragEnabled(False)
         self.shadersTreeView.setDragDropMode(self.shadersTreeView.NoDragDrop)
         self.shadersTreeView.setSelectionMode(self.shadersTreeView.SingleSelection)
+        # set the rows preset, (shader node type, shader)
+        self.shadersTreeView.add_row_preset(
+            preset='shader',
+            columns_kwargs=[
+                self.get_column_kwargs(bg_color=[50, 50, 50], column_size=125),
+                self.get_column_kwargs(bg_color=[40, 40, 40], column_size=250)
+            ]
+        )
 
         # texturesTreeView --------------------------------------------------------------------
         self.texturesTreeView = treeView.TreeView(color_setting=treeview_color_setting)
@@ -136,6 +210,15 @@ class TexturesManage(QtWidgets.QMainWindow):
         self.texturesTreeView.setDragEnabled(False)
         self.texturesTreeView.setDragDropMode(self.texturesTreeView.NoDragDrop)
         self.texturesTreeView.setSelectionMode(self.texturesTreeView.SingleSelection)
+        # set the rows preset, (file node, texture file name, texture file path tool tip)
+        self.texturesTreeView.add_row_preset(
+            preset='texture',
+            columns_kwargs=[
+                self.get_column_kwargs(bg_color=[50, 50, 50], column_size=125),
+                self.get_column_kwargs(bg_color=[40, 40, 40], column_size=250)
+            ],
+            tool_tip_columns=(1,)
+        )
 
         # texturesLabsTreeView --------------------------------------------------------------------
         self.texturesLabsTreeView = treeView.TreeView(color_setting=treeview_color_setting)
@@ -151,6 +234,268 @@ class TexturesManage(QtWidgets.QMainWindow):
         self.texturesLabsTreeView.setDragEnabled(False)
         self.texturesLabsTreeView.setDragDropMode(self.texturesLabsTreeView.NoDragDrop)
         self.texturesLabsTreeView.setSelectionMode(self.texturesLabsTreeView.SingleSelection)
+        # set the rows presets, (name, path tool tip)
+        self.texturesLabsTreeView.add_row_preset(
+            preset='folder',
+            columns_kwargs=[self.get_column_kwargs(bg_color=[50, 50, 50], column_size=250, bold=True)],
+            tool_tip_columns=(0,)
+        )
+        self.texturesLabsTreeView.add_row_preset(
+            preset='file',
+            columns_kwargs=[self.get_column_kwargs(bg_color=[50, 50, 50], column_size=250)],
+            tool_tip_columns=(0,)
+        )
+        self.texturesLabsTreeView.add_row_preset(
+            preset='older_file',
+            columns_kwargs=[
+                self.get_column_kwargs(bg_color=[50, 50, 50], column_size=250, text_color=[125, 125, 125])
+            ],
+            tool_tip_columns=(0,)
+        )
+
+        # filter fields above the tree views --------------------------------------------------------------------
+        for layout, tree_view in [
+            (self.ui.geometries_treeView_verticalLayout, self.geometriesTreeView),
+            (self.ui.shaders_treeView_verticalLayout, self.shadersTreeView),
+            (self.ui.textures_treeView_verticalLayout, self.texturesTreeView),
+            (self.ui.texturesLabs_treeView_verticalLayout, self.texturesLabsTreeView)
+        ]:
+            self.create_filter_field(layout=layout, tree_view=tree_view)
+            self.create_undo_actions(tree_view=tree_view)
+
+    @staticmethod
+    def get_column_kwargs(bg_color, column_size, bold=False, text_color=None):
+        """Return the column kwargs of the not editable items of the tree views rows presets.
+
+        Args:
+            bg_color (list): The back ground color, [r, g, b]
+            column_size (int): The column size.
+            bold (bool): Bold text or not.
+            text_color (list/None): The text color, [r, g, b], None for [175, 175, 175]
+
+        Returns:
+            dict: The column kwargs.
+
+        """
+
+        column_kwargs = DATA_ITEMS['str'].copy()
+        column_kwargs['bg_color'] = bg_color
+        column_kwargs['bg_alpha'] = 255
+        column_kwargs['text_color'] = text_color or [175, 175, 175]
+        column_kwargs['text_alpha'] = 255
+        column_kwargs['size'] = 9
+        column_kwargs['bold'] = bold
+        column_kwargs['column_size'] = column_size
+        column_kwargs['editable'] = False
+        column_kwargs['paint'] = False
+
+        return column_kwargs
+
+    @staticmethod
+    def create_filter_field(layout, tree_view):
+        """Create filter line edit and filter mode combo box above the tree view, filter as you type.
+
+        Args:
+            layout (QtWidgets.QBoxLayout): The tree view layout to insert the filter field to.
+            tree_view (treeView.TreeView): The tree view to filter.
+
+        Returns:
+            QtWidgets.QLineEdit: The filter line edit.
+
+        """
+
+        filter_lineEdit = QtWidgets.QLineEdit()
+        filter_lineEdit.setPlaceholderText('Filter, enter to select the best match')
+        filter_lineEdit.setClearButtonEnabled(True)
+
+        filter_mode_comboBox = QtWidgets.QComboBox()
+        filter_mode_comboBox.addItems(nameSearch.FILTER_MODES)
+        filter_mode_comboBox.setToolTip(
+            'Substring: text anywhere in the name\r'
+            'Glob: wild cards * ? [...], example: *_albedo_v0??.png\r'
+            'Fuzzy: text characters in order, example: wdalb matches wood_albedo'
+        )
+
+        def filter_items(*args):
+            tree_view.filter_items(text=filter_lineEdit.text(), mode=filter_mode_comboBox.currentText())
+
+        filter_lineEdit.textChanged.connect(filter_items)
+        # enter selects the best ranked match, even with typos
+        filter_lineEdit.returnPressed.connect(lambda: tree_view.select_best_match(text=filter_lineEdit.text()))
+        filter_mode_comboBox.currentIndexChanged.connect(filter_items)
+
+        filter_layout = QtWidgets.QHBoxLayout()
+        filter_layout.addWidget(filter_lineEdit)
+        filter_layout.addWidget(filter_mode_comboBox)
+        layout.insertLayout(0, filter_layout)
+
+        return filter_lineEdit
+
+    @staticmethod
+    def create_undo_actions(tree_view):
+        """Create undo / redo actions of the tree view edits, in the tree view right click menu.
+           Their shortcuts only work while the tree view has focus, maya undo keeps the shortcuts everywhere else.
+
+        Args:
+            tree_view (treeView.TreeView): The tree view to undo / redo the edits of.
+
+        Returns:
+            tuple: (undo QtWidgets.QAction, redo QtWidgets.QAction)
+
+        """
+
+        undo_stack = tree_view.undo_stack
+
+        undo_action = QtWidgets.QAction('Undo', tree_view)
+        undo_action.setShortcut(QtGui.QKeySequence.Undo)
+        undo_action.setShortcutContext(QtCore.Qt.WidgetShortcut)
+        undo_action.triggered.connect(undo_stack.undo)
+
+        redo_action = QtWidgets.QAction('Redo', tree_view)
+        redo_action.setShortcut(QtGui.QKeySequence.Redo)
+        redo_action.setShortcutContext(QtCore.Qt.WidgetShortcut)
+        redo_action.triggered.connect(undo_stack.redo)
+
+        def update_actions(*args):
+            undo_action.setEnabled(undo_stack.can_undo())
+            undo_action.setText(' '.join(['Undo', undo_stack.undo_text()]).strip())
+            redo_action.setEnabled(undo_stack.can_redo())
+            redo_action.setText(' '.join(['Redo', undo_stack.redo_text()]).strip())
+
+        undo_stack.index_changed.connect(update_actions)
+        update_actions()
+
+        tree_view.addAction(undo_action)
+        tree_view.addAction(redo_action)
+        tree_view.setContextMenuPolicy(QtCore.Qt.ActionsContextMenu)
+
+        return undo_action, redo_action
+
+    def create_textures_labs_search_field(self, layout):
+        """Create the textures labs library search line edit and minimum resolution combo box,
+           the matched textures of the catalog are listed in a popup as you type.
+
+        Args:
+            layout (QtWidgets.QBoxLayout): The textures labs tree view layout to insert the search field to.
+
+        """
+
+        self.texturesLabsSearch_lineEdit = QtWidgets.QLineEdit()
+        self.texturesLabsSearch_lineEdit.setPlaceholderText('Search library, name in the whole textures labs path')
+        self.texturesLabsSearch_lineEdit.setClearButtonEnabled(True)
+
+        self.texturesLabsSearch_comboBox = QtWidgets.QComboBox()
+        for label, resolution in TEXTURES_LABS_SEARCH_RESOLUTIONS:
+            self.texturesLabsSearch_comboBox.addItem(label, resolution)
+        self.texturesLabsSearch_comboBox.setToolTip('Minimum width and height of the searched textures')
+
+        # the popup lists the catalog matches as they are, the completer doesn't filter them again
+        self.texturesLabsSearch_completer = QtWidgets.QCompleter(self)
+        self.texturesLabsSearch_completer.setModel(QtCore.QStringListModel(self.texturesLabsSearch_completer))
+        self.texturesLabsSearch_completer.setCompletionMode(QtWidgets.QCompleter.UnfilteredPopupCompletion)
+        self.texturesLabsSearch_completer.setWidget(self.texturesLabsSearch_lineEdit)
+
+        search_layout = QtWidgets.QHBoxLayout()
+        search_layout.addWidget(self.texturesLabsSearch_lineEdit)
+        search_layout.addWidget(self.texturesLabsSearch_comboBox)
+        layout.insertLayout(0, search_layout)
+
+    def search_textures_labs_catalog(self, *args):
+        """Query the catalog of the textures labs path with the search name and minimum resolution,
+           list the matched textures in the search popup.
+
+        """
+
+        name = self.texturesLabsSearch_lineEdit.text().strip()
+        resolution = self.texturesLabsSearch_comboBox.itemData(self.texturesLabsSearch_comboBox.currentIndex()) or 0
+
+        records = []
+        if self.textures_labs_path and (name or resolution):
+            records = self.texturesLabsCatalog.query(
+                root=self.textures_labs_path,
+                name=name,
+                min_width=resolution,
+                min_height=resolution,
+                limit=TEXTURES_LABS_SEARCH_LIMIT
+            )
+
+        self.textures_labs_search_paths = [record[0] for record in records]
+        self.texturesLabsSearch_completer.model().setStringList([
+            '{}    {}x{}    {}'.format(record[2], record[7], record[8], record[1][len(self.textures_labs_path):] or '/')
+            for record in records
+        ])
+
+        if records:
+            self.texturesLabsSearch_completer.complete()
+        else:
+            self.texturesLabsSearch_completer.popup().hide()
+
+    def reveal_textures_labs_search_result(self, index):
+        """Select the texture chosen in the search popup in texturesLabsTreeView,
+           its not loaded folders and versions group are loaded from the catalog first.
+
+        Args:
+            index (QtCore.QModelIndex): The chosen row of the search popup.
+
+        """
+
+        path = self.textures_labs_search_paths[index.row()]
+        model = self.texturesLabsTreeView.model
+
+        # folders from the textures labs path down to the texture folder
+        folder = path.rpartition('/')[0]
+        folders = []
+        while folder != self.textures_labs_path and folder.startswith(self.textures_labs_path + '/'):
+            folders.insert(0, folder)
+            folder = folder.rpartition('/')[0]
+
+        for folder in folders:
+            folder_item = self.textures_labs_folders_items.get(folder)
+            if folder_item is None:
+                return
+            # fetching runs the children callback of the item once, the same as expanding it
+            if model.canFetchMore(folder_item.index()):
+                model.fetchMore(folder_item.index())
+            self.texturesLabsTreeView.expand(folder_item.index())
+
+        # older versions are added under the latest version once it is fetched
+        version_item = self.textures_labs_versions_items.get(self.get_textures_labs_version_key(path=path))
+        if path not in self.textures_labs_files_items and version_item is not None:
+            if model.canFetchMore(version_item.index()):
+                model.fetchMore(version_item.index())
+            self.texturesLabsTreeView.expand(version_item.index())
+
+        file_item = self.textures_labs_files_items.get(path)
+        if file_item is not None:
+            self.texturesLabsTreeView.setCurrentIndex(file_item.index())
+            self.texturesLabsTreeView.scrollTo(file_item.index())
+
+    @staticmethod
+    def create_exposure_slider(layout, preview_loader):
+        """Create exposure slider next to the preview label, -10 to +10 stops in 0.1 step.
+
+        Args:
+            layout (QtWidgets.QLayout): The preview label layout to add the slider to.
+            preview_loader (previewLoader.PreviewLoader): The preview loader to set exposure.
+
+        Returns:
+            QtWidgets.QSlider: The exposure slider.
+
+        """
+
+        exposure_slider = QtWidgets.QSlider(QtCore.Qt.Vertical)
+        exposure_slider.setRange(-100, 100)
+        exposure_slider.setValue(0)
+        exposure_slider.setToolTip('Exposure: +0.0')
+
+        def set_exposure(value):
+            exposure_slider.setToolTip('Exposure: {:+.1f}'.format(value / 10.0))
+            preview_loader.set_exposure(exposure=value / 10.0)
+
+        exposure_slider.valueChanged.connect(set_exposure)
+        layout.addWidget(exposure_slider)
+
+        return exposure_slider
 
     def load_geometries(self, selected):
         """Load geometries into geometriesTreeView, so to query connected shaders later on.
@@ -169,35 +514,12 @@ class TexturesManage(QtWidgets.QMainWindow):
         geos_dict = geoUtils.get_geos(selected=selected)
 
         if geos_dict:
-            geos_kwargs_to_add = []
-            for geo, geo_type in geos_dict.items():
-                type_kwargs = DATA_ITEMS['str'].copy()
-                type_kwargs['default'] = geo_type
-                type_kwargs['bg_color'] = [50, 50, 50]
-                type_kwargs['bg_alpha'] = 255
-                type_kwargs['text_color'] = [175, 175, 175]
-                type_kwargs['text_alpha'] = 255
-                type_kwargs['size'] = 9
-                type_kwargs['bold'] = False
-                type_kwargs['column_size'] = 125
-                type_kwargs['editable'] = False
-                type_kwargs['paint'] = False
-
-                geo_kwargs = DATA_ITEMS['str'].copy()
-                geo_kwargs['default'] = geo
-                geo_kwargs['bg_color'] = [40, 40, 40]
-                geo_kwargs['bg_alpha'] = 255
-                geo_kwargs['text_color'] = [175, 175, 175]
-                geo_kwargs['text_alpha'] = 255
-                geo_kwargs['size'] = 9
-                geo_kwargs['bold'] = False
-                geo_kwargs['column_size'] = 250
-                geo_kwargs['editable'] = False
-                geo_kwargs['paint'] = False
-
-                geos_kwargs_to_add.append([type_kwargs, geo_kwargs])
-
-            self.geometriesTreeView.add_items(items_kwargs=geos_kwargs_to_add, unique_name=False, parent_item=None)
+            self.geometriesTreeView.add_items(
+                items_values=[(geo_type, geo) for geo, geo_type in geos_dict.items()],
+                preset='geometry',
+                unique_name=False,
+                parent_item=None
+            )
 
     def load_shaders(self):
         """Load selected geometry's connected shaders into shadersTreeView, so to query connected textures later on.
@@ -218,37 +540,12 @@ class TexturesManage(QtWidgets.QMainWindow):
                 geo = geo_item['kwargs']['default']
 
                 shaders = textureUtils.get_geo_connected_shaders(geo=geo)
-                shaders_kwargs_to_add = []
-                for shader, shader_node in shaders.items():
-                    node_kwargs = DATA_ITEMS['str'].copy()
-                    node_kwargs['default'] = shader_node
-                    node_kwargs['bg_color'] = [50, 50, 50]
-                    node_kwargs['bg_alpha'] = 255
-                    node_kwargs['text_color'] = [175, 175, 175]
-                    node_kwargs['text_alpha'] = 255
-                    node_kwargs['size'] = 9
-                    node_kwargs['bold'] = False
-                    node_kwargs['column_size'] = 125
-                    node_kwargs['editable'] = False
-                    node_kwargs['paint'] = False
-
-                    shader_kwargs = DATA_ITEMS['str'].copy()
-                    shader_kwargs['default'] = shader
-                    shader_kwargs['bg_color'] = [40, 40, 40]
-                    shader_kwargs['bg_alpha'] = 255
-                    shader_kwargs['text_color'] = [175, 175, 175]
-                    shader_kwargs['text_alpha'] = 255
-                    shader_kwargs['size'] = 9
-                    shader_kwargs['bold'] = False
-                    shader_kwargs['column_size'] = 250
-                    shader_kwargs['editable'] = False
-                    shader_kwargs['paint'] = False
-
-                    shaders_kwargs_to_add.append([node_kwargs, shader_kwargs])
-
-                if shaders_kwargs_to_add:
+                if shaders:
                     self.shadersTreeView.add_items(
-                        items_kwargs=shaders_kwargs_to_add, unique_name=False, parent_item=None
+                        items_values=[(shader_node, shader) for shader, shader_node in shaders.items()],
+                        preset='shader',
+                        unique_name=False,
+                        parent_item=None
                     )
 
     def load_textures(self):
@@ -269,38 +566,15 @@ class TexturesManage(QtWidgets.QMainWindow):
                 shader = shader_item['kwargs']['default']
 
                 textures_files = textureUtils.get_shader_connected_textures_files(shader=shader)
-                textures_files_kwargs_to_add = []
-                for file_node, texture_file_path in textures_files.items():
-                    node_kwargs = DATA_ITEMS['str'].copy()
-                    node_kwargs['default'] = file_node
-                    node_kwargs['bg_color'] = [50, 50, 50]
-                    node_kwargs['bg_alpha'] = 255
-                    node_kwargs['text_color'] = [175, 175, 175]
-                    node_kwargs['text_alpha'] = 255
-                    node_kwargs['size'] = 9
-                    node_kwargs['bold'] = False
-                    node_kwargs['column_size'] = 125
-                    node_kwargs['editable'] = False
-                    node_kwargs['paint'] = False
-
-                    path_kwargs = DATA_ITEMS['str'].copy()
-                    path_kwargs['default'] = texture_file_path.split('/')[-1]
-                    path_kwargs['bg_color'] = [40, 40, 40]
-                    path_kwargs['bg_alpha'] = 255
-                    path_kwargs['text_color'] = [175, 175, 175]
-                    path_kwargs['text_alpha'] = 255
-                    path_kwargs['size'] = 9
-                    path_kwargs['bold'] = False
-                    path_kwargs['column_size'] = 250
-                    path_kwargs['editable'] = False
-                    path_kwargs['paint'] = False
-                    path_kwargs['toolTip'] = texture_file_path
-
-                    textures_files_kwargs_to_add.append([node_kwargs, path_kwargs])
-
-                if textures_files_kwargs_to_add:
+                if textures_files:
                     self.texturesTreeView.add_items(
-                        items_kwargs=textures_files_kwargs_to_add, unique_name=False, parent_item=None
+                        items_values=[
+                            (file_node, texture_file_path.split('/')[-1], texture_file_path)
+                            for file_node, texture_file_path in textures_files.items()
+                        ],
+                        preset='texture',
+                        unique_name=False,
+                        parent_item=None
                     )
 
     def set_textures_labs_path(self):
@@ -319,36 +593,347 @@ class TexturesManage(QtWidgets.QMainWindow):
 
             # refresh textures labs tree view
             self.texturesLabsTreeView.refresh()
+            self.textures_labs_path = textures_labs_path
+            self.textures_labs_folders_items = {}
+            self.textures_labs_files_items = {}
+            self.textures_labs_loaded_folders = set()
+            self.textures_labs_versions = {}
+            self.textures_labs_versions_items = {}
+            self.textures_labs_changes_count = 0
+
+            # stop watching the previous textures labs folders and textures
+            if self.texturesLabsWatcher.directories():
+                self.texturesLabsWatcher.removePaths(self.texturesLabsWatcher.directories())
+            if self.texturesLabsWatcher.files():
+                self.texturesLabsWatcher.removePaths(self.texturesLabsWatcher.files())
+            self.texturesLabsWatch_timer.stop()
+            self.textures_labs_changed_folders = set()
+
+            # show the catalogued textures at once, the other folders are queried when they are expanded
+            self.load_textures_labs_folder(folder=textures_labs_path)
+
+            # update the catalog in the background, only the changed textures are applied to the tree view
+            self.ui.statusbar.showMessage('Scanning {} ...'.format(textures_labs_path))
+            self.texturesLabsScanner.scan(
+                catalog_path=self.texturesLabsCatalog.catalog_path,
+                path=textures_labs_path,
+                extensions=textureUtils.TEXTURE_EXTENSIONS
+            )
 
-            images_types = [".jpg", ".tif", ".png", ".JPG", "JPEG", "JPE", "PNG", "TIF", "TIFF"]
-            images = []
-            for image_type in images_types:
-                type_images = fileManage.get_all_files(
-                    path=textures_labs_path, file_extension=image_type, return_without_ext=False
-                )
-                images.extend(type_images)
-
-            textures_labs_files_kwargs_to_add = []
-            for image in images:
-                image_path_kwargs = DATA_ITEMS['str'].copy()
-                image_path_kwargs['default'] = image
-                image_path_kwargs['bg_color'] = [50, 50, 50]
-                image_path_kwargs['bg_alpha'] = 255
-                image_path_kwargs['text_color'] = [175, 175, 175]
-                image_path_kwargs['text_alpha'] = 255
-                image_path_kwargs['size'] = 9
-                image_path_kwargs['bold'] = False
-                image_path_kwargs['column_size'] = 250
-                image_path_kwargs['editable'] = False
-                image_path_kwargs['paint'] = False
-                image_path_kwargs['toolTip'] = '{}/{}'.format(textures_labs_path, image)
-
-                textures_labs_files_kwargs_to_add.append([image_path_kwargs])
-
-            if textures_labs_files_kwargs_to_add:
-                self.texturesLabsTreeView.add_items(
-                    items_kwargs=textures_labs_files_kwargs_to_add, unique_name=False, parent_item=None
-                )
+    def load_textures_labs_folder(self, folder):
+        """Query the sub folders and the textures directly in the folder from the catalog into texturesLabsTreeView.
+
+        Args:
+            folder (str): The textures labs path or a folder path under it.
+
+        """
+
+        self.textures_labs_loaded_folders.add(folder)
+        self.texturesLabsWatcher.addPath(folder)
+
+        for sub_folder in self.texturesLabsCatalog.get_folders(parent=folder):
+            self.add_textures_labs_folder(folder=sub_folder)
+
+        records = self.texturesLabsCatalog.query(folder=folder)
+        self.add_textures_labs_files(records=records)
+        self.watch_textures_labs_files(records=records)
+
+    def watch_textures_labs_files(self, records):
+        """Watch the textures files of the loaded folders, to rescan their folder once they are overwritten in place.
+           Removed and renamed files are no longer watched, they are watched again once their folder is rescanned.
+
+        Args:
+            records (list): Textures records in textureCatalog.CATALOG_FIELDS order.
+
+        """
+
+        paths = [record[0] for record in records if record[1] in self.textures_labs_loaded_folders]
+        if paths:
+            self.texturesLabsWatcher.addPaths(paths)
+
+    @staticmethod
+    def get_textures_labs_version_key(path):
+        """Return the versions group key of the texture, textures versions are grouped by folder.
+
+        Args:
+            path (str): The texture file path.
+
+        Returns:
+            tuple: (folder, version base name, lower case extension)
+
+        """
+
+        folder, _, file_name = path.rpartition('/')
+        base_name, extension, _ = fileManage.split_version(file_name=file_name)
+
+        return folder, base_name, extension
+
+    def add_textures_labs_folder(self, folder):
+        """Add the folder item into texturesLabsTreeView under its loaded parent folder,
+           its children are loaded from the catalog once it is expanded.
+
+        Args:
+            folder (str): The folder path under the textures labs path.
+
+        """
+
+        if folder in self.textures_labs_folders_items:
+            return
+
+        parent_folder, _, folder_name = folder.rpartition('/')
+
+        folder_items = self.texturesLabsTreeView.add_items(
+            items_values=[(folder_name, folder)],
+            preset='folder',
+            unique_name=False,
+            parent_item=self.textures_labs_folders_items.get(parent_folder)
+        )
+        self.texturesLabsTreeView.set_children_callback(
+            item=folder_items[0][0], callback=lambda item, folder=folder: self.load_textures_labs_folder(folder=folder)
+        )
+        self.textures_labs_folders_items[folder] = folder_items[0][0]
+
+    def add_textures_labs_files(self, records):
+        """Add textures catalog records into texturesLabsTreeView, under their loaded folders items.
+           Textures versions are grouped by base name, only the latest version is added,
+           the older versions are added under it when it is expanded.
+
+        Args:
+            records (list): Textures records in textureCatalog.CATALOG_FIELDS order.
+
+        """
+
+        folders_records = {}
+        for record in records:
+            folders_records.setdefault(record[1], []).append(record)
+
+        for folder in sorted(folders_records):
+            folder_records = sorted(folders_records[folder], key=lambda folder_record: folder_record[2].lower())
+            folder_versions = fileManage.group_versions(
+                items=folder_records, key=lambda folder_record: folder_record[2]
+            )
+
+            files_items = self.texturesLabsTreeView.add_items(
+                items_values=[
+                    (version_records[0][2], version_records[0][0]) for version_records in folder_versions
+                ],
+                preset='file',
+                unique_name=False,
+                parent_item=self.textures_labs_folders_items.get(folder)
+            )
+            for version_records, file_items in zip(folder_versions, files_items):
+                version_key = self.get_textures_labs_version_key(path=version_records[0][0])
+                self.textures_labs_versions[version_key] = version_records
+                self.textures_labs_versions_items[version_key] = file_items[0]
+                self.textures_labs_files_items[version_records[0][0]] = file_items[0]
+
+                if len(version_records) > 1:
+                    self.texturesLabsTreeView.set_children_callback(
+                        item=file_items[0],
+                        callback=lambda item, version_key=version_key: self.load_textures_labs_versions(
+                            version_key=version_key
+                        )
+                    )
+
+    def load_textures_labs_versions(self, version_key):
+        """Add the older versions of the texture under its latest version item.
+
+        Args:
+            version_key (tuple): The versions group key, (folder, version base name, lower case extension).
+
+        """
+
+        older_records = self.textures_labs_versions[version_key][1:]
+        files_items = self.texturesLabsTreeView.add_items(
+            items_values=[(record[2], record[0]) for record in older_records],
+            preset='older_file',
+            unique_name=False,
+            parent_item=self.textures_labs_versions_items[version_key]
+        )
+        for record, file_items in zip(older_records, files_items):
+            self.textures_labs_files_items[record[0]] = file_items[0]
+
+    def remove_textures_labs_versions(self, version_key):
+        """Remove the versions group item with its older versions items from texturesLabsTreeView.
+
+        Args:
+            version_key (tuple): The versions group key, (folder, version base name, lower case extension).
+
+        Returns:
+            list: The versions group records, to add them again once the group changed.
+
+        """
+
+        version_records = self.textures_labs_versions.pop(version_key)
+        item = self.textures_labs_versions_items.pop(version_key)
+        for record in version_records:
+            self.textures_labs_files_items.pop(record[0], None)
+
+        parent_item = item.parent() or self.texturesLabsTreeView.model.invisibleRootItem()
+        parent_item.removeRow(item.row())
+
+        return version_records
+
+    def apply_textures_labs_changes(self, changed_records, removed_paths):
+        """Apply a batch of catalog changes into texturesLabsTreeView, unchanged rows are kept as they are.
+
+        Args:
+            changed_records (list): New or modified textures records in textureCatalog.CATALOG_FIELDS order.
+            removed_paths (list): Paths of the textures no longer on the disk.
+
+        """
+
+        removed_folders = set()
+        # versions groups whose versions are added or removed, they are added again with the changed versions
+        changed_versions = set()
+        for path in removed_paths:
+            removed_folders.add(path.rpartition('/')[0])
+
+            version_key = self.get_textures_labs_version_key(path=path)
+            version_records = self.textures_labs_versions.get(version_key)
+            if version_records is not None:
+                version_records[:] = [record for record in version_records if record[0] != path]
+                self.textures_labs_files_items.pop(path, None)
+                changed_versions.add(version_key)
+
+        # modified textures keep their rows, new textures in the not loaded folders are queried when expanded
+        records_to_add = []
+        modified_paths = set()
+        for record in changed_records:
+            version_key = self.get_textures_labs_version_key(path=record[0])
+            version_records = self.textures_labs_versions.get(version_key)
+            if version_records is not None:
+                version_paths = [version_record[0] for version_record in version_records]
+                if record[0] in version_paths:
+                    version_records[version_paths.index(record[0])] = record
+                    if record[0] in self.textures_labs_files_items:
+                        modified_paths.add(record[0])
+                else:
+                    version_records.append(record)
+                    changed_versions.add(version_key)
+                continue
+
+            folder = record[1]
+            if folder in self.textures_labs_loaded_folders:
+                records_to_add.append(record)
+                continue
+
+            # show the new folder under the loaded folder
+            while folder.rpartition('/')[0] not in self.textures_labs_loaded_folders:
+                folder = folder.rpartition('/')[0]
+            self.add_textures_labs_folder(folder=folder)
+
+        # remove the changed versions groups before their folders items may be removed
+        for version_key in changed_versions:
+            records_to_add.extend(self.remove_textures_labs_versions(version_key=version_key))
+
+        # folders removed from the disk, remove the top most removed folder item
+        for folder in removed_folders:
+            if os.path.isdir(folder):
+                continue
+            while folder.rpartition('/')[0] != self.textures_labs_path and \
+                    not os.path.isdir(folder.rpartition('/')[0]):
+                folder = folder.rpartition('/')[0]
+
+            folder_item = self.textures_labs_folders_items.get(folder)
+            if folder_item is not None:
+                parent_item = folder_item.parent() or self.texturesLabsTreeView.model.invisibleRootItem()
+                parent_item.removeRow(folder_item.row())
+                for sub_folder in [sub for sub in self.textures_labs_folders_items if sub.startswith(folder + '/')]:
+                    del self.textures_labs_folders_items[sub_folder]
+                    self.textures_labs_loaded_folders.discard(sub_folder)
+                del self.textures_labs_folders_items[folder]
+                self.textures_labs_loaded_folders.discard(folder)
+
+        if records_to_add:
+            self.add_textures_labs_files(records=records_to_add)
+
+        # new and replaced textures files, the already watched ones are skipped by the watcher
+        self.watch_textures_labs_files(records=changed_records)
+
+        if modified_paths:
+            self.reload_modified_textures(texture_file_paths=modified_paths)
+
+        self.textures_labs_changes_count += len(changed_records) + len(removed_paths)
+        self.ui.statusbar.showMessage(
+            'Scanning {} ... {} textures changed'.format(self.textures_labs_path, self.textures_labs_changes_count)
+        )
+
+    def reload_modified_textures(self, texture_file_paths):
+        """Reload the previews, metadata, compare and inspector showing the textures modified on the disk.
+
+        Args:
+            texture_file_paths (set): The modified textures paths.
+
+        """
+
+        if self.texturesPreviewLoader.texture_file_path in texture_file_paths:
+            self.load_texture_to_preview_and_metadata_box()
+
+        if self.texturesLabsPreviewLoader.texture_file_path in texture_file_paths:
+            self.load_texture_to_labs_preview_and_metadata_box()
+
+        if self.textureCompareDialog and self.textureCompareDialog.isVisible():
+            self.textureCompareDialog.reload_textures(texture_file_paths=texture_file_paths)
+
+        if self.textureInspectorDialog and self.textureInspectorDialog.isVisible():
+            texture_file_path = self.textureInspectorDialog.inspector.texture_file_path
+            if texture_file_path in texture_file_paths:
+                self.textureInspectorDialog.set_texture(texture_file_path=texture_file_path)
+
+    def collect_textures_labs_changed_folder(self, folder):
+        """Collect the changed textures labs folder, restart the timer to wait for the burst of changes to settle.
+
+        Args:
+            folder (str): The changed folder path.
+
+        """
+
+        self.textures_labs_changed_folders.add(folder)
+        self.texturesLabsWatch_timer.start()
+
+    def collect_textures_labs_changed_file(self, path):
+        """Collect the folder of the changed textures labs file, it is rescanned with the changed folders.
+
+        Args:
+            path (str): The changed texture file path.
+
+        """
+
+        self.collect_textures_labs_changed_folder(folder=path.rpartition('/')[0])
+
+    def rescan_textures_labs_changed_folders(self):
+        """Rescan only the collected changed folders in the background, the changes are applied to the tree view.
+
+        """
+
+        # the running scan writes the same catalog, rescan once it is finished
+        if self.texturesLabsScanner.scanning:
+            self.texturesLabsWatch_timer.start()
+            return
+
+        changed_folders = sorted(self.textures_labs_changed_folders)
+        self.textures_labs_changed_folders = set()
+
+        self.texturesLabsScanner.scan(
+            catalog_path=self.texturesLabsCatalog.catalog_path,
+            path=self.textures_labs_path,
+            extensions=textureUtils.TEXTURE_EXTENSIONS,
+            folders=changed_folders
+        )
+
+    def finish_textures_labs_scan(self):
+        """Show the textures labs scan result.
+
+        """
+
+        self.ui.statusbar.showMessage(
+            '{} textures found in {}, {} changed'.format(
+                self.texturesLabsCatalog.count(root=self.textures_labs_path),
+                self.textures_labs_path,
+                self.textures_labs_changes_count
+            )
+        )
 
     def load_texture_to_preview_and_metadata_box(self):
         """Load selected texture into preview label
@@ -357,7 +942,7 @@ class TexturesManage(QtWidgets.QMainWindow):
         """
 
         # load texture
-        texture_pixmap = QtGui.QPixmap('')
+        texture_file_path = ''
         texture_metadata_info = ''
 
         indexes = self.texturesTreeView.selectedIndexes()
@@ -368,8 +953,8 @@ class TexturesManage(QtWidgets.QMainWindow):
             texture_path, texture_file = texture_file_path[0], texture_file_path[-1]
 
             if fileManage.check_file_exist(path=texture_path, user_file=texture_file):
-                # set texture pixmap for preview
-                texture_pixmap = QtGui.QPixmap(texture_item['kwargs']['toolTip'])
+                # set texture path for preview
+                texture_file_path = texture_item['kwargs']['toolTip']
                 # get texture metadata for information display
                 texture_metadata_dict = textureUtils.get_image_metadata(
                     texture_file_path=texture_item['kwargs']['toolTip']
@@ -377,12 +962,11 @@ class TexturesManage(QtWidgets.QMainWindow):
                 for key, value in texture_metadata_dict.items():
                     texture_metadata_info += ("{:20}: {}\r".format(key, value))
 
-        # set pixmap to label
-        self.ui.texturesPreview_label.setPixmap(
-            texture_pixmap.scaled(
-                self.ui.texturesPreview_label.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation
-            )
-        )
+        # set texture to preview label, thumbnail first, scaled texture when it is decoded.
+        if texture_file_path:
+            self.texturesPreviewLoader.load(texture_file_path=texture_file_path)
+        else:
+            self.texturesPreviewLoader.clear()
         # set text to text edit
         self.ui.texturesMetaData_textEdit.setText(texture_metadata_info)
 
@@ -393,7 +977,7 @@ class TexturesManage(QtWidgets.QMainWindow):
         """
 
         # load texture
-        labs_texture_pixmap = QtGui.QPixmap('')
+        labs_texture_file_path = ''
         lab_texture_metadata_info = ''
 
         indexes = self.texturesLabsTreeView.selectedIndexes()
@@ -403,8 +987,10 @@ class TexturesManage(QtWidgets.QMainWindow):
             texture_lab_file_path = texture_lab_item['kwargs']['toolTip'].rpartition('/')
             texture_lab_path, texture_lab_file = texture_lab_file_path[0], texture_lab_file_path[-1]
 
-            if fileManage.check_file_exist(path=texture_lab_path, user_file=texture_lab_file):
-                labs_texture_pixmap = QtGui.QPixmap(texture_lab_item['kwargs']['toolTip'])
+            # folders items have the folder path as tool tip
+            if fileManage.check_file_exist(path=texture_lab_path, user_file=texture_lab_file) and \
+                    not os.path.isdir(texture_lab_item['kwargs']['toolTip']):
+                labs_texture_file_path = texture_lab_item['kwargs']['toolTip']
 
                 # get lab texture metadata for information display
                 lab_texture_metadata_dict = textureUtils.get_image_metadata(
@@ -413,11 +999,11 @@ class TexturesManage(QtWidgets.QMainWindow):
                 for key, value in lab_texture_metadata_dict.items():
                     lab_texture_metadata_info += ("{:20}: {}\r".format(key, value))
 
-        self.ui.texturesLabsPreview_label.setPixmap(
-            labs_texture_pixmap.scaled(
-                self.ui.texturesLabsPreview_label.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation
-            )
-        )
+        # set texture to labs preview label, thumbnail first, scaled texture when it is decoded.
+        if labs_texture_file_path:
+            self.texturesLabsPreviewLoader.load(texture_file_path=labs_texture_file_path)
+        else:
+            self.texturesLabsPreviewLoader.clear()
         # set text to text edit
         self.ui.texturesLabsMetaData_textEdit.setText(lab_texture_metadata_info)
 
@@ -440,36 +1026,88 @@ class TexturesManage(QtWidgets.QMainWindow):
             texture_lab_file_path = texture_lab_item['kwargs']['toolTip'].rpartition('/')
             texture_lab_path, texture_lab_file = texture_lab_file_path[0], texture_lab_file_path[-1]
 
-            # change texture in the scene
-            textureUtils.assign_file_texture(
-                file_node=current_file_node, texture_file_name=texture_lab_file, path=texture_lab_path
-            )
+            # folders items can't be assigned
+            if os.path.isdir(texture_lab_item['kwargs']['toolTip']):
+                return
 
             # new texture kwargs
-            path_kwargs = DATA_ITEMS['str'].copy()
+            path_kwargs = self.texturesTreeView.get_preset_kwargs(preset='texture', column=1)
             path_kwargs['default'] = texture_lab_file
-            path_kwargs['bg_color'] = [40, 40, 40]
-            path_kwargs['bg_alpha'] = 255
-            path_kwargs['text_color'] = [175, 175, 175]
-            path_kwargs['text_alpha'] = 255
-            path_kwargs['size'] = 9
-            path_kwargs['bold'] = False
-            path_kwargs['column_size'] = 250
-            path_kwargs['editable'] = False
-            path_kwargs['paint'] = False
             path_kwargs['toolTip'] = texture_lab_item['kwargs']['toolTip']
 
-            # change texture name in the tree view
-            self.texturesTreeView.edit_item(
-                item=current_texture_item['item'], item_kwargs=path_kwargs, unique_name=False
-            )
+            # the scene assignment and the tree view edit are undone / redone together
+            undo_stack = self.texturesTreeView.undo_stack
+            undo_stack.begin_macro(text='Reassign texture')
+            try:
+                # change texture in the scene and in the preview label
+                self.assign_texture(file_node=current_file_node, texture_file_path=path_kwargs['toolTip'])
+                undo_stack.push(
+                    command=undoStack.CallbackCommand(
+                        undo_callback=partial(
+                            self.assign_texture,
+                            file_node=current_file_node,
+                            texture_file_path=current_texture_item['kwargs']['toolTip']
+                        ),
+                        redo_callback=partial(
+                            self.assign_texture, file_node=current_file_node, texture_file_path=path_kwargs['toolTip']
+                        )
+                    )
+                )
 
-            # change texture display in the preview label
-            texture_pixmap = QtGui.QPixmap(texture_lab_item['kwargs']['toolTip'])
-            self.ui.texturesPreview_label.setPixmap(
-                texture_pixmap.scaled(
-                    self.ui.texturesPreview_label.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation
+                # change texture name in the tree view
+                self.texturesTreeView.edit_item(
+                    item=current_texture_item['item'], item_kwargs=path_kwargs, unique_name=False
                 )
+            finally:
+                undo_stack.end_macro()
+
+    def assign_texture(self, file_node, texture_file_path):
+        """Assign the texture file to the file node in the scene and show it in the preview label.
+
+        Args:
+            file_node (str): Texture file node.
+            texture_file_path (str): The texture file path.
+
+        """
+
+        texture_path, _, texture_file = texture_file_path.rpartition('/')
+        textureUtils.assign_file_texture(file_node=file_node, texture_file_name=texture_file, path=texture_path)
+        self.texturesPreviewLoader.load(texture_file_path=texture_file_path)
+
+    def compare_textures(self):
+        """Open the compare dialog between selected texture in texturesTreeView and selected texture in the labs.
+
+        """
+
+        if not self.textureCompareDialog:
+            self.textureCompareDialog = textureCompare.TextureCompareDialog(parent=self)
+
+        self.textureCompareDialog.show()
+        self.textureCompareDialog.raise_()
+        self.update_compare_textures()
+
+    def update_compare_textures(self):
+        """Update the compare dialog with the selected textures, if it is open.
+
+        """
+
+        if not self.textureCompareDialog or not self.textureCompareDialog.isVisible():
+            return
+
+        current_textures_indexes = self.texturesTreeView.selectedIndexes()
+        current_textures_labs_indexes = self.texturesLabsTreeView.selectedIndexes()
+
+        if current_textures_indexes and current_textures_labs_indexes:
+            current_texture_item = self.texturesTreeView.get_items()[0]['children'][0][1]
+            texture_lab_item = self.texturesLabsTreeView.get_items()[0]['children'][0][0]
+
+            # folders items can't be compared
+            if os.path.isdir(texture_lab_item['kwargs']['toolTip']):
+                return
+
+            self.textureCompareDialog.set_textures(
+                current_file_path=current_texture_item['kwargs']['toolTip'],
+                candidate_file_path=texture_lab_item['kwargs']['toolTip']
             )
 
     def select_geometry(self):
@@ -511,6 +1149,49 @@ class TexturesManage(QtWidgets.QMainWindow):
             if cmds.objExists(texture_item['kwargs']['default']):
                 cmds.select(texture_item['kwargs']['default'])
 
+    def inspect_texture(self, texture_file_path):
+        """Open the given texture in the zoomable texture inspector.
+
+        Args:
+            texture_file_path (str): The path of the image file.
+
+        """
+
+        if not self.textureInspectorDialog:
+            self.textureInspectorDialog = textureInspector.TextureInspectorDialog(parent=self)
+
+        self.textureInspectorDialog.set_texture(texture_file_path=texture_file_path)
+        self.textureInspectorDialog.show()
+        self.textureInspectorDialog.raise_()
+
+    def eventFilter(self, watched, event):
+        """Overwrite event filter, double click on preview labels to inspect the previewed texture.
+
+        """
+
+        if event.type() == QtCore.QEvent.MouseButtonDblClick:
+            if watched is self.ui.texturesPreview_label:
+                preview_loader = self.texturesPreviewLoader
+            elif watched is self.ui.texturesLabsPreview_label:
+                preview_loader = self.texturesLabsPreviewLoader
+            else:
+                preview_loader = None
+
+            if preview_loader and preview_loader.texture_file_path:
+                self.inspect_texture(texture_file_path=preview_loader.texture_file_path)
+                return True
+
+        return super(TexturesManage, self).eventFilter(watched, event)
+
+    def closeEvent(self, event):
+        """Overwrite close event, stop the background textures labs scan.
+
+        """
+
+        self.texturesLabsScanner.cancel()
+
+        super(TexturesManage, self).closeEvent(event)
+
     def focusOutEvent(self, event):
         """Overwrite focus out event.
 
@@ -530,9 +1211,22 @@ class TexturesManage(QtWidgets.QMainWindow):
         self.shadersTreeView.selectionModel().selectionChanged.connect(self.load_textures)
         self.texturesTreeView.selectionModel().selectionChanged.connect(self.load_texture_to_preview_and_metadata_box)
         self.ui.texturesLabsSetPath_pushButton.clicked.connect(self.set_textures_labs_path)
+        self.texturesLabsSearch_lineEdit.textChanged.connect(self.search_textures_labs_catalog)
+        self.texturesLabsSearch_comboBox.currentIndexChanged.connect(self.search_textures_labs_catalog)
+        self.texturesLabsSearch_completer.activated[QtCore.QModelIndex].connect(
+            self.reveal_textures_labs_search_result
+        )
+        self.texturesLabsScanner.changes_found.connect(self.apply_textures_labs_changes)
+        self.texturesLabsScanner.finished.connect(self.finish_textures_labs_scan)
+        self.texturesLabsWatcher.directoryChanged.connect(self.collect_textures_labs_changed_folder)
+        self.texturesLabsWatcher.fileChanged.connect(self.collect_textures_labs_changed_file)
+        self.texturesLabsWatch_timer.timeout.connect(self.rescan_textures_labs_changed_folders)
         self.texturesLabsTreeView.selectionModel().selectionChanged.connect(
             self.load_texture_to_labs_preview_and_metadata_box
         )
+        self.texturesTreeView.selectionModel().selectionChanged.connect(self.update_compare_textures)
+        self.texturesLabsTreeView.selectionModel().selectionChanged.connect(self.update_compare_textures)
+        self.ui.texturesLabsSpaceHolder_pushButton.clicked.connect(self.compare_textures)
         self.ui.texturesReassign_pushButton.clicked.connect(self.reassign_texture)
         self.ui.geometriesSelect_pushButton.clicked.connect(self.select_geometry)
         self.ui.shadersSelect_pushButton.clicked.connect(self.select_shader)
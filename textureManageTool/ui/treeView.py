@@ -1,9 +1,9 @@
-import ast, re, warnings
+import ast, collections, warnings
 
 from Qt import QtWidgets, QtCore, QtGui
-from utils import fileManage
+from utils import fileManage, nameSearch
 
-import widgetUtils
+import itemModel, undoStack, widgetUtils
 
 
 class TreeView(QtWidgets.QTreeView):
@@ -39,7 +39,7 @@ class TreeView(QtWidgets.QTreeView):
         # if treeview doesn't have any items, create new model.
         self.model = self.model()
         if not self.model:
-            self.model = QtGui.QStandardItemModel(0, 1)
+            self.model = itemModel.ItemModel(columns=1)
             self.setModel(self.model)
 
         # set different color each row
@@ -101,6 +101,47 @@ class TreeView(QtWidgets.QTreeView):
         delegate = ItemDelegate(parent=self)
         self.setItemDelegate(delegate)
 
+        # rows presets, preset name to (columns kwargs, columns model presets ids, columns tool tips positions)
+        self.row_presets = {}
+
+        # initial rows name index, built on the first use and kept up to date with the model changes after.
+        self.name_index = None
+        # entry id to first column item / model node / parent entry id, -1 for the top level rows,
+        # the removed entries ids are reused
+        self._index_items = []
+        self._index_nodes = []
+        self._index_parents = []
+        # parent entry id to children entries ids, first column item to entry id.
+        self._index_children = {}
+        self._item_ids = {}
+        # first column display names in use, to create unique names without searching the model
+        self.name_registry = None
+        self.model.rowsInserted.connect(self._index_inserted_rows)
+        self.model.rowsAboutToBeRemoved.connect(self._index_removed_rows)
+        self.model.nodes_about_to_be_taken.connect(self._index_taken_nodes)
+        self.model.nodes_inserted.connect(self._index_inserted_nodes)
+        self.model.nodes_moved.connect(self._index_moved_nodes)
+        self.model.dataChanged.connect(self._index_changed_rows)
+        self.model.nodes_changed.connect(self._index_changed_nodes)
+        self.model.modelReset.connect(self._reset_name_index)
+
+        # undo stack of the edits, the commands keep rows nodes and cells states of the model, dropped before reset,
+        # and once rows are removed outside of it, the removed rows nodes are reused by the next rows.
+        self.undo_stack = undoStack.UndoStack(parent=self)
+        self.model.modelAboutToBeReset.connect(self.undo_stack.clear)
+        self.model.nodes_removed.connect(self.undo_stack.clear)
+
+        # initial filter, entries ids of the matched, visible and hidden rows, the rows added since the last filter,
+        # and the rows expanded before the filter.
+        self.filter_text = ''
+        self.filter_mode = nameSearch.FILTER_MODES[0]
+        self._filter_matches = None
+        self._filter_visible = None
+        self._filter_hidden = set()
+        self._filter_added = set()
+        self._filter_expanded = None
+        self._filter_pending = False
+
     def refresh(self):
         """Refresh the treeview, keep headers
 
@@ -132,18 +173,13 @@ class TreeView(QtWidgets.QTreeView):
 
         # check if name exist, name can be '' empty string in the treeview.
         if name:
-            # initial base name
-            base_name = name
+            self._ensure_name_index()
             # strip possible suffix number to get base name
-            name_suffix_m = re.search(r'\d+$', name)
-            if name_suffix_m:
-                name_suffix = name_suffix_m.group()
-                base_name = name.rpartition(name_suffix)[0]
-
-            match_items = self.model.findItems(base_name, QtCore.Qt.MatchStartsWith | QtCore.Qt.MatchRecursive)
-            if match_items:
-                match_items_names = [str(match_item.data(role=QtCore.Qt.DisplayRole)) for match_item in match_items]
-                highest_num = fileManage.find_highest_trailing_number(names=match_items_names, base_name=base_name)
+            base_name, _ = fileManage.split_trailing_number(name=name)
+
+            # the base name or its numbered names are in use
+            if self.name_registry.has_base_name(base_name=base_name):
+                highest_num = self.name_registry.find_highest_trailing_number(base_name=base_name)
                 name = '{}{}'.format(base_name, highest_num+1)
 
         return name
@@ -185,7 +221,7 @@ class TreeView(QtWidgets.QTreeView):
         self.header().setStretchLastSection(False)
 
     def _create_item(self, item_kwargs, unique_name=True):
-        """Create QtGui.QStandardItem based on given item kwargs setting value
+        """Create itemModel.Item based on given item kwargs setting value
 
         Args:
             item_kwargs (dict): Item setting dictionary
@@ -206,7 +242,7 @@ class TreeView(QtWidgets.QTreeView):
             unique_name (bool): Make item name unique or not in the treeview.
 
         Returns:
-            QtGui.QStandardItem: QtGui.QStandardItem about to add on to the treeview.
+            itemModel.Item: Item about to add on to the treeview.
 
         """
 
@@ -216,66 +252,17 @@ class TreeView(QtWidgets.QTreeView):
                 if 'enum' not in item_kwargs and 'template' not in item_kwargs:
                     item_kwargs['default'] = self._unique_item_name(name=item_kwargs['default'])
 
-        # set name
-        item = QtGui.QStandardItem(str(item_kwargs['default']))
-
-        # item back ground color -----------------------------------------------------------
-        bg_q_color = QtGui.QColor(
-            item_kwargs['bg_color'][0],
-            item_kwargs['bg_color'][1],
-            item_kwargs['bg_color'][2],
-            item_kwargs['bg_alpha']
-        )
-
-        bg_q_brush = QtGui.QBrush()
-        bg_q_brush.setColor(bg_q_color)
-
-        item.setBackground(bg_q_brush)
-
-        # item text color -----------------------------------------------------------
-        text_q_color = QtGui.QColor(
-            item_kwargs['text_color'][0],
-            item_kwargs['text_color'][1],
-            item_kwargs['text_color'][2],
-            item_kwargs['text_alpha']
-        )
-
-        text_q_brush = QtGui.QBrush()
-        text_q_brush.setColor(text_q_color)
-
-        item.setForeground(text_q_brush)
-
-        # item text font -----------------------------------------------------------
-        q_font = QtGui.QFont()
-        q_font.setFamily('Segoe UI')
-        q_font.setPointSize(item_kwargs['size'])
-        q_font.setBold(item_kwargs['bold'])
-
-        item.setFont(q_font)
-
-        # item column width -----------------------------------------------------------
-        q_size = QtCore.QSize(item_kwargs['column_size'], 35)
-        item.setData(q_size, role=QtCore.Qt.SizeHintRole)
-
-        # item tooltip -----------------------------------------------------------
-        item.setToolTip(item_kwargs['toolTip'])
-
-        # item editable -----------------------------------------------------------
-        if item_kwargs['editable']:
-            item.setEditable(True)
-        else:
-            item.setEditable(False)
-
-        # item widget to pass to delegate -----------------------------------------------------------
-        item.setData(item_kwargs, role=QtCore.Qt.UserRole + 2)
+        # set name, the model answers the colors, font, size hint, tooltip and editable from the item kwargs preset
+        item = itemModel.Item(text=str(item_kwargs['default']), item_kwargs=item_kwargs)
 
         return item
 
+    @undoStack.undo_macro(text='Edit item')
     def edit_item(self, item, item_kwargs, unique_name=True):
-        """Edit QtGui.QStandardItem based on given item kwargs setting value
+        """Edit itemModel.Item based on given item kwargs setting value
 
         Args:
-            item (QtGui.QStandardItem): Item needs to be edited.
+            item (itemModel.Item): Item needs to be edited.
             item_kwargs (dict): Item setting dictionary
                               {
                               'default': column name,
@@ -300,64 +287,106 @@ class TreeView(QtWidgets.QTreeView):
                 if 'enum' not in item_kwargs and 'template' not in item_kwargs:
                     item_kwargs['default'] = self._unique_item_name(name=item_kwargs['default'])
 
-        # item back ground color -----------------------------------------------------------
-        bg_q_color = QtGui.QColor(
-            item_kwargs['bg_color'][0],
-            item_kwargs['bg_color'][1],
-            item_kwargs['bg_color'][2],
-            item_kwargs['bg_alpha']
+        state = self.model.get_cell_state(node=item.node(), column=item.column(), roles=(QtCore.Qt.SizeHintRole,))
+
+        # item widget to pass to delegate, the model answers the colors, font, tooltip and editable from it
+        item.setText(str(item_kwargs['default']))
+        item.setData(item_kwargs, role=QtCore.Qt.UserRole + 2)
+
+        # item column width -----------------------------------------------------------
+        q_size = QtCore.QSize(item_kwargs['column_size'], 25)
+        item.setData(q_size, role=QtCore.Qt.SizeHintRole)
+
+        self.undo_stack.push(
+            command=undoStack.EditCellsCommand(
+                model=self.model,
+                cells=[(
+                    item.node(),
+                    item.column(),
+                    state,
+                    self.model.get_cell_state(node=item.node(), column=item.column(), roles=(QtCore.Qt.SizeHintRole,))
+                )]
+            )
         )
 
-        bg_q_brush = QtGui.QBrush()
-        bg_q_brush.setColor(bg_q_color)
+        # item expand -----------------------------------------------------------
+        if item_kwargs['expand']:
+            self.expand(item.index())
+        else:
+            self.collapse(item.index())
+
+    def add_row_preset(self, preset, columns_kwargs, tool_tip_columns=()):
+        """Declare the columns kwargs of a row preset once, rows of the preset are added by values tuples,
+           no kwargs dictionary is created or stored per cell.
+
+        Args:
+            preset (str): The preset name.
+            columns_kwargs (list): The list of columns kwargs dictionaries, see add_items,
+                                   'default' and 'toolTip' are given per row instead.
+            tool_tip_columns (tuple): The columns whose tool tips are given per row, after the columns values,
+                                      the other columns have the 'toolTip' of their kwargs.
+
+        """
 
-        item.setBackground(bg_q_brush)
+        columns_kwargs = [column_kwargs.copy() for column_kwargs in columns_kwargs]
+        tool_tips_positions = [None] * len(columns_kwargs)
+        for i, column in enumerate(tool_tip_columns):
+            tool_tips_positions[column] = len(columns_kwargs) + i
 
-        # item text color -----------------------------------------------------------
-        text_q_color = QtGui.QColor(
-            item_kwargs['text_color'][0],
-            item_kwargs['text_color'][1],
-            item_kwargs['text_color'][2],
-            item_kwargs['text_alpha']
+        self.row_presets[preset] = (
+            columns_kwargs,
+            [self.model.get_preset(item_kwargs=column_kwargs) for column_kwargs in columns_kwargs],
+            tool_tips_positions
         )
 
-        text_q_brush = QtGui.QBrush()
-        text_q_brush.setColor(text_q_color)
+    def get_preset_kwargs(self, preset, column=0):
+        """Return a copy of the column kwargs of the row preset, example: to edit an item of the preset.
+
+        Args:
+            preset (str): The preset name.
+            column (int): The column number.
+
+        Returns:
+            dict: The column kwargs.
 
-        item.setForeground(text_q_brush)
+        """
 
-        # item text font -----------------------------------------------------------
-        q_font = QtGui.QFont()
-        q_font.setFamily('Segoe UI')
-        q_font.setPointSize(item_kwargs['size'])
-        q_font.setBold(item_kwargs['bold'])
+        return self.row_presets[preset][0][column].copy()
 
-        item.setFont(q_font)
+    def _create_preset_items(self, row_values, preset, unique_name=True):
+        """Create the columns items of a row of the row preset.
 
-        # item column width -----------------------------------------------------------
-        q_size = QtCore.QSize(item_kwargs['column_size'], 25)
-        item.setData(q_size, role=QtCore.Qt.SizeHintRole)
+        Args:
+            row_values (tuple): The columns values, followed by the tool tips of the preset tool tip columns.
+            preset (str): The preset name.
+            unique_name (bool): Make item name unique or not in the treeview.
 
-        # item tooltip -----------------------------------------------------------
-        item.setToolTip(item_kwargs['toolTip'])
+        Returns:
+            list: The columns items.
 
-        # item editable -----------------------------------------------------------
-        if item_kwargs['editable']:
-            item.setEditable(True)
-        else:
-            item.setEditable(False)
+        """
 
-        # item expand -----------------------------------------------------------
-        if item_kwargs['expand']:
-            self.expand(item.index())
-        else:
-            self.collapse(item.index())
+        columns_kwargs, columns_presets, tool_tips_positions = self.row_presets[preset]
 
-        # item widget to pass to delegate -----------------------------------------------------------
-        item.setText(str(item_kwargs['default']))
-        item.setData(item_kwargs, role=QtCore.Qt.UserRole + 2)
+        columns_items = []
+        for column, column_kwargs in enumerate(columns_kwargs):
+            value = row_values[column]
+            # only make string unique, but not in enum, list, dict type delegated widget.
+            if unique_name and isinstance(value, str) and 'enum' not in column_kwargs and 'template' not in column_kwargs:
+                value = self._unique_item_name(name=value)
+
+            position = tool_tips_positions[column]
+            columns_items.append(
+                itemModel.Item.from_preset(
+                    preset=columns_presets[column],
+                    default=value,
+                    tool_tip=row_values[position] if position is not None else column_kwargs.get('toolTip')
+                )
+            )
 
-    def add_items(self, items_kwargs, unique_name=True, parent_item=None):
+        return columns_items
+
+    def add_items(self, items_kwargs=None, unique_name=True, parent_item=None, items_values=None, preset=None):
         """Add items to treeview in order.
 
         Args:
@@ -378,7 +407,10 @@ class TreeView(QtWidgets.QTreeView):
                               },
                               ],]
             unique_name (bool): Make item name unique or not in the treeview.
-            parent_item (QtGui.QStandardItem/None): Parent item which items are added to.
+            parent_item (itemModel.Item/None): Parent item which items are added to.
+            items_values (list/None): The list of rows values tuples of the row preset, instead of items_kwargs
+                                      [(columns values, tool tips of the preset tool tip columns),]
+            preset (str/None): The row preset name of items_values, see add_row_preset.
 
         Returns:
             list: The list of rows with list of columns items on each row [[columns items],]
@@ -389,35 +421,99 @@ class TreeView(QtWidgets.QTreeView):
 
         # if parent item exist.
         if parent_item:
-            if isinstance(parent_item, QtGui.QStandardItem):
+            if isinstance(parent_item, itemModel.Item):
                 model = parent_item
 
+        columns_kwargs = self.row_presets[preset][0] if preset is not None else items_kwargs[0]
+
         # match the columns count with the columns count of items.
-        model.setColumnCount(len(items_kwargs[0]))
+        model.setColumnCount(len(columns_kwargs))
         # initial columns sizes.
-        for i in range(len(items_kwargs[0])):
-            self.setColumnWidth(i, items_kwargs[0][i]['column_size'])
+        for i in range(len(columns_kwargs)):
+            self.setColumnWidth(i, columns_kwargs[i]['column_size'])
 
         # initial return items list
         items = []
+        # first column names of the rows not inserted yet, in use so the names of the added rows are unique too
+        pending_names = []
         # setting
-        for row_items_kwargs in items_kwargs:
-            # initial columns items list
-            columns_items = []
-            for column_item_kwargs in row_items_kwargs:
-                # set column item
-                column_item = self._create_item(item_kwargs=column_item_kwargs, unique_name=unique_name)
+        for row in (items_values if preset is not None else items_kwargs):
+            if preset is not None:
+                columns_items = self._create_preset_items(row_values=row, preset=preset, unique_name=unique_name)
+            else:
+                # initial columns items list
+                columns_items = []
+                for column_item_kwargs in row:
+                    # set column item
+                    column_item = self._create_item(item_kwargs=column_item_kwargs, unique_name=unique_name)
 
-                # append to columns items list
-                columns_items.append(column_item)
+                    # append to columns items list
+                    columns_items.append(column_item)
 
             items.append(columns_items)
 
-            # append row to parent
-            model.appendRow(columns_items)
+            if unique_name and self.name_registry is not None:
+                pending_names.append(columns_items[0].text())
+                self.name_registry.add(pending_names[-1])
+
+        # the names are registered again by the name index once the rows are inserted
+        for name in pending_names:
+            self.name_registry.remove(name)
+
+        # append rows to parent
+        self._append_rows(parent_item=model if model is not self.model else None, rows_items=items)
 
         return items
 
+    def _append_rows(self, parent_item, rows_items):
+        """Append all the rows under the parent item at once, the view is not updated, sorted or resized to
+           contents until all the rows are inserted.
+
+        Args:
+            parent_item (itemModel.Item/None): The parent item, None for the top level rows.
+            rows_items (list): The list of rows with list of columns items on each row [[columns items],]
+
+        """
+
+        header = self.header()
+        contents_sections = [
+            section for section in range(header.count())
+            if header.sectionResizeMode(section) == QtWidgets.QHeaderView.ResizeToContents
+        ]
+        sorting = self.isSortingEnabled()
+
+        self.setUpdatesEnabled(False)
+        self.setSortingEnabled(False)
+        for section in contents_sections:
+            header.setSectionResizeMode(section, QtWidgets.QHeaderView.Interactive)
+
+        try:
+            self.model.append_rows(
+                parent_node=parent_item.node() if parent_item else itemModel.ROOT_NODE, rows_items=rows_items
+            )
+        finally:
+            # resize the columns to contents and sort once
+            for section in contents_sections:
+                header.setSectionResizeMode(section, QtWidgets.QHeaderView.ResizeToContents)
+            self.setSortingEnabled(sorting)
+            self.setUpdatesEnabled(True)
+
+    def set_children_callback(self, item, callback):
+        """Set the callback adding the children of the item, only called once the item is expanded,
+           so the children are not added up front. The item shows as expandable until then.
+
+        Args:
+            item (itemModel.Item/None): The first column item, None for the top level rows.
+            callback (function/None): Takes the item, adds its children, example: with self.add_items(parent_item=item),
+                                      returns True if there are more children to add, they are added in batches
+                                      when the item is scrolled to its end, False if all the children are added.
+                                      None to remove the callback.
+
+        """
+
+        self.model.set_fetch_callback(node=item.node() if item else itemModel.ROOT_NODE, callback=callback)
+
+    @undoStack.undo_macro(text='Remove items')
     def remove_items(self):
         """Remove selected / all items from treeview.
 
@@ -425,23 +521,20 @@ class TreeView(QtWidgets.QTreeView):
             list/None: The list of removed hierarchies dictionaries with
                       [{
                       key ('parent'):
-                      value ({'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': parent_kwargs}),
+                      value ({'item': itemModel.Item, 'position': (row, column), 'kwargs': parent_kwargs}),
                       key ('children'):
-                      value ([[{'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': child_kwargs}, ]])
+                      value ([[{'item': itemModel.Item, 'position': (row, column), 'kwargs': child_kwargs}, ]])
                             The list of rows with list of columns information dictionaries on each row.
                       },]
                       None, remove all.
 
         """
 
-        # query current selected indexes
-        indexes = self.selectedIndexes()
+        # query current selected items
+        items = self.get_items(selected_only=True)
 
         # if selected, query selected
-        if indexes:
-            # query current selected items
-            items = self.get_items()
-
+        if items:
             # hierarchy level
             for hierarchy in items:
                 parent_item = hierarchy['parent']['item']
@@ -450,14 +543,9 @@ class TreeView(QtWidgets.QTreeView):
                 # delete a row will delete all the columns in this row, so only need to access first child column.
                 # hierarchy_dict['children'][row index][column index]['position'][0] is row num.
                 rows_nums = [row[0]['position'][0] for row in hierarchy['children']]
-                # avoiding parent's rows index changes, delete from back -> forward.
-                rows_nums.sort(reverse=True)
 
-                for row_num in rows_nums:
-                    try:
-                        parent_item.removeRow(row_num)
-                    except (RuntimeError, Exception):
-                        pass
+                # contiguous rows are deleted together, the rows under already deleted rows are skipped.
+                self._take_rows(parent_item=parent_item, rows=rows_nums)
 
             return items
 
@@ -467,6 +555,7 @@ class TreeView(QtWidgets.QTreeView):
 
             return None
 
+    @undoStack.undo_macro(text='Duplicate items')
     def duplicate_items(self, leaves=True):
         """Duplicate selected / all items from treeview.
 
@@ -477,22 +566,19 @@ class TreeView(QtWidgets.QTreeView):
             list/None: The list of duplicated hierarchies dictionaries with
                       [{
                       key ('parent'):
-                      value ({'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': parent_kwargs}),
+                      value ({'item': itemModel.Item, 'position': (row, column), 'kwargs': parent_kwargs}),
                       key ('children'):
-                      value ([[{'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': child_kwargs}, ]])
+                      value ([[{'item': itemModel.Item, 'position': (row, column), 'kwargs': child_kwargs}, ]])
                             The list of rows with list of columns information dictionaries on each row.
                       },]
 
         """
 
-        # query current selected indexes
-        indexes = self.selectedIndexes()
+        # query current selected items
+        items = self.get_items(selected_only=True)
 
         # if selected, query selected
-        if indexes:
-            # query current selected items
-            items = self.get_items()
-
+        if items:
             # initial duplicated items
             duplicated_items = []
 
@@ -507,29 +593,45 @@ class TreeView(QtWidgets.QTreeView):
                     'children': []
                 }
 
-                # rows level
-                for row in hierarchy['children']:
-                    # row num increase while adding duplicated new row of children
-                    row_num = parent_item.rowCount()
-                    duplicated_children_columns_items = []
-                    # columns level
-                    for column in row:
-                        column_item = column['item']
-                        column_kwargs = column['kwargs']
+                # rows level, the rows and their leaves are cloned outside the model with their unique names,
+                # then added under the parent at once.
+                rows_nodes = [row[0]['item'].node() for row in hierarchy['children']]
+                names, pending_names = self._get_duplicate_names(rows_nodes=rows_nodes, leaves=leaves)
 
-                        # create duplicated new column item
-                        new_column_item = self._create_item(item_kwargs=column_kwargs, unique_name=True)
-                        parent_item.setChild(row_num, column['position'][1], new_column_item)
+                # the names are registered again by the name index once the rows are inserted
+                for name in pending_names:
+                    self.name_registry.remove(name)
 
-                        # if leaves, duplicate column item itself, with duplicate its leaves.
-                        if leaves and column_item.hasChildren():
-                            self._iter_duplicate_items(start=(column_item, new_column_item))
+                duplicated_nodes = self.model.clone_rows(nodes=rows_nodes, leaves=leaves, defaults=names)
+                self._append_rows(
+                    parent_item=parent_item,
+                    rows_items=[
+                        [itemModel.Item.from_cell(model=self.model, node=node, column=0)] for node in duplicated_nodes
+                    ]
+                )
+                self.undo_stack.push(
+                    command=undoStack.InsertRowsCommand(
+                        model=self.model,
+                        parent_node=parent_item.node(),
+                        row=self.model.get_node_row(node=duplicated_nodes[0]),
+                        nodes=duplicated_nodes
+                    )
+                )
+
+                for node in duplicated_nodes:
+                    row_num = self.model.get_node_row(node=node)
+                    # columns level
+                    duplicated_children_columns_items = []
+                    for column in range(parent_item.columnCount()):
+                        new_column_item = parent_item.child(row_num, column)
+                        if new_column_item is None:
+                            continue
 
                         duplicated_children_columns_items.append(
                             {
                                 'item': new_column_item,
-                                'position': (new_column_item.row(), new_column_item.column()),
-                                'kwargs': column_kwargs
+                                'position': (row_num, column),
+                                'kwargs': new_column_item.data(role=QtCore.Qt.UserRole + 2)
                             }
                         )
 
@@ -545,36 +647,61 @@ class TreeView(QtWidgets.QTreeView):
 
             return None
 
-    def _iter_duplicate_items(self, start):
-        """Iteration starts from start column item to downstream, duplicate all the leaves below it.
+    def _get_duplicate_names(self, rows_nodes, leaves):
+        """Plan the unique names of the duplicated cells in one pass, in the order the cells are duplicated:
+           each row's first column, its leaves breadth first, then its other columns.
+           The first column names are registered as pending in the name registry, so the next names don't reuse them.
 
         Args:
-            start (tuple): (QtGui.QStandardItem, QtGui.QStandardItem),
-                           The 1st QtGui.QStandardItem is the start column item,
-                           The 2nd QtGui.QStandardItem is the new duplicated start column item.
-
-        """
+            rows_nodes (list): The rows nodes to duplicate.
+            leaves (bool): Plan the names of the rows' leaves too.
 
-        # start iterating -----------------------------------------------------------
-        # start=(column_item, new_column_item)
-        stack = [start]
-
-        while stack:
-            start_item, new_start_item = stack.pop(0)
-
-            for i in range(start_item.rowCount()):
-                # row num increase while adding duplicated new row of children
-                row = new_start_item.rowCount()
-                for j in range(start_item.columnCount()):
-                    child_item = start_item.child(i, j)
-                    child_kwargs = child_item.data(role=QtCore.Qt.UserRole + 2)
+        Returns:
+            tuple: ({(row node, column): unique name}, only the renamed cells,
+                    [the registered first column names, unregister them before the rows are inserted])
 
-                    # create duplicated new child item
-                    new_child_item = self._create_item(item_kwargs=child_kwargs, unique_name=True)
-                    new_start_item.setChild(row, j, new_child_item)
+        """
 
-                    if child_item.hasChildren():
-                        stack.append((child_item, new_child_item))
+        self._ensure_name_index()
+        model = self.model
+        columns = range(model.columnCount())
+        # preset id to whether its cells names are made unique, not enum, list, dict type delegated widget
+        unique_presets = {}
+        names = {}
+        pending_names = []
+
+        def plan_cells(node, cells_columns):
+            for column in cells_columns:
+                preset = model.get_cell_preset(node=node, column=column)
+                if preset < 0:
+                    continue
+
+                if preset not in unique_presets:
+                    preset_kwargs = model.get_preset_kwargs(preset=preset)
+                    unique_presets[preset] = preset_kwargs is not None and \
+                        'enum' not in preset_kwargs and 'template' not in preset_kwargs
+
+                default = model.get_cell_default(node=node, column=column)
+                if unique_presets[preset] and isinstance(default, str):
+                    name = self._unique_item_name(name=default)
+                    names[(node, column)] = name
+                    if not column:
+                        pending_names.append(name)
+                        self.name_registry.add(name)
+
+        for node in rows_nodes:
+            plan_cells(node=node, cells_columns=columns[:1])
+
+            queue = collections.deque([node] if leaves else [])
+            while queue:
+                for child_node in model.get_children_nodes(node=queue.popleft()):
+                    plan_cells(node=child_node, cells_columns=columns)
+                    if model.get_children_nodes(node=child_node):
+                        queue.append(child_node)
+
+            plan_cells(node=node, cells_columns=columns[1:])
+
+        return names, pending_names
 
     def get_item(self, name):
         """Given a display name to find corresponding item in the treeview.
@@ -583,22 +710,24 @@ class TreeView(QtWidgets.QTreeView):
             name (str/int/float/bool): The given display name.
 
         Returns:
-            dict/None: {'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': item_kwargs}
+            dict/None: {'item': itemModel.Item, 'position': (row, column), 'kwargs': item_kwargs}
                        if exist, None if not.
 
         """
 
-        item = self.model.findItems(str(name), QtCore.Qt.MatchExactly | QtCore.Qt.MatchRecursive)
-        if item:
-            item_kwargs = item[0].data(role=QtCore.Qt.UserRole + 2)
+        self._ensure_name_index()
+        entries_ids = self.name_index.find(str(name))
+        if entries_ids:
+            item = self._index_items[entries_ids[0]]
+            item_kwargs = item.data(role=QtCore.Qt.UserRole + 2)
 
-            return {'item': item[0], 'position': (item[0].row(), item[0].column()), 'kwargs': item_kwargs}
+            return {'item': item, 'position': (item.row(), item.column()), 'kwargs': item_kwargs}
 
     def get_current_item(self):
         """Get current selected item.
 
         Returns:
-            dict/None: {'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': item_kwargs}
+            dict/None: {'item': itemModel.Item, 'position': (row, column), 'kwargs': item_kwargs}
                        if exist, None if not.
 
         """
@@ -619,19 +748,17 @@ class TreeView(QtWidgets.QTreeView):
 
         """
 
+        self._ensure_name_index()
+
         rows_indexes = []
+        column_num = self.model.columnCount() - 1
         for name in names:
-            item = self.model.findItems(str(name), QtCore.Qt.MatchExactly | QtCore.Qt.MatchRecursive)
+            item = [self._index_items[entry_id] for entry_id in self.name_index.find(str(name))]
             if item:
-                model = self.model
-                # if parent item exist.
-                parent_item = item[0].parent()
-                if parent_item:
-                    if isinstance(parent_item, QtGui.QStandardItem):
-                        model = parent_item
-
-                column_num = model.columnCount() - 1
-                rows_indexes.append((model.index(item[0].row(), 0), model.index(item[0].row(), column_num)))
+                # the index row is the row the view sees, invalid if the row is filtered out
+                index = item[0].index()
+                if index.isValid():
+                    rows_indexes.append((index, index.sibling(index.row(), column_num)))
 
         flags = QtCore.QItemSelectionModel.Select
         selection = QtCore.QItemSelection()
@@ -644,16 +771,532 @@ class TreeView(QtWidgets.QTreeView):
         self.selectionModel().clear()
         self.selectionModel().select(selection, flags)
 
-    def get_items(self):
+    def _ensure_name_index(self):
+        """Build the rows name index of the whole model if it is not built yet.
+
+        """
+
+        if self.name_index is not None:
+            return
+
+        self.name_index = nameSearch.NameIndex()
+        self._index_items = []
+        self._index_nodes = []
+        self._index_parents = []
+        self._index_children = {}
+        self._item_ids = {}
+        self.name_registry = fileManage.UniqueNameRegistry()
+
+        root_item = self.model.invisibleRootItem()
+        self._index_rows(parent_item=root_item, rows=range(root_item.rowCount()), parent_id=-1)
+
+    def _index_rows(self, parent_item, rows, parent_id):
+        """Add the rows and all their descendants rows into the name index.
+           Key is the first column display name, searchable name is the '\n' joined display names of all the columns.
+
+        Args:
+            parent_item (itemModel.Item): The parent item, the invisible root item for the top level rows.
+            rows (iterable): The rows numbers under the parent item.
+            parent_id (int): The parent entry id, -1 for the top level rows.
+
+        """
+
+        name_index = self.name_index
+        name_registry = self.name_registry
+        index_items = self._index_items
+        index_nodes = self._index_nodes
+        index_parents = self._index_parents
+        item_ids = self._item_ids
+        filter_added = self._filter_added if self.filter_text else None
+        model = self.model
+
+        # the texts are read from the model, only the first column items are created
+        stack = [(parent_item.node(), rows, parent_id)]
+        while stack:
+            parent_node, rows, parent_id = stack.pop()
+            children_ids = self._index_children.setdefault(parent_id, set())
+
+            for node, texts in model.get_rows_texts(node=parent_node, rows=rows):
+                key = texts[0]
+                if key is None:
+                    continue
+
+                name = '\n'.join(text for text in texts if text is not None)
+                item = itemModel.Item.from_cell(model=model, node=node, column=0)
+
+                entry_id = name_index.add(key=key, name=name)
+                name_registry.add(key)
+                if entry_id < len(index_items):
+                    index_items[entry_id] = item
+                    index_nodes[entry_id] = node
+                    index_parents[entry_id] = parent_id
+                else:
+                    index_items.append(item)
+                    index_nodes.append(node)
+                    index_parents.append(parent_id)
+                children_ids.add(entry_id)
+                item_ids[item] = entry_id
+                if filter_added is not None:
+                    filter_added.add(entry_id)
+
+                children_nodes = model.get_children_nodes(node=node)
+                if children_nodes:
+                    stack.append((node, range(len(children_nodes)), entry_id))
+
+    def _parent_item_from_index(self, parent_index):
+        """Return the parent item of the model signal rows, the invisible root item for the top level rows.
+
+        """
+
+        if parent_index.isValid():
+            return self.model.itemFromIndex(parent_index)
+
+        return self.model.invisibleRootItem()
+
+    def _index_inserted_rows(self, parent_index, first, last):
+        """Add the inserted rows into the name index, filter them if there is a filter text.
+
+        """
+
+        if self.name_index is None:
+            return
+
+        parent_item = self._parent_item_from_index(parent_index=parent_index)
+        self._index_rows(
+            parent_item=parent_item, rows=range(first, last + 1), parent_id=self._item_ids.get(parent_item, -1)
+        )
+
+        self._schedule_refilter()
+
+    def _index_inserted_nodes(self, nodes, parent_node):
+        """Add the rows inserted back together into the name index, filter them if there is a filter text.
+
+        """
+
+        if self.name_index is None:
+            return
+
+        parent_item = itemModel.Item.from_cell(model=self.model, node=parent_node, column=0)
+        self._index_rows(
+            parent_item=parent_item,
+            rows=sorted(self.model.get_node_row(node=node) for node in nodes),
+            parent_id=self._item_ids.get(parent_item, -1)
+        )
+
+        self._schedule_refilter()
+
+    def _index_removed_rows(self, parent_index, first, last):
+        """Remove the rows about to be removed and all their descendants rows from the name index.
+
+        """
+
+        if self.name_index is None:
+            return
+
+        parent_item = self._parent_item_from_index(parent_index=parent_index)
+        self._unindex_items(items=[parent_item.child(row, 0) for row in range(first, last + 1)])
+
+    def _index_taken_nodes(self, nodes):
+        """Remove the rows about to be taken out together and all their descendants rows from the name index.
+
+        """
+
+        if self.name_index is None:
+            return
+
+        self._unindex_items(items=[itemModel.Item.from_cell(model=self.model, node=node, column=0) for node in nodes])
+
+    def _unindex_items(self, items):
+        """Remove the rows of the first column items and all their descendants rows from the name index.
+
+        Args:
+            items (list): The first column items of the rows, None items are skipped.
+
+        """
+
+        stack = list(items)
+        while stack:
+            item = stack.pop()
+            if item is None:
+                continue
+
+            entry_id = self._item_ids.pop(item, None)
+            if entry_id is None:
+                continue
+
+            self.name_registry.remove(self.name_index.keys[entry_id])
+            self.name_index.remove(entry_id=entry_id)
+            self._index_items[entry_id] = None
+            self._index_nodes[entry_id] = None
+            # the children ids of a removed parent are already dropped
+            parent_children_ids = self._index_children.get(self._index_parents[entry_id])
+            if parent_children_ids is not None:
+                parent_children_ids.discard(entry_id)
+            self._index_children.pop(entry_id, None)
+            for entries_ids in [self._filter_hidden, self._filter_added]:
+                entries_ids.discard(entry_id)
+            if self._filter_visible is not None:
+                self._filter_matches.discard(entry_id)
+                self._filter_visible.discard(entry_id)
+                # the parent may have no visible rows left, the children of a removed parent are removed after it
+                parent_id = self._index_parents[entry_id]
+                if parent_id != -1 and self._index_items[parent_id] is not None:
+                    self._filter_added.add(parent_id)
+
+            stack.extend(item.child(row, 0) for row in range(item.rowCount()))
+
+    def _index_moved_nodes(self, nodes, destination_node):
+        """Move the moved rows under the destination parent in the name index, their descendants rows are kept,
+           filter them again if there is a filter text.
+
+        """
+
+        if self.name_index is None:
+            return
+
+        destination_id = self._item_ids.get(
+            itemModel.Item.from_cell(model=self.model, node=destination_node, column=0), -1
+        )
+        destination_children_ids = self._index_children.setdefault(destination_id, set())
+        for node in nodes:
+            entry_id = self._item_ids.get(itemModel.Item.from_cell(model=self.model, node=node, column=0))
+            if entry_id is None:
+                continue
+
+            parent_children_ids = self._index_children.get(self._index_parents[entry_id])
+            if parent_children_ids is not None:
+                parent_children_ids.discard(entry_id)
+            if self.filter_text:
+                # the previous parent may have no visible rows left
+                if self._index_parents[entry_id] != -1:
+                    self._filter_added.add(self._index_parents[entry_id])
+                self._filter_added.add(entry_id)
+            self._index_parents[entry_id] = destination_id
+            destination_children_ids.add(entry_id)
+
+        self._schedule_refilter()
+
+    def _index_changed_rows(self, top_left, bottom_right, *args):
+        """Rename the changed rows in the name index, the rows of the signal are the rows the view sees.
+
+        """
+
+        if self.name_index is None:
+            return
+
+        parent_index = top_left.parent()
+        self._index_changed_nodes(
+            nodes=[
+                self.model.index(row, 0, parent_index).internalId()
+                for row in range(top_left.row(), bottom_right.row() + 1)
+            ]
+        )
+
+    def _index_changed_nodes(self, nodes):
+        """Rename the changed rows in the name index, filter them if there is a filter text.
+           Items set into existing rows, example: the duplicated items, are added into the name index.
+
+        Args:
+            nodes (list): The changed rows nodes.
+
+        """
+
+        if self.name_index is None:
+            return
+
+        for node in nodes:
+            if node <= itemModel.ROOT_NODE or self.model.get_cell_preset(node=node, column=0) < 0:
+                continue
+
+            item = itemModel.Item.from_cell(model=self.model, node=node, column=0)
+            parent_item = item.parent() or self.model.invisibleRootItem()
+            row = item.row()
+            entry_id = self._item_ids.get(item)
+            if entry_id is None:
+                self._index_rows(
+                    parent_item=parent_item, rows=[row], parent_id=self._item_ids.get(parent_item, -1)
+                )
+            else:
+                if self.name_index.keys[entry_id] != item.text():
+                    self.name_registry.remove(self.name_index.keys[entry_id])
+                    self.name_registry.add(item.text())
+                self.name_index.rename(
+                    entry_id=entry_id,
+                    key=item.text(),
+                    name='\n'.join(
+                        parent_item.child(row, column).text()
+                        for column in range(parent_item.columnCount()) if parent_item.child(row, column)
+                    )
+                )
+                if self.filter_text:
+                    self._filter_added.add(entry_id)
+
+        self._schedule_refilter()
+
+    def _reset_name_index(self):
+        """Drop the name index and the filter state after the model is reset.
+
+        """
+
+        self.name_index = None
+        self._index_items = []
+        self._index_nodes = []
+        self._index_parents = []
+        self._index_children = {}
+        self._item_ids = {}
+        self.name_registry = None
+        self._filter_matches = None
+        self._filter_visible = None
+        self._filter_hidden = set()
+        self._filter_added = set()
+        self._filter_expanded = None
+
+        self._schedule_refilter()
+
+    def filter_items(self, text, mode=None):
+        """Hide the rows not matching the filter text, rows with matching descendants stay visible and expanded.
+           Only the rows changing visibility under visible parents are hidden / shown, by the model with one layout
+           change, the view lays out only the visible rows.
+           A narrowing text only matches the previous matches and the rows added / changed after,
+           the same text only matches the rows added / changed after and updates their parents.
+
+        Args:
+            text (str): The filter text matched against all the columns display names, '' to show all the rows.
+            mode (str/None): One of nameSearch.FILTER_MODES, None to keep the current mode.
+
+        """
+
+        text = text.strip().lower()
+        mode = mode or self.filter_mode
+
+        self._ensure_name_index()
+        parents = self._index_parents
+        children = self._index_children
+        hidden = self._filter_hidden
+        added = self._filter_added
+
+        if not text:
+            self._show_filtered_rows()
+            self.filter_text = text
+            self.filter_mode = mode
+            return
+
+        if self._filter_expanded is None:
+            self._filter_expanded = set(
+                entry_id for entry_id, children_ids in children.items()
+                if entry_id != -1 and children_ids and self.isExpanded(self._index_items[entry_id].index())
+            )
+
+        if self._filter_matches is not None and text == self.filter_text and mode == self.filter_mode:
+            # the same filter after model changes, only the changed rows and their parents are updated
+            matches = self._filter_matches - added
+            matches.update(self._match_entries(text=text, mode=mode, candidates=added))
+            visible = self._filter_visible
+            entering = set()
+            leaving = set()
+            stack = list(added)
+            while stack:
+                entry_id = stack.pop()
+                if entry_id == -1 or self._index_items[entry_id] is None:
+                    continue
+
+                is_visible = entry_id in matches or any(child_id in visible for child_id in children.get(entry_id, ()))
+                if is_visible == (entry_id in visible):
+                    continue
+
+                if is_visible:
+                    visible.add(entry_id)
+                    leaving.discard(entry_id)
+                    entering.add(entry_id)
+                else:
+                    visible.discard(entry_id)
+                    entering.discard(entry_id)
+                    leaving.add(entry_id)
+                stack.append(parents[entry_id])
+        else:
+            candidates = None
+            if self._filter_matches is not None and mode == self.filter_mode and \
+                    nameSearch.is_narrowing(previous_query=self.filter_text, query=text, mode=mode):
+                candidates = self._filter_matches | added
+            matches = set(self._match_entries(text=text, mode=mode, candidates=candidates))
+
+            # matched rows and all their parents, walked up one level at a time with set operations
+            visible = set(matches)
+            level = visible
+            while level:
+                level = set(map(parents.__getitem__, level))
+                level.discard(-1)
+                level.difference_update(visible)
+                visible.update(level)
+
+            if self._filter_visible is None:
+                leaving = ()
+                entering = visible
+            else:
+                leaving = self._filter_visible - visible
+                entering = visible - self._filter_visible
+
+        # rows leaving the visible rows, rows under parents becoming visible, and the rows added,
+        # rows under hidden parents are never seen, they are left as they are.
+        entering_parents = entering.intersection(children)
+        if self._filter_visible is None and -1 in children:
+            entering_parents.add(-1)
+        to_show = hidden & entering
+        to_hide = set(
+            entry_id for entry_id in added
+            if entry_id not in visible and (parents[entry_id] == -1 or parents[entry_id] in visible)
+        )
+        for parent_id in set(map(parents.__getitem__, leaving)):
+            if parent_id == -1 or parent_id in visible:
+                to_hide.update(children[parent_id].intersection(leaving))
+        for parent_id in entering_parents:
+            to_hide.update(children[parent_id].difference(visible))
+        to_hide -= hidden
+
+        index_nodes = self._index_nodes
+        self.model.set_hidden_nodes(
+            hide_nodes=map(index_nodes.__getitem__, to_hide), show_nodes=map(index_nodes.__getitem__, to_show)
+        )
+
+        # expand the parents of the matches, laid out once with the hidden rows instead of on each expanded row
+        expanding_ids = entering - matches
+        if expanding_ids:
+            self.scheduleDelayedItemsLayout()
+        for entry_id in expanding_ids:
+            index = self._index_items[entry_id].index()
+            if not self.isExpanded(index):
+                self.expand(index)
+
+        self.filter_text = text
+        self.filter_mode = mode
+        self._filter_matches = matches
+        self._filter_visible = visible
+        self._filter_hidden = (hidden - to_show) | to_hide
+        self._filter_added = set()
+
+    def _match_entries(self, text, mode, candidates=None):
+        """Return the name index entries matching the filter text.
+
+        Args:
+            text (str): The lower case filter text.
+            mode (str): One of nameSearch.FILTER_MODES.
+            candidates (set/None): Only match these entries ids, None for all the entries.
+
+        Returns:
+            list: The matched entries ids.
+
+        """
+
+        names = self.name_index.names
+        if mode == 'Substring' or (mode == 'Glob' and not any(c in text for c in nameSearch.GLOB_CHARACTERS)):
+            return self.name_index.search_substring(query=text, candidates=candidates)
+
+        matcher = nameSearch.create_matcher(query=text, mode=mode)
+        return [
+            entry_id for entry_id in (range(len(names)) if candidates is None else candidates)
+            if names[entry_id] is not None and matcher(names[entry_id])
+        ]
+
+    def _show_filtered_rows(self):
+        """Show all the rows hidden by the filter with one layout change and drop the filter state.
+           The rows are expanded back as before the filter, the rows expanded by the filter are collapsed,
+           so only the rows seen before the filter are laid out, except the parents of the current row.
+
+        """
+
+        expanded_ids = self._filter_expanded
+        self._filter_matches = None
+        self._filter_visible = None
+        self._filter_hidden = set()
+        self._filter_added = set()
+        self._filter_expanded = None
+
+        self.model.set_hidden_nodes(show_nodes=self.model.get_hidden_nodes())
+        if expanded_ids is None:
+            return
+
+        self.scheduleDelayedItemsLayout()
+        for entry_id, children_ids in self._index_children.items():
+            if entry_id == -1 or not children_ids or self._index_items[entry_id] is None:
+                continue
+            index = self._index_items[entry_id].index()
+            if entry_id in expanded_ids:
+                self.expand(index)
+            elif self.isExpanded(index):
+                self.collapse(index)
+
+        current_index = self.currentIndex()
+        if current_index.isValid():
+            parent_index = current_index.parent()
+            while parent_index.isValid():
+                self.expand(parent_index)
+                parent_index = parent_index.parent()
+            self.scrollTo(current_index)
+
+    def _schedule_refilter(self):
+        """Filter again once after a series of model changes, if there is a filter text.
+
+        """
+
+        if self.filter_text and not self._filter_pending:
+            self._filter_pending = True
+            QtCore.QTimer.singleShot(0, self._refilter_items)
+
+    def _refilter_items(self):
+        """Filter the rows again with the current filter text.
+
+        """
+
+        self._filter_pending = False
+        if self.filter_text:
+            self.filter_items(text=self.filter_text, mode=self.filter_mode)
+
+    def find_items(self, text, limit=20):
+        """Ranked fuzzy search of the rows by the names of all the columns, tolerates typos.
+
+        Args:
+            text (str): The text to search.
+            limit (int): The maximum number of results.
+
+        Returns:
+            list: The first column items of the best matched rows, best first.
+
+        """
+
+        self._ensure_name_index()
+
+        return [
+            self._index_items[entry_id] for entry_id in self.name_index.search(query=text.strip().lower(), limit=limit)
+        ]
+
+    def select_best_match(self, text):
+        """Select and scroll to the best matched row of the text, among the rows not hidden by the filter.
+
+        Args:
+            text (str): The text to search.
+
+        """
+
+        for item in self.find_items(text=text):
+            entry_id = self._item_ids[item]
+            if self._filter_visible is None or entry_id in self._filter_visible:
+                self.setCurrentIndex(item.index())
+                self.scrollTo(item.index())
+                return
+
+    def get_items(self, selected_only=False):
         """Get selected / all items from treeview.
 
+        Args:
+            selected_only (bool): Get an empty list if not selected, or all items if not selected.
+
         Returns:
             list: The list of hierarchies dictionaries with
                   [{
                   key ('parent'):
-                  value ({'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': parent_kwargs}),
+                  value ({'item': itemModel.Item, 'position': (row, column), 'kwargs': parent_kwargs}),
                   key ('children'):
-                  value ([[{'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': child_kwargs}, ]])
+                  value ([[{'item': itemModel.Item, 'position': (row, column), 'kwargs': child_kwargs}, ]])
                         The list of rows with list of columns information dictionaries on each row.
                   },]
 
@@ -662,81 +1305,229 @@ class TreeView(QtWidgets.QTreeView):
         # initial return items list
         items = []
 
-        # query current selected items indexes
-        indexes = self.selectedIndexes()
+        # query current selected rows
+        selected_rows = self._get_selected_rows()
 
         # if selected, query selected
-        if indexes:
-            # parents and children list to store items unique str(QStandardItem) for checking purpose
-            parents_list = []
-            children_list = []
-
-            for index in indexes:
-                child_item = index.model().itemFromIndex(index)
-                # check if child item is already added, if so, skip, if not, process.
-                if str(child_item) not in children_list:
-                    parent_item = child_item.parent()
-                    # if parent item doesn't exist,
-                    # then child item must be top level item has invisibleRootItem as parent
-                    if not parent_item:
-                        parent_item = self.model.invisibleRootItem()
-
-                    # check if parent item is already added, if so, skip, if not, process.
-                    if str(parent_item) not in parents_list:
-                        parent_kwargs = parent_item.data(role=QtCore.Qt.UserRole + 2)
-                        hierarchy_dict = {
-                            'parent': {
-                                'item': parent_item,
-                                'position': (parent_item.row(), parent_item.column()),
-                                'kwargs': parent_kwargs
-                            },
-                            'children': []
+        if selected_rows:
+            # parent node to its hierarchy dictionary in items
+            parents_hierarchies = {}
+
+            for parent_item, row in selected_rows:
+                # check if parent item is already added, if so, skip, if not, process.
+                hierarchy_dict = parents_hierarchies.get(parent_item.node())
+                if hierarchy_dict is None:
+                    hierarchy_dict = self._get_hierarchy_dict(parent_item=parent_item)
+                    # hierarchy_dict is appended to items in the selected order of the parents
+                    parents_hierarchies[parent_item.node()] = hierarchy_dict
+                    items.append(hierarchy_dict)
+
+                # query other children in the same row but different columns
+                # because when select, it returns the whole row with all the columns
+                children_columns_items = []
+                for i in range(parent_item.columnCount()):
+                    child_column_item = parent_item.child(row, i)
+                    child_column_kwargs = child_column_item.data(role=QtCore.Qt.UserRole + 2)
+                    children_columns_items.append(
+                        {
+                            'item': child_column_item,
+                            'position': (row, i),
+                            'kwargs': child_column_kwargs
                         }
-                        # appending parent item str(QStandardItem) to parent_list
-                        # and appending hierarchy_dict to items in same order
-                        parents_list.append(str(parent_item))
-                        items.append(hierarchy_dict)
-
-                    # query other children in the same row but different columns
-                    # because when select, it returns the whole row with all the columns
-                    children_columns_items = []
-                    for i in range(parent_item.columnCount()):
-                        child_column_item = parent_item.child(child_item.row(), i)
-                        child_column_kwargs = child_column_item.data(role=QtCore.Qt.UserRole + 2)
-                        children_columns_items.append(
-                            {
-                                'item': child_column_item,
-                                'position': (child_item.row(), i),
-                                'kwargs': child_column_kwargs
-                            }
-                        )
-
-                        # appending child column item str(QStandardItem) to children_list
-                        children_list.append(str(child_column_item))
+                    )
 
-                    parent_id = parents_list.index(str(parent_item))
-                    items[parent_id]['children'].append(children_columns_items)
+                hierarchy_dict['children'].append(children_columns_items)
 
         # if not selected, query all
-        else:
+        elif not selected_only:
             items = self.iter_get_items(start_item=self.model.invisibleRootItem())
 
         return items
 
+    def _get_selected_rows(self):
+        """Return the visible selected rows, read from the selection ranges, so the model is not asked for every
+           selected index.
+
+        Returns:
+            list: The list of (parent item, row) of the selected rows, in the selected order, each row once.
+                  The parent item is the invisible root item for the top level rows.
+
+        """
+
+        root_item = self.model.invisibleRootItem()
+        rows = []
+        # (parent node, row) of the rows already added, a row is selected with all its columns
+        added_rows = set()
+
+        for selection_range in self.selectionModel().selection():
+            # same as selectedIndexes, the hidden columns and rows are not selected
+            columns = range(selection_range.left(), selection_range.right() + 1)
+            if all(self.isColumnHidden(column) for column in columns):
+                continue
+
+            parent_index = selection_range.parent()
+            parent_item = self.model.itemFromIndex(parent_index) or root_item
+            for row in range(selection_range.top(), selection_range.bottom() + 1):
+                if self.isRowHidden(row, parent_index):
+                    continue
+                # the rows the view sees are not the rows of the model under the parents with filtered rows
+                if self._filter_hidden:
+                    row = self.model.get_node_row(node=self.model.index(row, 0, parent_index).internalId())
+                row_key = (parent_item.node(), row)
+                if row_key in added_rows:
+                    continue
+                added_rows.add(row_key)
+                rows.append((parent_item, row))
+
+        return rows
+
+    def _take_rows(self, parent_item, rows):
+        """Take the rows under the parent item out of the model, contiguous rows are taken together,
+           several ranges are taken with one layout change.
+           The taken rows are kept by the undo stack, so they can be inserted back.
+
+        Args:
+            parent_item (itemModel.Item): The parent item, the invisible root item for the top level rows.
+            rows (list): The rows numbers to take.
+
+        """
+
+        rows_ranges = [
+            (row, nodes) for row, nodes in self.model.take_rows_ranges(
+                parent_node=parent_item.node(), rows_ranges=itemModel.get_rows_ranges(rows=rows)
+            ) if nodes
+        ]
+
+        if rows_ranges:
+            self.undo_stack.push(
+                command=undoStack.RemoveRowsCommand(
+                    model=self.model, parent_node=parent_item.node(), rows_ranges=rows_ranges
+                )
+            )
+
+    def _move_rows(self, parent_item, rows, destination_item, destination_row):
+        """Move the rows under the parent item to the destination item in one model move,
+           the rows keep their order and their items stay valid.
+
+        Args:
+            parent_item (itemModel.Item): The parent item, the invisible root item for the top level rows.
+            rows (list): The rows numbers to move.
+            destination_item (itemModel.Item): The destination parent item.
+            destination_row (int): The destination row number, the moved rows are inserted before it.
+
+        Returns:
+            list: The list of moved rows with list of columns items on each row [[columns items],],
+                  from back -> forward of the rows.
+
+        """
+
+        rows_ranges = itemModel.get_rows_ranges(rows=rows)
+
+        # the moved rows are deselected as the removed rows, the selection is not moved with each range
+        children_nodes = self.model.get_children_nodes(node=parent_item.node())
+        last_column = self.model.columnCount() - 1
+        selection = QtCore.QItemSelection()
+        for row, count in rows_ranges:
+            selection.select(
+                self.model.node_index(node=children_nodes[row]),
+                self.model.node_index(node=children_nodes[row + count - 1], column=last_column)
+            )
+        self.selectionModel().select(selection, QtCore.QItemSelectionModel.Deselect)
+
+        rows = sorted(row for first, count in rows_ranges for row in range(first, first + count))
+        nodes = [children_nodes[row] for row in rows]
+
+        moved_count = self.model.move_rows_ranges(
+            parent_node=parent_item.node(),
+            rows_ranges=rows_ranges,
+            destination_node=destination_item.node(),
+            destination_row=destination_row
+        )
+        if moved_count:
+            destination_row = self.model.get_node_row(node=nodes[0])
+            self.undo_stack.push(
+                command=undoStack.MoveRowsCommand(
+                    model=self.model,
+                    nodes=nodes,
+                    parent_node=parent_item.node(),
+                    rows=rows,
+                    destination_node=destination_item.node(),
+                    destination_row=destination_row
+                )
+            )
+
+        # the moved rows are in the destination, in the same order
+        return [
+            [
+                column_item for column_item in
+                (destination_item.child(row, column) for column in range(destination_item.columnCount()))
+                if column_item is not None
+            ]
+            for row in reversed(range(destination_row, destination_row + moved_count))
+        ]
+
+    @staticmethod
+    def iter_rows(start_item, max_depth=None, columns=None, depth_first=False):
+        """Yield the rows from start column item to downstream one by one, the rows are only queried when they are
+           iterated and their kwargs are not built, query them with item.data(role=QtCore.Qt.UserRole + 2) if needed.
+           Rows must not be added or removed while iterating.
+
+        Args:
+            start_item (itemModel.Item): The start column item.
+            max_depth (int/None): Only the rows down to this depth, 1 for the children of start item only,
+                                  None for all the depths.
+            columns (list/None): Only the items of these columns, None for all the columns.
+            depth_first (bool): Yield each row followed by its children rows,
+                                or all the children rows of a parent before the rows of the next parent,
+                                parents in breadth first order.
+
+        Yields:
+            tuple: (parent item, row, depth, [columns items])
+
+        """
+
+        def get_columns_items(parent_item, row):
+            if columns is None:
+                return [parent_item.child(row, column) for column in range(parent_item.columnCount())]
+            return [parent_item.child(row, column) for column in columns if column < parent_item.columnCount()]
+
+        # parent items to walk, with their depth and the rows left to walk
+        parents = collections.deque([(start_item, 1, iter(range(start_item.rowCount())))])
+
+        while parents:
+            if depth_first:
+                parent_item, depth, rows = parents[-1]
+                row = next(rows, None)
+                if row is None:
+                    parents.pop()
+                    continue
+                rows = [row]
+            else:
+                parent_item, depth, rows = parents.popleft()
+
+            for row in rows:
+                yield parent_item, row, depth, get_columns_items(parent_item=parent_item, row=row)
+
+                if max_depth is None or depth < max_depth:
+                    # only the first column items have children
+                    child_item = parent_item.child(row, 0)
+                    if child_item is not None and child_item.hasChildren():
+                        parents.append((child_item, depth + 1, iter(range(child_item.rowCount()))))
+
     @staticmethod
     def iter_get_items(start_item):
         """Get all items from start column item to downstream.
 
         Args:
-            start_item (QtGui.QStandardItem): The start column item.
+            start_item (itemModel.Item): The start column item.
 
         Returns:
             list: The list of hierarchies dictionaries with
                   [{
                   key ('parent'):
-                  value ({'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': parent_kwargs}),
+                  value ({'item': itemModel.Item, 'position': (row, column), 'kwargs': parent_kwargs}),
                   key ('children'):
-                  value ([[{'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': child_kwargs}, ]])
+                  value ([[{'item': itemModel.Item, 'position': (row, column), 'kwargs': child_kwargs}, ]])
                         The list of rows with list of columns information dictionaries on each row.
                   },]
 
@@ -745,48 +1536,48 @@ class TreeView(QtWidgets.QTreeView):
         # initial return items list
         items = []
 
-        stack = [start_item]
-
-        while stack:
-            parent_item = stack.pop(0)
-            parent_kwargs = parent_item.data(role=QtCore.Qt.UserRole + 2)
-
-            hierarchy_dict = {
-                'parent': {
-                    'item': parent_item,
-                    'position': (parent_item.row(), parent_item.column()),
-                    'kwargs': parent_kwargs
-                },
-                'children': []
-            }
+        hierarchy_parent_item = None
+        for parent_item, row, _, columns_items in TreeView.iter_rows(start_item=start_item):
+            # the rows of a parent are yielded together, parents in breadth first order
+            if parent_item is not hierarchy_parent_item:
+                hierarchy_parent_item = parent_item
+                items.append(TreeView._get_hierarchy_dict(parent_item=parent_item))
+
+            items[-1]['children'].append([
+                {
+                    'item': child_column_item,
+                    'position': (row, column),
+                    'kwargs': child_column_item.data(role=QtCore.Qt.UserRole + 2)
+                }
+                for column, child_column_item in enumerate(columns_items)
+            ])
 
-            items.append(hierarchy_dict)
+        # start item without children
+        if not items:
+            items.append(TreeView._get_hierarchy_dict(parent_item=start_item))
 
-            for i in range(parent_item.rowCount()):
-                children_columns_items = []
-                for j in range(parent_item.columnCount()):
-                    child_column_item = parent_item.child(i, j)
-                    child_column_kwargs = child_column_item.data(role=QtCore.Qt.UserRole + 2)
-                    children_columns_items.append(
-                        {
-                            'item': child_column_item,
-                            'position': (i, j),
-                            'kwargs': child_column_kwargs
-                        }
-                    )
+        return items
 
-                    if child_column_item.hasChildren():
-                        stack.append(child_column_item)
+    @staticmethod
+    def _get_hierarchy_dict(parent_item):
+        """Return the hierarchy dictionary of the parent item without children, see iter_get_items.
 
-                hierarchy_dict['children'].append(children_columns_items)
+        """
 
-        return items
+        return {
+            'parent': {
+                'item': parent_item,
+                'position': (parent_item.row(), parent_item.column()),
+                'kwargs': parent_item.data(role=QtCore.Qt.UserRole + 2)
+            },
+            'children': []
+        }
 
     def get_item_path(self, start_item):
         """Get all the items from start item to upwards.
 
         Args:
-            start_item (QtGui.QStandardItem): The start item to get all the items upwards .
+            start_item (itemModel.Item): The start item to get all the items upwards .
 
         Returns:
             list: All the items from start item to upwards, in a start_item -> upper parent -> upper parent order.
@@ -811,6 +1602,7 @@ class TreeView(QtWidgets.QTreeView):
 
         return path_items
 
+    @undoStack.undo_macro(text='Parent items')
     def parent_items(self):
         """Parent items in treeview based on selection,
            select items to parent first, then select item to get parented last.
@@ -819,47 +1611,37 @@ class TreeView(QtWidgets.QTreeView):
             dict/None: The parent children hierarchies dictionary with
                       {
                       key ('parent'):
-                      value ({'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': parent_kwargs}),
+                      value ({'item': itemModel.Item, 'position': (row, column), 'kwargs': parent_kwargs}),
                       key ('children'):
-                      value ([[{'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': child_kwargs}, ], ])
+                      value ([[{'item': itemModel.Item, 'position': (row, column), 'kwargs': child_kwargs}, ], ])
                             The list of rows with list of columns information dictionaries on each row.
                       }
 
         """
 
-        # query current selected indexes
-        indexes = self.selectedIndexes()
+        # query current selected rows
+        selected_rows = self._get_selected_rows()
 
         # if selected, query selected
-        if indexes:
-            # get parents columns items -----------------------------------------------------
-            last_parent_column_item = indexes[-1].model().itemFromIndex(indexes[-1])
-            last_parent_column_num = last_parent_column_item.column()
-
-            parents_indexes = indexes[-(last_parent_column_num + 1):]
-            parents_columns_items = []
-            for parent_index in parents_indexes:
-                parents_columns_items.append(parent_index.model().itemFromIndex(parent_index))
+        if selected_rows:
+            # get parents columns items, the last selected row -----------------------------------------------------
+            last_parent_item, last_row_num = selected_rows[-1]
+            parents_columns_items = [
+                last_parent_item.child(last_row_num, column) for column in range(last_parent_item.columnCount())
+            ]
 
             parent_row_num = parents_columns_items[0].rowCount()
             parent_path_items = self.get_item_path(start_item=parents_columns_items[0])
 
-            # parents list with unique str(QStandardItem) for checking purpose
+            # parents list with unique str(item) for checking purpose
             parents_list = [str(parents_columns_items[i]) for i in range(len(parents_columns_items))]
             parent_path_list = [str(parent_path_items[i]) for i in range(len(parent_path_items))]
 
             # query current selected items -----------------------------------------------------
-            items = self.get_items()
+            items = self.get_items(selected_only=True)
 
             # initial parent children items
-            parent_children_items = {
-                'parent': {
-                    'item': parents_columns_items[0],
-                    'position': (parents_columns_items[0].row(), parents_columns_items[0].column()),
-                    'kwargs': parents_columns_items[0].data(role=QtCore.Qt.UserRole + 2)
-                },
-                'children': []
-            }
+            parent_children_items = self._get_hierarchy_dict(parent_item=parents_columns_items[0])
 
             # hierarchy level
             for hierarchy in items:
@@ -871,15 +1653,14 @@ class TreeView(QtWidgets.QTreeView):
                         row[0]['position'][0] for row in hierarchy['children']
                         if str(row[0]['item']) not in parents_list and str(row[0]['item']) not in parent_path_list[1:]
                     ]
-                    # avoiding parent's rows index changes, remove from back -> forward.
-                    rows_nums.sort(reverse=True)
 
-                    # temporary save newly parented children items
-                    children_items = []
-                    for row_num in rows_nums:
-                        columns_items = parent_item.takeRow(row_num)
-                        parents_columns_items[0].insertRow(parent_row_num, columns_items)
-                        children_items.append(columns_items)
+                    # temporary save newly parented children items, contiguous rows are moved together
+                    children_items = self._move_rows(
+                        parent_item=parent_item,
+                        rows=rows_nums,
+                        destination_item=parents_columns_items[0],
+                        destination_row=parent_row_num
+                    )
 
                     # add to parent_children_items
                     for row_items in children_items:
@@ -903,6 +1684,7 @@ class TreeView(QtWidgets.QTreeView):
 
             return None
 
+    @undoStack.undo_macro(text='Unparent items')
     def unparent_items(self):
         """Unparent items in treeview based on selection.
 
@@ -910,49 +1692,37 @@ class TreeView(QtWidgets.QTreeView):
             dict/None: The unparent children hierarchies dictionary with
                       {
                       key ('parent'):
-                      value ({'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': parent_kwargs}),
+                      value ({'item': itemModel.Item, 'position': (row, column), 'kwargs': parent_kwargs}),
                       key ('children'):
-                      value ([[{'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': child_kwargs}, ]])
+                      value ([[{'item': itemModel.Item, 'position': (row, column), 'kwargs': child_kwargs}, ]])
                             The list of rows with list of columns information dictionaries on each row.
                       }
 
         """
 
-        # query current selected indexes
-        indexes = self.selectedIndexes()
+        # query current selected items -----------------------------------------------------
+        items = self.get_items(selected_only=True)
 
         # if selected, query selected
-        if indexes:
-            # query current selected items -----------------------------------------------------
-            items = self.get_items()
-            root_row_num = self.model.invisibleRootItem().rowCount()
+        if items:
+            root_item = self.model.invisibleRootItem()
+            root_row_num = root_item.rowCount()
 
             # initial unparent children items
-            unparent_children_items = {
-                'parent': {
-                    'item': self.model.invisibleRootItem(),
-                    'position': (self.model.invisibleRootItem().row(), self.model.invisibleRootItem().column()),
-                    'kwargs': None
-                },
-                'children': []
-            }
+            unparent_children_items = self._get_hierarchy_dict(parent_item=root_item)
 
             # hierarchy level
             for hierarchy in items:
                 parent_item = hierarchy['parent']['item']
                 # only process if selected items' parent is not root parent.
-                if str(parent_item) != str(self.model.invisibleRootItem()):
+                if parent_item != root_item:
                     # rows level
                     rows_nums = [row[0]['position'][0] for row in hierarchy['children']]
-                    # avoiding parent's rows index changes, remove from back -> forward.
-                    rows_nums.sort(reverse=True)
 
-                    # temporary save newly unparent children items
-                    children_items = []
-                    for row_num in rows_nums:
-                        columns_items = parent_item.takeRow(row_num)
-                        self.model.invisibleRootItem().insertRow(root_row_num, columns_items)
-                        children_items.append(columns_items)
+                    # temporary save newly unparent children items, contiguous rows are moved together
+                    children_items = self._move_rows(
+                        parent_item=parent_item, rows=rows_nums, destination_item=root_item, destination_row=root_row_num
+                    )
 
                     # add to unparent_children_hierarchy_dict
                     for row_items in children_items:
@@ -976,6 +1746,7 @@ class TreeView(QtWidgets.QTreeView):
 
             return None
 
+    @undoStack.undo_macro(text='Group items')
     def group_items(self, group_columns_kwargs):
         """Group items in treeview based on selection.
 
@@ -1001,9 +1772,9 @@ class TreeView(QtWidgets.QTreeView):
             dict: The group children hierarchies dictionary with
                   {
                   key ('parent'):
-                  value ({'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': parent_kwargs}),
+                  value ({'item': itemModel.Item, 'position': (row, column), 'kwargs': parent_kwargs}),
                   key ('children'):
-                  value ([[{'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': child_kwargs}, ]])
+                  value ([[{'item': itemModel.Item, 'position': (row, column), 'kwargs': child_kwargs}, ]])
                         The list of rows with list of columns information dictionaries on each row.
                   }
 
@@ -1012,40 +1783,37 @@ class TreeView(QtWidgets.QTreeView):
         group_items = self.add_items(
             items_kwargs=[group_columns_kwargs], unique_name=True, parent_item=None
         )
+        self.undo_stack.push(
+            command=undoStack.InsertRowsCommand(
+                model=self.model,
+                parent_node=itemModel.ROOT_NODE,
+                row=group_items[0][0].row(),
+                nodes=[group_items[0][0].node()]
+            )
+        )
         group_row_num = group_items[0][0].rowCount()
 
         # initial group children items
-        group_children_items = {
-            'parent': {
-                'item': group_items[0][0],
-                'position': (group_items[0][0].row(), group_items[0][0].column()),
-                'kwargs': group_items[0][0].data(role=QtCore.Qt.UserRole + 2)
-            },
-            'children': []
-        }
+        group_children_items = self._get_hierarchy_dict(parent_item=group_items[0][0])
 
-        # query current selected indexes
-        indexes = self.selectedIndexes()
+        # query current selected items -----------------------------------------------------
+        items = self.get_items(selected_only=True)
 
         # if selected, query selected
-        if indexes:
-            # query current selected items -----------------------------------------------------
-            items = self.get_items()
-
+        if items:
             # hierarchy level
             for hierarchy in items:
                 parent_item = hierarchy['parent']['item']
                 # rows level
                 rows_nums = [row[0]['position'][0] for row in hierarchy['children']]
-                # avoiding parent's rows index changes, remove from back -> forward.
-                rows_nums.sort(reverse=True)
 
-                # temporary save newly group children items
-                children_items = []
-                for row_num in rows_nums:
-                    columns_items = parent_item.takeRow(row_num)
-                    group_items[0][0].insertRow(group_row_num, columns_items)
-                    children_items.append(columns_items)
+                # temporary save newly group children items, contiguous rows are moved together
+                children_items = self._move_rows(
+                    parent_item=parent_item,
+                    rows=rows_nums,
+                    destination_item=group_items[0][0],
+                    destination_row=group_row_num
+                )
 
                 # add to group_children_items
                 for row_items in children_items:
@@ -1067,6 +1835,7 @@ class TreeView(QtWidgets.QTreeView):
 
         return group_children_items
 
+    @undoStack.undo_macro(text='Ungroup items')
     def ungroup_items(self):
         """Ungroup items in treeview to the upper parent lever, based on selection.
 
@@ -1074,22 +1843,19 @@ class TreeView(QtWidgets.QTreeView):
             list/None: The list of new ungroup children hierarchies dictionaries with
                       [{
                       key ('parent'):
-                      value ({'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': parent_kwargs}),
+                      value ({'item': itemModel.Item, 'position': (row, column), 'kwargs': parent_kwargs}),
                       key ('children'):
-                      value ([[{'item': QtGui.QStandardItem, 'position': (row, column), 'kwargs': child_kwargs}, ]])
+                      value ([[{'item': itemModel.Item, 'position': (row, column), 'kwargs': child_kwargs}, ]])
                             The list of rows with list of columns information dictionaries on each row.
                       },]
 
         """
 
-        # query current selected indexes
-        indexes = self.selectedIndexes()
+        # query current selected items -----------------------------------------------------
+        items = self.get_items(selected_only=True)
 
         # if selected, query selected
-        if indexes:
-            # query current selected items -----------------------------------------------------
-            items = self.get_items()
-
+        if items:
             # initial ungroup children items
             ungroup_children_items = []
 
@@ -1108,21 +1874,20 @@ class TreeView(QtWidgets.QTreeView):
                     children_items = []
                     for row in hierarchy['children']:
                         groups_rows_nums.append(row[0]['position'][0])
-                        # columns level
-                        for i in reversed(range(row[0]['item'].rowCount())):
-                            child_columns_items = row[0]['item'].takeRow(i)
-                            parent_item.insertRow(row_num, child_columns_items)
-                            children_items.append(child_columns_items)
+                        # all the children rows of the group are moved together
+                        children_items.extend(
+                            self._move_rows(
+                                parent_item=row[0]['item'],
+                                rows=range(row[0]['item'].rowCount()),
+                                destination_item=parent_item,
+                                destination_row=row_num
+                            )
+                        )
 
                     # only delete groups if have children
                     if children_items:
-                        # avoiding parent's rows index changes, delete from back -> forward.
-                        groups_rows_nums.sort(reverse=True)
-                        for group_row_num in groups_rows_nums:
-                            try:
-                                parent_item.removeRow(group_row_num)
-                            except (RuntimeError, Exception):
-                                pass
+                        # contiguous groups are deleted together.
+                        self._take_rows(parent_item=parent_item, rows=groups_rows_nums)
 
                         ungroup_children_hierarchy_dict = {
                             'parent': {'item': parent_item, 'position': parent_position, 'kwargs': parent_kwargs},
@@ -1277,44 +2042,18 @@ class ItemDelegate(QtWidgets.QStyledItemDelegate):
 
         """
 
-        item = index.model().itemFromIndex(index)
-        item_kwargs = item.data(role=QtCore.Qt.UserRole + 2)
-
-        if item_kwargs['paint']:
-            if option.state & QtWidgets.QStyle.State_Selected:
-                # item back ground color -----------------------------------------------------------
-                bg_q_color = QtGui.QColor(
-                    item_kwargs['bg_color'][0],
-                    item_kwargs['bg_color'][1],
-                    item_kwargs['bg_color'][2],
-                    item_kwargs['bg_alpha']
-                )
-                # item text color -----------------------------------------------------------
-                text_q_color = QtGui.QColor(
-                    item_kwargs['text_color'][0],
-                    item_kwargs['text_color'][1],
-                    item_kwargs['text_color'][2],
-                    item_kwargs['text_alpha']
-                )
-            else:
-                # item back ground color -----------------------------------------------------------
-                bg_q_color = item.data(role=QtCore.Qt.BackgroundColorRole).color()
-                # item text color -----------------------------------------------------------
-                text_q_color = item.data(role=QtCore.Qt.ForegroundRole).color()
+        # shared colors, pen and font of the item style, nothing is created on every paint
+        item_style = index.data(itemModel.PAINT_STYLE_ROLE)
 
+        if item_style is not None:
             painter.save()
             # item back ground -----------------------------------------------------------
-            painter.fillRect(option.rect, bg_q_color)
+            painter.fillRect(option.rect, item_style.bg_color)
             # item text -----------------------------------------------------------
-            text = str(item.data(role=QtCore.Qt.DisplayRole))
-
-            q_font = QtGui.QFont()
-            q_font.setFamily('Segoe UI')
-            q_font.setPointSize(item_kwargs['size'])
-            q_font.setBold(item_kwargs['bold'])
+            text = str(index.data(QtCore.Qt.DisplayRole))
 
-            painter.setFont(q_font)
-            painter.setPen(QtGui.QPen(text_q_color))
+            painter.setFont(item_style.font)
+            painter.setPen(item_style.text_pen)
 
             painter.drawText(option.rect, QtCore.Qt.AlignLeft, text)
 
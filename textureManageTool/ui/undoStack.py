@@ -0,0 +1,414 @@
+import functools
+
+from Qt import QtCore
+
+import itemModel
+
+
+class UndoCommand(object):
+    """Undoable edit of the tree view, QtWidgets.QUndoCommand style, its children are undone / redone with it.
+
+    Commands are pushed after their edit is done. They keep rows nodes, rows numbers and cells states instead of items
+    and item kwargs, the rows taken out of the model stay in the model storage until the command is released.
+
+    """
+
+    def __init__(self, text=''):
+        """Initial setting for UndoCommand.
+
+        Args:
+            text (str): The command description, example: 'Group items'.
+
+        """
+
+        self.text = text
+        self.children = []
+
+    def undo(self):
+        for child in reversed(self.children):
+            child.undo()
+
+    def redo(self):
+        for child in self.children:
+            child.redo()
+
+    def release(self, done):
+        """Release what the command keeps to undo / redo, it is dropped from the undo stack.
+
+        Args:
+            done (bool): True if the command is dropped done, False if dropped undone.
+
+        """
+
+        for child in self.children:
+            child.release(done=done)
+
+
+class MoveRowsCommand(UndoCommand):
+    """Rows moved from a parent to another parent.
+
+    """
+
+    def __init__(self, model, nodes, parent_node, rows, destination_node, destination_row, text=''):
+        """Initial setting for MoveRowsCommand.
+
+        Args:
+            model (itemModel.ItemModel): The model.
+            nodes (list): The moved rows nodes, in their order after moving.
+            parent_node (int): The parent row node before moving.
+            rows (list): The rows numbers of the nodes before moving, in ascending order.
+            destination_node (int): The parent row node after moving.
+            destination_row (int): The row number of the first node after moving, the nodes are next to each other.
+            text (str): The command description.
+
+        """
+
+        super(MoveRowsCommand, self).__init__(text=text)
+
+        self.model = model
+        self.nodes = tuple(nodes)
+        self.parent_node = parent_node
+        self.rows = tuple(rows)
+        self.destination_node = destination_node
+        self.destination_row = destination_row
+
+    def undo(self):
+        self.model.move_nodes(nodes=self.nodes, destination_node=self.parent_node, rows=self.rows)
+
+    def redo(self):
+        self.model.move_nodes(
+            nodes=self.nodes,
+            destination_node=self.destination_node,
+            rows=range(self.destination_row, self.destination_row + len(self.nodes))
+        )
+
+    def release(self, done):
+        pass
+
+
+class RemoveRowsCommand(UndoCommand):
+    """Rows ranges taken out of a parent, the taken rows are released once the command is dropped done.
+
+    """
+
+    def __init__(self, model, parent_node, rows_ranges, text=''):
+        """Initial setting for RemoveRowsCommand.
+
+        Args:
+            model (itemModel.ItemModel): The model.
+            parent_node (int): The parent row node.
+            rows_ranges (list): The list of (first row number, rows nodes) ranges, in the taking order,
+                                from back -> forward, so they are inserted back from forward -> back.
+            text (str): The command description.
+
+        """
+
+        super(RemoveRowsCommand, self).__init__(text=text)
+
+        self.model = model
+        self.parent_node = parent_node
+        self.rows_ranges = tuple((row, tuple(nodes)) for row, nodes in rows_ranges)
+
+    def undo(self):
+        self._insert_rows()
+
+    def redo(self):
+        self._take_rows()
+
+    def release(self, done):
+        if done:
+            self._free_rows()
+
+    def _take_rows(self):
+        """Take the rows ranges out of the parent, the ranges not at their rows any more are skipped.
+
+        """
+
+        children = self.model.get_children_nodes(node=self.parent_node)
+        self.model.take_rows_ranges(
+            parent_node=self.parent_node,
+            rows_ranges=[
+                (row, len(nodes)) for row, nodes in self.rows_ranges if tuple(children[row:row + len(nodes)]) == nodes
+            ]
+        )
+
+    def _insert_rows(self):
+        """Insert the taken rows ranges back under the parent, skipped if the parent is not in the model any more.
+
+        """
+
+        if not self.model.is_in_model(node=self.parent_node):
+            return
+
+        self.model.insert_rows_ranges(
+            parent_node=self.parent_node,
+            rows_ranges=[
+                (row, [node for node in nodes if self.model.get_parent_node(node=node) == itemModel.DETACHED_NODE])
+                for row, nodes in reversed(self.rows_ranges)
+            ]
+        )
+
+    def _free_rows(self):
+        self.model.free_rows(nodes=[node for _, nodes in self.rows_ranges for node in nodes])
+
+
+class InsertRowsCommand(RemoveRowsCommand):
+    """Rows inserted under a parent, the inserted rows are released once the command is dropped undone.
+
+    """
+
+    def __init__(self, model, parent_node, row, nodes, text=''):
+        """Initial setting for InsertRowsCommand.
+
+        Args:
+            model (itemModel.ItemModel): The model.
+            parent_node (int): The parent row node.
+            row (int): The row number of the first inserted row.
+            nodes (list): The inserted rows nodes, next to each other.
+            text (str): The command description.
+
+        """
+
+        super(InsertRowsCommand, self).__init__(
+            model=model, parent_node=parent_node, rows_ranges=[(row, nodes)], text=text
+        )
+
+    def undo(self):
+        self._take_rows()
+
+    def redo(self):
+        self._insert_rows()
+
+    def release(self, done):
+        if not done:
+            self._free_rows()
+
+
+class EditCellsCommand(UndoCommand):
+    """Cells values changed, keeps the cells states before and after, see ItemModel.get_cell_state.
+
+    """
+
+    def __init__(self, model, cells, text=''):
+        """Initial setting for EditCellsCommand.
+
+        Args:
+            model (itemModel.ItemModel): The model.
+            cells (list): The list of (row node, column, state before, state after) of the cells.
+            text (str): The command description.
+
+        """
+
+        super(EditCellsCommand, self).__init__(text=text)
+
+        self.model = model
+        self.cells = tuple(cells)
+
+    def undo(self):
+        for node, column, state, _ in reversed(self.cells):
+            self.model.set_cell_state(node=node, column=column, state=state)
+
+    def redo(self):
+        for node, column, _, state in self.cells:
+            self.model.set_cell_state(node=node, column=column, state=state)
+
+    def release(self, done):
+        pass
+
+
+class CallbackCommand(UndoCommand):
+    """Edit outside of the tree view done with the tree view edits, example: the texture assigned in the scene.
+
+    """
+
+    def __init__(self, undo_callback, redo_callback, text=''):
+        """Initial setting for CallbackCommand.
+
+        Args:
+            undo_callback (function): Takes no argument, undoes the edit.
+            redo_callback (function): Takes no argument, does the edit again.
+            text (str): The command description.
+
+        """
+
+        super(CallbackCommand, self).__init__(text=text)
+
+        self.undo_callback = undo_callback
+        self.redo_callback = redo_callback
+
+    def undo(self):
+        self.undo_callback()
+
+    def redo(self):
+        self.redo_callback()
+
+    def release(self, done):
+        pass
+
+
+class UndoStack(QtCore.QObject):
+    """Undo stack of the tree view edits, QtWidgets.QUndoStack style.
+
+    Only the last undo limit commands are kept, the dropped commands are released, so the rows they took out of the
+    model are freed and the memory stays bounded however many edits are done.
+
+    """
+
+    # the number of done commands, emitted after push / undo / redo / clear
+    index_changed = QtCore.Signal(int)
+
+    def __init__(self, undo_limit=100, parent=None):
+        """Initial setting for UndoStack.
+
+        Args:
+            undo_limit (int): The maximum number of commands kept, 0 for no limit.
+            parent (QtCore.QObject/None): Parent object.
+
+        """
+
+        super(UndoStack, self).__init__(parent)
+
+        self.undo_limit = undo_limit
+        self.commands = []
+        self._index = 0
+        # the macros begun and not ended yet, the pushed commands are added to the last one
+        self._macros = []
+
+    def index(self):
+        return self._index
+
+    def count(self):
+        return len(self.commands)
+
+    def can_undo(self):
+        return not self._macros and self._index > 0
+
+    def can_redo(self):
+        return not self._macros and self._index < len(self.commands)
+
+    def undo_text(self):
+        return self.commands[self._index - 1].text if self.can_undo() else ''
+
+    def redo_text(self):
+        return self.commands[self._index].text if self.can_redo() else ''
+
+    def push(self, command):
+        """Push the command of an edit already done, the command is not redone.
+           The undone commands are dropped, the oldest commands are dropped once there are more than the undo limit.
+
+        Args:
+            command (UndoCommand): The command.
+
+        """
+
+        if self._macros:
+            self._macros[-1].children.append(command)
+            return
+
+        for undone_command in self.commands[self._index:]:
+            undone_command.release(done=False)
+        del self.commands[self._index:]
+
+        self.commands.append(command)
+        if self.undo_limit and len(self.commands) > self.undo_limit:
+            for done_command in self.commands[:-self.undo_limit]:
+                done_command.release(done=True)
+            del self.commands[:-self.undo_limit]
+        self._index = len(self.commands)
+
+        self.index_changed.emit(self._index)
+
+    def begin_macro(self, text):
+        """Begin a command composed of the commands pushed until end_macro, undone / redone at once.
+
+        Args:
+            text (str): The command description.
+
+        """
+
+        self._macros.append(UndoCommand(text=text))
+
+    def end_macro(self):
+        """End the last begun macro and push it, macros without any command are not pushed.
+
+        """
+
+        macro = self._macros.pop()
+        if macro.children:
+            self.push(command=macro)
+
+    def undo(self):
+        if not self.can_undo():
+            return
+
+        self._index -= 1
+        self.commands[self._index].undo()
+        self.index_changed.emit(self._index)
+
+    def redo(self):
+        if not self.can_redo():
+            return
+
+        self.commands[self._index].redo()
+        self._index += 1
+        self.index_changed.emit(self._index)
+
+    def set_undo_limit(self, undo_limit):
+        """Set the maximum number of commands kept, the oldest done commands over the limit are dropped first,
+           then the last undone commands.
+
+        Args:
+            undo_limit (int): The maximum number of commands, 0 for no limit.
+
+        """
+
+        self.undo_limit = undo_limit
+        while undo_limit and len(self.commands) > undo_limit:
+            if self._index > 0:
+                self.commands.pop(0).release(done=True)
+                self._index -= 1
+            else:
+                self.commands.pop().release(done=False)
+
+        self.index_changed.emit(self._index)
+
+    def clear(self):
+        """Drop all the commands, example: before the model is reset.
+           The macros begun stay open without their commands, so an edit resetting the model can still end its macro.
+
+        """
+
+        for i, command in enumerate(self.commands):
+            command.release(done=i < self._index)
+        self.commands = []
+        self._index = 0
+        for macro in self._macros:
+            macro.release(done=True)
+            macro.children = []
+
+        self.index_changed.emit(self._index)
+
+
+def undo_macro(text):
+    """Decorator of the tree view edit methods, the commands pushed during the edit are undone / redone at once.
+
+    Args:
+        text (str): The macro description, example: 'Group items'.
+
+    Returns:
+        function: The decorator.
+
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            self.undo_stack.begin_macro(text=text)
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.undo_stack.end_macro()
+
+        return wrapper
+
+    return decorator
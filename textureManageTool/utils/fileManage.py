@@ -1,4 +1,13 @@
-import os, re
+import os, re, stat
+
+try:
+    from os import scandir
+except ImportError:
+    # python 2 needs the scandir backport, fall back to listdir + stat without it.
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
 
 from maya import cmds
 
@@ -54,6 +63,57 @@ def get_all_files(path, file_extension='', return_without_ext=True):
         return all_files
 
 
+def iter_directory(path, extensions=None):
+    """Iterate the entries of a single directory, sub directories and files with certain extensions.
+
+    Args:
+        path (str): Directory path.
+        extensions (set/None): Lower case file extensions, example: {'.jpg', '.png'}, None for all the files.
+                               Files extensions are matched case-insensitively.
+
+    Yields:
+        tuple: (entry name, is directory, size in bytes, modified time), size and time are None for directories.
+
+    """
+
+    if scandir is not None:
+        entries = scandir(path)
+        try:
+            for entry in entries:
+                # is_dir / is_file use the cached directory entry type, only matched files are stat.
+                if entry.is_dir(follow_symlinks=False):
+                    yield entry.name, True, None, None
+                elif extensions is None or os.path.splitext(entry.name)[1].lower() in extensions:
+                    try:
+                        if not entry.is_file():
+                            continue
+                        entry_stat = entry.stat()
+                    except OSError:
+                        # removed while scanning
+                        continue
+                    yield entry.name, False, entry_stat.st_size, entry_stat.st_mtime
+        finally:
+            # close the directory handle even if the iteration is stopped early, the scandir backport may not have it
+            if hasattr(entries, 'close'):
+                entries.close()
+
+    else:
+        for name in os.listdir(path):
+            try:
+                entry_stat = os.lstat(os.path.join(path, name))
+            except OSError:
+                continue
+            if stat.S_ISDIR(entry_stat.st_mode):
+                yield name, True, None, None
+            elif extensions is None or os.path.splitext(name)[1].lower() in extensions:
+                try:
+                    is_file = stat.S_ISREG(os.stat(os.path.join(path, name)).st_mode)
+                except OSError:
+                    continue
+                if is_file:
+                    yield name, False, entry_stat.st_size, entry_stat.st_mtime
+
+
 def maya_file_dialog(caption, file_filter, file_mode=1, starting_directory=''):
     """Create Open/Save maya file dialog .
 
@@ -162,6 +222,204 @@ def unique_name(names, name):
     return name
 
 
+def split_trailing_number(name):
+    """Split the name into its base name and trailing number, the same rules as find_highest_trailing_number.
+
+    Args:
+        name (str): Name to split, example: 'base_name_v003'.
+
+    Returns:
+        tuple: (base name, example: 'base_name_v', trailing number int, None if the name has no trailing number)
+
+    """
+
+    name_suffix_m = re.search(r'\d+$', name)
+    if not name_suffix_m:
+        return name, None
+
+    return name[:name_suffix_m.start()], int(name_suffix_m.group())
+
+
+def split_version(file_name):
+    """Split the file name into its version base name, extension and version number.
+
+    Args:
+        file_name (str): File name, example: 'wood_albedo_v003.png'.
+
+    Returns:
+        tuple: (base name, example: 'wood_albedo_v', lower case extension, example: '.png',
+                version number int, None if the file name has no trailing number)
+
+    """
+
+    stem, extension = os.path.splitext(file_name)
+    base_name, number = split_trailing_number(name=stem)
+
+    return base_name, extension.lower(), number
+
+
+def group_versions(items, key=None):
+    """Group versioned file names by their base name and extension in one pass,
+       example: wood_albedo_v001.png ... wood_albedo_v047.png are one group.
+       A file name without trailing number is the oldest version of its base name.
+
+    Args:
+        items (list): A list of file names, or of any items with a file name.
+        key (function/None): Function takes an item and returns its file name, None if the items are file names.
+
+    Returns:
+        list: The list of groups in the order of their first item, each group is a list of items,
+              latest version first, items with the same version number keep their order.
+
+    """
+
+    groups = {}
+    groups_order = []
+    for item in items:
+        base_name, extension, number = split_version(file_name=item if key is None else key(item))
+        group_key = (base_name, extension)
+
+        group = groups.get(group_key)
+        if group is None:
+            group = groups[group_key] = []
+            groups_order.append(group)
+        group.append((-1 if number is None else number, item))
+
+    # sort each group by itself, the groups are usually a few versions
+    return [
+        [item for _, item in sorted(group, key=lambda version: -version[0])] for group in groups_order
+    ]
+
+
+class UniqueNameRegistry(object):
+    """Registry of the names in use, keeps the highest trailing number in use of each base name,
+       so unique names are created without scanning all the names.
+
+    Gives the same unique names as unique_name, except the names containing the base name after a prefix,
+    example: 'my_wood_v5' for the base name 'wood_v', are not counted as its versions.
+
+    """
+
+    def __init__(self, names=None):
+        """Initial setting for UniqueNameRegistry.
+
+        Args:
+            names (iterable/None): The names in use.
+
+        """
+
+        # name to number of uses
+        self.names = {}
+        # base name to {trailing number: number of uses}, and base name to its highest trailing number
+        self.numbers = {}
+        self.highest_numbers = {}
+
+        for name in names or []:
+            self.add(name)
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def add(self, name):
+        """Register the name in use, a name can be in use more than once.
+
+        Args:
+            name (str): The name.
+
+        """
+
+        self.names[name] = self.names.get(name, 0) + 1
+
+        base_name, number = split_trailing_number(name=name)
+        if number is None:
+            return
+
+        numbers = self.numbers.setdefault(base_name, {})
+        numbers[number] = numbers.get(number, 0) + 1
+        if number > self.highest_numbers.get(base_name, 0):
+            self.highest_numbers[base_name] = number
+
+    def remove(self, name):
+        """Unregister one use of the name.
+
+        Args:
+            name (str): The name.
+
+        """
+
+        count = self.names.get(name)
+        if not count:
+            return
+        if count > 1:
+            self.names[name] = count - 1
+        else:
+            del self.names[name]
+
+        base_name, number = split_trailing_number(name=name)
+        if number is None:
+            return
+
+        numbers = self.numbers[base_name]
+        if numbers[number] > 1:
+            numbers[number] -= 1
+            return
+
+        del numbers[number]
+        if not numbers:
+            del self.numbers[base_name]
+            self.highest_numbers.pop(base_name, None)
+        elif number == self.highest_numbers.get(base_name):
+            # only the numbers of this base name are looked at again
+            self.highest_numbers[base_name] = max(numbers)
+
+    def has_base_name(self, base_name):
+        """Check if the base name, or any name of it with a trailing number, is in use.
+
+        Args:
+            base_name (str): Base name without trailing number, example: 'base_name_v'.
+
+        Returns:
+            bool: True if in use or False if not.
+
+        """
+
+        return base_name in self.names or base_name in self.numbers
+
+    def find_highest_trailing_number(self, base_name):
+        """Return the highest version number of the base name in use.
+
+        Args:
+            base_name (str): Base name of the versioned names, example: 'base_name_v'.
+
+        Returns:
+            int: The highest version number, 0 if there is none.
+
+        """
+
+        base_name, _ = split_trailing_number(name=base_name)
+
+        return self.highest_numbers.get(base_name, 0)
+
+    def unique_name(self, name):
+        """Create unique name, the name is not registered.
+
+        Args:
+            name (str): Name to check if it is unique, if not, rename it.
+
+        Returns:
+            str: Unique name
+
+        """
+
+        # check if name exist, name can be '' empty string in the treeview.
+        if name:
+            base_name, _ = split_trailing_number(name=name)
+            if base_name in self.names:
+                name = '{}{}'.format(base_name, self.find_highest_trailing_number(base_name=base_name) + 1)
+
+        return name
+
+
 def contain_special_characters(str_name):
     """Check a string name has special characters or not
 
@@ -0,0 +1,645 @@
+import os, math, struct
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import OpenImageIO as oiio
+except ImportError:
+    oiio = None
+
+try:
+    import OpenEXR, Imath
+except ImportError:
+    OpenEXR = None
+
+import tiffUtils
+
+
+# file extensions always decoded as high dynamic range images
+HIGH_DYNAMIC_RANGE_EXTENSIONS = ('.exr', '.hdr')
+
+# tiff (sample format, bits) to numpy data type name
+TIFF_DTYPES = {
+    (1, 8): 'u1',
+    (1, 16): 'u2',
+    (1, 32): 'u4',
+    (3, 16): 'f2',
+    (3, 32): 'f4',
+    (3, 64): 'f8'
+}
+
+
+def needs_float_preview(texture_file_path):
+    """Check if the image can't be displayed properly by QPixmap / QImageReader,
+       high dynamic range, floating point or more than 8 bits integer tiff.
+
+    Args:
+        texture_file_path (str): The path of the image file.
+
+    Returns:
+        bool: True if it needs the float preview or False if not.
+
+    """
+
+    if np is None:
+        return False
+
+    if os.path.splitext(texture_file_path)[1].lower() in HIGH_DYNAMIC_RANGE_EXTENSIONS:
+        return True
+
+    if tiffUtils.is_tiff_file(texture_file_path=texture_file_path):
+        ifds = tiffUtils.read_ifds(texture_file_path=texture_file_path)
+        if ifds:
+            return ifds[0]['sample_format'] == 3 or max(ifds[0]['bits_per_sample']) > 8
+
+    return False
+
+
+def read_float_image(texture_file_path, width, height):
+    """Decode the image at reduced resolution, at least as large as the given size when fitting in it.
+
+    Args:
+        texture_file_path (str): The path of the image file.
+        width (int): The width to fit in, usually the preview label width.
+        height (int): The height to fit in, usually the preview label height.
+
+    Returns:
+        tuple/None: (numpy.ndarray float32 array in (rows, columns, channels) shape,
+                     bool True if the values are linear, False if they are display (srgb) encoded),
+                    None if it can't be decoded.
+
+    """
+
+    if np is None:
+        return None
+
+    readers = []
+    if oiio is not None:
+        readers.append(_read_oiio_image)
+
+    extension = os.path.splitext(texture_file_path)[1].lower()
+    if extension == '.hdr':
+        readers.append(_read_radiance_image)
+    elif extension == '.exr' and OpenEXR is not None:
+        readers.append(_read_openexr_image)
+    elif tiffUtils.is_tiff_file(texture_file_path=texture_file_path):
+        readers.append(_read_tiff_image)
+
+    for reader in readers:
+        try:
+            float_image = reader(texture_file_path, width, height)
+        except (IOError, OSError, ValueError, RuntimeError, struct.error):
+            float_image = None
+
+        if float_image is not None:
+            return float_image
+
+    return None
+
+
+def _subsample_step(image_width, image_height, width, height):
+    """Return the integer subsample step which keeps the image at least as large as the given size.
+
+    Args:
+        image_width (int): The image width.
+        image_height (int): The image height.
+        width (int): The width to fit in.
+        height (int): The height to fit in.
+
+    Returns:
+        int: The subsample step, 1 for full resolution.
+
+    """
+
+    return max(1, min(image_width // max(width, 1), image_height // max(height, 1)))
+
+
+def _read_oiio_image(texture_file_path, width, height):
+    """Decode the image with OpenImageIO, from the smallest mip level that is still large enough.
+
+    """
+
+    image_input = oiio.ImageInput.open(texture_file_path)
+    if not image_input:
+        return None
+
+    try:
+        mip_level = 0
+        spec = image_input.spec()
+        while image_input.seek_subimage(0, mip_level + 1):
+            next_spec = image_input.spec()
+            if next_spec.width < width and next_spec.height < height:
+                break
+            mip_level += 1
+            spec = next_spec
+
+        image_input.seek_subimage(0, mip_level)
+        pixels = image_input.read_image(0, mip_level, 0, min(spec.nchannels, 4), oiio.FLOAT)
+    finally:
+        image_input.close()
+
+    if pixels is None:
+        return None
+
+    pixels = pixels.reshape(spec.height, spec.width, -1)
+    step = _subsample_step(spec.width, spec.height, width, height)
+    linear = spec.format.basetype in (oiio.HALF, oiio.FLOAT, oiio.DOUBLE)
+
+    return np.ascontiguousarray(pixels[::step, ::step], dtype=np.float32), linear
+
+
+def _read_openexr_image(texture_file_path, width, height):
+    """Decode the exr image with the OpenEXR module, only reading the subsampled scan lines.
+
+    """
+
+    exr_file = OpenEXR.InputFile(texture_file_path)
+    try:
+        header = exr_file.header()
+        data_window = header['dataWindow']
+        image_width = data_window.max.x - data_window.min.x + 1
+        image_height = data_window.max.y - data_window.min.y + 1
+
+        channels_names = [name for name in 'RGBA' if name in header['channels']]
+        if not channels_names:
+            channels_names = sorted(header['channels'])[:1]
+
+        step = _subsample_step(image_width, image_height, width, height)
+        rows = range(data_window.min.y, data_window.max.y + 1, step)
+        pixel_type = Imath.PixelType(Imath.PixelType.FLOAT)
+
+        pixels = np.empty((len(rows), (image_width + step - 1) // step, len(channels_names)), dtype=np.float32)
+        for i, row in enumerate(rows):
+            for j, channel_name in enumerate(channels_names):
+                row_data = exr_file.channel(channel_name, pixel_type, row, row)
+                pixels[i, :, j] = np.frombuffer(row_data, dtype=np.float32)[::step]
+    finally:
+        exr_file.close()
+
+    return pixels, True
+
+
+def _read_radiance_image(texture_file_path, width, height):
+    """Decode the radiance .hdr (rgbe) image, only expanding the subsampled scan lines.
+
+    """
+
+    with open(texture_file_path, 'rb') as texture_file:
+        data = bytearray(texture_file.read())
+
+    # header ends with an empty line, then the resolution line, example: '-Y 512 +X 1024'
+    header_end = data.find(b'\n\n')
+    if not data.startswith(b'#?') or header_end == -1:
+        return None
+    resolution_end = data.find(b'\n', header_end + 2)
+    resolution = bytes(data[header_end + 2:resolution_end]).split()
+    if len(resolution) != 4 or resolution[0] != b'-Y' or resolution[2] != b'+X':
+        raise ValueError('Unsupported radiance hdr orientation')
+    image_height, image_width = int(resolution[1]), int(resolution[3])
+
+    step = _subsample_step(image_width, image_height, width, height)
+    rgbe = np.empty(((image_height + step - 1) // step, image_width, 4), dtype=np.uint8)
+
+    position = resolution_end + 1
+    for row in range(image_height):
+        decode = row % step == 0
+        row_rgbe = rgbe[row // step] if decode else None
+
+        # new run length encoded scan line starts with 2, 2, width high byte, width low byte
+        if 8 <= image_width < 32768 and data[position] == 2 and data[position + 1] == 2:
+            position += 4
+            for component in range(4):
+                column = 0
+                while column < image_width:
+                    count = data[position]
+                    if count > 128:
+                        count -= 128
+                        if decode:
+                            row_rgbe[column:column + count, component] = data[position + 1]
+                        position += 2
+                    else:
+                        if decode:
+                            row_rgbe[column:column + count, component] = data[position + 1:position + 1 + count]
+                        position += 1 + count
+                    column += count
+
+        # flat scan line
+        else:
+            if decode:
+                row_rgbe[:] = np.frombuffer(
+                    bytes(data[position:position + image_width * 4]), dtype=np.uint8
+                ).reshape(image_width, 4)
+            position += image_width * 4
+
+    rgbe = rgbe[:, ::step]
+    exponent = rgbe[..., 3].astype(np.int32)
+    scale = np.where(exponent > 0, np.ldexp(1.0, exponent - 136), 0.0).astype(np.float32)
+    pixels = (rgbe[..., :3].astype(np.float32) + 0.5) * scale[..., np.newaxis]
+
+    return pixels, True
+
+
+def _read_tiff_image(texture_file_path, width, height):
+    """Decode the tiff image from the smallest large enough mip level, only reading the strips / tiles
+       which hold the subsampled rows.
+
+    """
+
+    levels = tiffUtils.get_mip_levels(texture_file_path=texture_file_path)
+    level = tiffUtils.pick_mip_level(levels=levels, width=width, height=height)
+    if not level:
+        return None
+
+    bits = set(level['bits_per_sample'])
+    dtype_name = TIFF_DTYPES.get((level['sample_format'], max(bits)))
+    if (
+        len(bits) != 1 or dtype_name is None or level['planar_config'] != 1 or
+        level['photometric'] not in (1, 2) or level['predictor'] not in (1, 2, 3)
+    ):
+        return None
+
+    dtype = np.dtype(dtype_name).newbyteorder(level['byte_order'])
+    samples_per_pixel = level['samples_per_pixel']
+    level_width, level_height = level['width'], level['height']
+
+    if level['tiled']:
+        chunk_width, chunk_height = level['tile_width'], level['tile_height']
+    else:
+        chunk_width, chunk_height = level_width, min(level['rows_per_strip'], level_height)
+    chunks_across = (level_width + chunk_width - 1) // chunk_width
+
+    step = _subsample_step(level_width, level_height, width, height)
+    pixels = np.empty(
+        ((level_height + step - 1) // step, (level_width + step - 1) // step, samples_per_pixel), dtype=np.float32
+    )
+
+    for chunk_row in range((level_height + chunk_height - 1) // chunk_height):
+        row_start = chunk_row * chunk_height
+        rows_count = min(chunk_height, level_height - row_start)
+        # the first subsampled row inside this chunk row, skip the chunk row if there is none.
+        first_row = -row_start % step
+        if first_row >= rows_count:
+            continue
+
+        for chunk_column in range(chunks_across):
+            column_start = chunk_column * chunk_width
+            columns_count = min(chunk_width, level_width - column_start)
+            first_column = -column_start % step
+            if first_column >= columns_count:
+                continue
+
+            data = tiffUtils.read_chunk_data(
+                texture_file_path=texture_file_path, level=level, chunk_index=chunk_row * chunks_across + chunk_column
+            )
+            # strips are not padded, tiles are
+            block_rows = chunk_height if level['tiled'] else rows_count
+            block = _undo_predictor(
+                data=data,
+                rows=block_rows,
+                columns=chunk_width,
+                samples_per_pixel=samples_per_pixel,
+                dtype=dtype,
+                predictor=level['predictor']
+            )
+
+            block = block[first_row:rows_count:step, first_column:columns_count:step]
+            row_index, column_index = (row_start + first_row) // step, (column_start + first_column) // step
+            pixels[row_index:row_index + block.shape[0], column_index:column_index + block.shape[1]] = block
+
+    # integer samples are normalized, and usually display encoded.
+    if level['sample_format'] == 1:
+        pixels /= float(2 ** max(bits) - 1)
+        return pixels, False
+
+    return pixels, True
+
+
+def _undo_predictor(data, rows, columns, samples_per_pixel, dtype, predictor):
+    """Convert a decompressed strip / tile into a samples array, undoing the tiff predictor.
+
+    Args:
+        data (str/bytearray): The decompressed strip / tile data.
+        rows (int): The strip / tile rows count.
+        columns (int): The strip / tile columns count.
+        samples_per_pixel (int): Samples per pixel.
+        dtype (numpy.dtype): The sample data type with byte order.
+        predictor (int): 1 none, 2 horizontal differencing, 3 floating point.
+
+    Returns:
+        numpy.ndarray: The samples array in (rows, columns, samples per pixel) shape.
+
+    """
+
+    row_samples = columns * samples_per_pixel
+    size = rows * row_samples * dtype.itemsize
+    raw = np.frombuffer(bytes(data[:size]), dtype=np.uint8)
+    # some writers cut the trailing zero bytes
+    if raw.size < size:
+        raw = np.concatenate([raw, np.zeros(size - raw.size, dtype=np.uint8)])
+
+    if predictor == 3:
+        # bytes of each row are shuffled into byte planes (most significant first),
+        # then byte differenced with samples per pixel stride.
+        raw = np.cumsum(raw.reshape(rows, -1, samples_per_pixel), axis=1, dtype=np.uint8)
+        raw = raw.reshape(rows, dtype.itemsize, row_samples).transpose(0, 2, 1)
+        samples = np.ascontiguousarray(raw).view(dtype.newbyteorder('>'))
+        return samples.reshape(rows, columns, samples_per_pixel)
+
+    samples = raw.view(dtype).reshape(rows, columns, samples_per_pixel)
+    if predictor == 2:
+        samples = np.cumsum(samples, axis=1, dtype=samples.dtype)
+
+    return samples
+
+
+def linear_to_srgb(values):
+    """Vectorized linear to srgb transfer function.
+
+    Args:
+        values (numpy.ndarray): Linear values.
+
+    Returns:
+        numpy.ndarray: Srgb encoded values.
+
+    """
+
+    values = np.maximum(values, 0.0)
+
+    return np.where(values <= 0.0031308, values * 12.92, 1.055 * np.power(values, 1.0 / 2.4) - 0.055)
+
+
+def srgb_to_linear(values):
+    """Vectorized srgb to linear transfer function.
+
+    Args:
+        values (numpy.ndarray): Srgb encoded values.
+
+    Returns:
+        numpy.ndarray: Linear values.
+
+    """
+
+    values = np.maximum(values, 0.0)
+
+    return np.where(values <= 0.04045, values / 12.92, np.power((values + 0.055) / 1.055, 2.4))
+
+
+def tone_map(pixels, linear, exposure=0.0, gamma=1.0):
+    """Tone map the float pixels into 8 bits display pixels, in whole array operations.
+
+    Args:
+        pixels (numpy.ndarray): Float pixels in (rows, columns, channels) shape, 1 / 2 / 3 / 4 channels.
+        linear (bool): True if the pixels are linear, encode to srgb for display.
+        exposure (float): Exposure in stops, applied in linear space.
+        gamma (float): Extra display gamma.
+
+    Returns:
+        numpy.ndarray: Contiguous uint8 pixels in (rows, columns, 3 / 4) shape, rgb or rgba.
+
+    """
+
+    channels_count = pixels.shape[2]
+    # nan / inf would turn into garbage when casting to 8 bits
+    pixels = np.where(np.isfinite(pixels), pixels, 0.0)
+    # gray (+ alpha) to rgb (+ alpha)
+    if channels_count < 3:
+        color = np.repeat(pixels[..., :1], 3, axis=2)
+        alpha = pixels[..., 1:2] if channels_count == 2 else None
+    else:
+        color = pixels[..., :3]
+        alpha = pixels[..., 3:4] if channels_count == 4 else None
+
+    if exposure:
+        if not linear:
+            color = srgb_to_linear(color)
+        color = color * math.pow(2.0, exposure)
+        color = linear_to_srgb(color)
+    elif linear:
+        color = linear_to_srgb(color)
+
+    if gamma != 1.0:
+        color = np.power(np.maximum(color, 0.0), 1.0 / gamma)
+
+    if alpha is not None:
+        color = np.concatenate([color, alpha], axis=2)
+
+    return np.ascontiguousarray(np.clip(color * 255.0 + 0.5, 0, 255).astype(np.uint8))
+
+
+def resize_nearest(pixels, rows, columns):
+    """Resize pixels to the exact size with nearest neighbour sampling, by fancy indexing.
+
+    Args:
+        pixels (numpy.ndarray): Pixels in (rows, columns, channels) shape.
+        rows (int): The new rows count.
+        columns (int): The new columns count.
+
+    Returns:
+        numpy.ndarray: The resized pixels.
+
+    """
+
+    if pixels.shape[:2] == (rows, columns):
+        return pixels
+
+    rows_indexes = (np.arange(rows) * pixels.shape[0] // rows)[:, np.newaxis]
+    columns_indexes = np.arange(columns) * pixels.shape[1] // columns
+
+    return pixels[rows_indexes, columns_indexes]
+
+
+def compare_images(pixels_a, pixels_b):
+    """Compare two same shape images, per channel error statistics computed with whole array reductions.
+
+    Args:
+        pixels_a (numpy.ndarray): Float pixels in [0, 1], in (rows, columns, channels) shape.
+        pixels_b (numpy.ndarray): Float pixels in [0, 1], same shape as pixels_a.
+
+    Returns:
+        dict: {
+              'difference': numpy.ndarray, absolute difference pixels,
+              'mean': numpy.ndarray, per channel mean absolute error,
+              'max': numpy.ndarray, per channel max absolute error,
+              'psnr': numpy.ndarray, per channel peak signal to noise ratio in dB, inf if identical
+              }
+
+    """
+
+    difference = pixels_a - pixels_b
+    absolute_difference = np.abs(difference)
+    mean_squared_error = np.mean(difference * difference, axis=(0, 1))
+
+    with np.errstate(divide='ignore'):
+        psnr = np.where(mean_squared_error > 0, -10.0 * np.log10(mean_squared_error), np.inf)
+
+    return {
+        'difference': absolute_difference,
+        'mean': np.mean(absolute_difference, axis=(0, 1)),
+        'max': np.max(absolute_difference, axis=(0, 1)),
+        'psnr': psnr
+    }
+
+
+def split_wipe(pixels_a, pixels_b, position, line_value=1.0):
+    """Composite two same shape images side by side, pixels_a on the left of position, pixels_b on the right.
+
+    Args:
+        pixels_a (numpy.ndarray): Pixels in (rows, columns, channels) shape.
+        pixels_b (numpy.ndarray): Pixels, same shape as pixels_a.
+        position (float): The wipe position in [0, 1] of the width.
+        line_value (float): The value of the 1 pixel wipe line.
+
+    Returns:
+        numpy.ndarray: The composited pixels.
+
+    """
+
+    columns = pixels_a.shape[1]
+    split_column = int(round(min(max(position, 0.0), 1.0) * columns))
+
+    composite = pixels_b.copy()
+    composite[:, :split_column] = pixels_a[:, :split_column]
+    if 0 < split_column < columns:
+        composite[:, split_column] = line_value
+
+    return composite
+
+
+def read_image_header(texture_file_path):
+    """Read the resolution and bit depth from the image file header without decoding any pixel.
+
+    Args:
+        texture_file_path (str): The path of the image file.
+
+    Returns:
+        tuple: (width, height, bits per channel), (0, 0, 0) if the format is unknown or the header is broken.
+
+    """
+
+    try:
+        with open(texture_file_path, 'rb') as texture_file:
+            header = texture_file.read(8)
+
+            if header.startswith(b'\x89PNG'):
+                return _read_png_header(texture_file=texture_file)
+
+            if header.startswith(b'\xff\xd8'):
+                return _read_jpeg_header(texture_file=texture_file)
+
+            if header.startswith(b'\x76\x2f\x31\x01'):
+                return _read_exr_header(texture_file=texture_file)
+
+            if header.startswith(b'#?'):
+                return _read_radiance_header(texture_file=texture_file)
+
+        if header[:2] in (b'II', b'MM'):
+            ifds = tiffUtils.read_ifds(texture_file_path=texture_file_path)
+            if ifds:
+                return ifds[0]['width'], ifds[0]['height'], max(ifds[0]['bits_per_sample'])
+
+    except (IOError, OSError, struct.error, ValueError, IndexError):
+        pass
+
+    return 0, 0, 0
+
+
+def _read_png_header(texture_file):
+    """Read the png IHDR chunk, it is always the first chunk.
+
+    """
+
+    chunk = texture_file.read(17)
+    if chunk[4:8] != b'IHDR':
+        return 0, 0, 0
+
+    width, height, bit_depth = struct.unpack('>IIB', chunk[8:17])
+
+    return width, height, bit_depth
+
+
+def _read_jpeg_header(texture_file):
+    """Walk the jpeg markers until the start of frame marker.
+
+    """
+
+    # SOF markers, except DHT (C4), JPG (C8) and DAC (CC) which share the range
+    start_of_frame_markers = set(range(0xc0, 0xd0)) - {0xc4, 0xc8, 0xcc}
+
+    texture_file.seek(2)
+    while True:
+        marker = texture_file.read(2)
+        if len(marker) != 2 or bytearray(marker)[0] != 0xff:
+            return 0, 0, 0
+        marker_type = bytearray(marker)[1]
+
+        # fill bytes before a marker
+        if marker_type == 0xff:
+            texture_file.seek(-1, 1)
+            continue
+
+        length = struct.unpack('>H', texture_file.read(2))[0]
+        if marker_type in start_of_frame_markers:
+            precision, height, width = struct.unpack('>BHH', texture_file.read(5))
+            return width, height, precision
+
+        texture_file.seek(length - 2, 1)
+
+
+def _read_exr_header(texture_file):
+    """Walk the exr header attributes for the data window and the channels pixel type.
+
+    """
+
+    # half, float, uint pixel types bits
+    pixel_type_bits = {0: 32, 1: 16, 2: 32}
+
+    width = height = bit_depth = 0
+    header = texture_file.read(65536)
+    position = 0
+    while position < len(header):
+        name_end = header.index(b'\x00', position)
+        name = header[position:name_end]
+        # attributes end with an empty name
+        if not name:
+            break
+        type_end = header.index(b'\x00', name_end + 1)
+        size = struct.unpack('<i', header[type_end + 1:type_end + 5])[0]
+        value = header[type_end + 5:type_end + 5 + size]
+        position = type_end + 5 + size
+
+        if name == b'dataWindow':
+            x_min, y_min, x_max, y_max = struct.unpack('<iiii', value)
+            width, height = x_max - x_min + 1, y_max - y_min + 1
+        elif name == b'channels':
+            # channel name, pixel type int, pLinear, 3 reserved bytes, x and y sampling ints
+            channel_position = 0
+            while channel_position < len(value) and value[channel_position:channel_position + 1] != b'\x00':
+                channel_name_end = value.index(b'\x00', channel_position)
+                pixel_type = struct.unpack('<i', value[channel_name_end + 1:channel_name_end + 5])[0]
+                bit_depth = max(bit_depth, pixel_type_bits.get(pixel_type, 0))
+                channel_position = channel_name_end + 17
+
+    return width, height, bit_depth
+
+
+def _read_radiance_header(texture_file):
+    """Read the radiance .hdr resolution line after the header, rgbe pixels are 32 bits float.
+
+    """
+
+    header = texture_file.read(65536)
+    header_end = header.find(b'\n\n')
+    if header_end == -1:
+        return 0, 0, 0
+    resolution = header[header_end + 2:header.find(b'\n', header_end + 2)].split()
+    if len(resolution) != 4:
+        return 0, 0, 0
+
+    # either '-Y height +X width' or rotated '+X width -Y height'
+    if resolution[0][1:] == b'Y':
+        return int(resolution[3]), int(resolution[1]), 32
+
+    return int(resolution[1]), int(resolution[3]), 32
@@ -0,0 +1,330 @@
+import array, collections, fnmatch, heapq, re
+
+
+# filter modes for the tree views filter fields
+FILTER_MODES = ('Substring', 'Glob', 'Fuzzy')
+# glob wild cards, a glob query without any of them matches as sub string
+GLOB_CHARACTERS = ('*', '?', '[')
+# ranked search stops counting trigrams postings once this many entries ids are counted
+POSTINGS_BUDGET = 20000
+
+
+def create_matcher(query, mode):
+    """Create the match function of the query, names are matched case-insensitively.
+
+    Args:
+        query (str): Lower case query.
+        mode (str): One of FILTER_MODES.
+                    'Substring', the query is anywhere in the name.
+                    'Glob', shell style wild cards '*', '?', '[...]', the whole name is matched.
+                    'Fuzzy', the query characters are in the name in order, not necessarily next to each other.
+
+    Returns:
+        function: Match function takes a lower case name, names of multiple columns are '\n' joined,
+                  returns True if it matches or False if not.
+
+    """
+
+    if mode == 'Glob' and any(character in query for character in GLOB_CHARACTERS):
+        pattern = re.compile(fnmatch.translate(query))
+        # match each column separately, '*' would match across columns otherwise
+        return lambda name: any(pattern.match(column) for column in name.split('\n'))
+
+    if mode == 'Fuzzy':
+        pattern = re.compile('[^\n]*?'.join(re.escape(character) for character in query))
+        return lambda name: pattern.search(name) is not None
+
+    return lambda name: query in name
+
+
+def is_narrowing(previous_query, query, mode):
+    """Check if the matches of the query are always a sub set of the matches of the previous query,
+       so only the previous matches need to be matched again.
+
+    Args:
+        previous_query (str): Lower case previous query.
+        query (str): Lower case query.
+        mode (str): One of FILTER_MODES.
+
+    Returns:
+        bool: True if the query narrows the previous query or False if not.
+
+    """
+
+    if not previous_query:
+        return False
+
+    if mode == 'Fuzzy':
+        # the previous query characters in order in the query
+        characters = iter(query)
+        return all(character in characters for character in previous_query)
+
+    if mode == 'Glob' and any(character in query + previous_query for character in GLOB_CHARACTERS):
+        return False
+
+    return previous_query in query
+
+
+def get_trigrams(name, padded=False):
+    """Return the set of three characters sub strings of the name.
+
+    Args:
+        name (str): Lower case name.
+        padded (bool): Pad the name with '\x00' so names shorter than 3 characters, the start and the end of the name
+                       have trigrams too.
+
+    Returns:
+        set: The trigrams.
+
+    """
+
+    if padded:
+        name = '\x00\x00{}\x00'.format(name)
+
+    return set(name[i:i + 3] for i in range(len(name) - 2))
+
+
+class NameIndex(object):
+    """In memory name index, exact lookup by key, sub string and ranked fuzzy search by trigrams postings.
+
+    Removed entries ids are reused by the next added entries. Trigrams postings are array backed, built on the first
+    ranked search and kept up to date after, postings of removed / renamed entries are dropped when most of the
+    postings are out of date, the matches are always checked against the current names.
+
+    """
+
+    def __init__(self):
+        """Initial setting for NameIndex.
+
+        """
+
+        # entry id to exact key, lower case searchable name, None if removed
+        self.keys = []
+        self.names = []
+        # exact key to entries ids
+        self.key_ids = {}
+        # removed entries ids, reused by the next added entries
+        self.free_ids = []
+        # trigram to array of entries ids, None until the first ranked search
+        self.postings = None
+        self.count = 0
+        self.stale_count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, key, name=None):
+        """Add an entry.
+
+        Args:
+            key (str): The exact lookup key, example: display name.
+            name (str/None): The searchable name, None to search the key.
+
+        Returns:
+            int: The entry id.
+
+        """
+
+        name = (key if name is None else name).lower()
+
+        if self.free_ids:
+            entry_id = self.free_ids.pop()
+            self.keys[entry_id] = key
+            self.names[entry_id] = name
+        else:
+            entry_id = len(self.keys)
+            self.keys.append(key)
+            self.names.append(name)
+        self.key_ids.setdefault(key, []).append(entry_id)
+        self.count += 1
+
+        if self.postings is not None:
+            self._add_postings(entry_id=entry_id, name=name)
+
+        return entry_id
+
+    def remove(self, entry_id):
+        """Remove the entry.
+
+        Args:
+            entry_id (int): The entry id.
+
+        """
+
+        if self.names[entry_id] is None:
+            return
+
+        key = self.keys[entry_id]
+        key_ids = self.key_ids[key]
+        key_ids.remove(entry_id)
+        if not key_ids:
+            del self.key_ids[key]
+
+        self.keys[entry_id] = None
+        self.names[entry_id] = None
+        self.free_ids.append(entry_id)
+        self.count -= 1
+        self._add_stale()
+
+    def rename(self, entry_id, key, name=None):
+        """Change the key and the searchable name of the entry, the entry id is kept.
+
+        Args:
+            entry_id (int): The entry id.
+            key (str): The exact lookup key.
+            name (str/None): The searchable name, None to search the key.
+
+        """
+
+        name = (key if name is None else name).lower()
+
+        if self.keys[entry_id] != key:
+            key_ids = self.key_ids[self.keys[entry_id]]
+            key_ids.remove(entry_id)
+            if not key_ids:
+                del self.key_ids[self.keys[entry_id]]
+            self.keys[entry_id] = key
+            self.key_ids.setdefault(key, []).append(entry_id)
+
+        if self.names[entry_id] != name:
+            self.names[entry_id] = name
+            if self.postings is not None:
+                # the previous name postings are out of date, matches are always checked against the current name
+                self._add_postings(entry_id=entry_id, name=name)
+                self._add_stale()
+
+    def find(self, key):
+        """Return the entries ids with the exact key.
+
+        Args:
+            key (str): The exact key.
+
+        Returns:
+            list: The entries ids in adding order.
+
+        """
+
+        return list(self.key_ids.get(key, ()))
+
+    def search_substring(self, query, candidates=None):
+        """Return the entries whose names contain the query,
+           only the entries in the shortest postings of the query trigrams are checked once the postings are built.
+
+        Args:
+            query (str): Lower case query.
+            candidates (iterable/None): Only search these entries ids, example: the matches of a shorter query.
+
+        Returns:
+            list: The matched entries ids, sorted.
+
+        """
+
+        names = self.names
+        grams = get_trigrams(query)
+
+        if grams and self.postings is not None:
+            # the shortest postings is the smallest super set of the matches
+            pool = min((self.postings.get(gram, ()) for gram in grams), key=len)
+            if candidates is not None:
+                candidates = candidates if isinstance(candidates, (set, frozenset)) else set(candidates)
+                if len(candidates) < len(pool):
+                    pool = candidates
+                else:
+                    pool = [entry_id for entry_id in pool if entry_id in candidates]
+            # renamed entries may be in a postings twice
+            pool = set(pool)
+        elif candidates is not None:
+            pool = candidates
+        else:
+            pool = range(len(names))
+
+        return sorted(entry_id for entry_id in pool if names[entry_id] is not None and query in names[entry_id])
+
+    def search(self, query, limit=20):
+        """Ranked fuzzy search, by the trigrams shared with the query, then sub string and in order characters.
+           Tolerates typos and swapped characters the sub string search would miss.
+
+        Args:
+            query (str): Lower case query.
+            limit (int): The maximum number of results.
+
+        Returns:
+            list: The best matched entries ids, best first.
+
+        """
+
+        if not query:
+            return []
+
+        self.build_postings()
+        names = self.names
+        grams = get_trigrams(query, padded=True)
+
+        # count the shared trigrams from the rarest, the common trigrams add little but cost the most
+        hits = collections.Counter()
+        counted = 0
+        for posting in sorted((self.postings.get(gram, ()) for gram in grams), key=len):
+            if counted and counted + len(posting) > POSTINGS_BUDGET:
+                break
+            hits.update(posting)
+            counted += len(posting)
+
+        # score the candidates with their exact shared trigrams
+        subsequence = re.compile('.*?'.join(re.escape(character) for character in query), re.DOTALL)
+        scored = []
+        # only score the entries sharing most trigrams, counting only the rarest postings may under count the hits
+        best_hit = max(hits.values()) if hits else 0
+        candidates = [entry_id for entry_id, hit in hits.items() if hit * 2 >= best_hit]
+        if len(candidates) > limit * 10:
+            candidates = heapq.nlargest(limit * 10, candidates, key=hits.get)
+
+        for entry_id in candidates:
+            name = names[entry_id]
+            if name is None:
+                continue
+            name_grams = get_trigrams(name, padded=True)
+            shared = len(grams & name_grams)
+            score = float(shared) / (len(grams) + len(name_grams) - shared)
+            if query in name:
+                score += 1.0
+            elif subsequence.search(name):
+                score += 0.5
+            scored.append((score, -len(name), -entry_id, entry_id))
+
+        return [entry_id for _, _, _, entry_id in heapq.nlargest(limit, scored)]
+
+    def build_postings(self):
+        """Build the trigrams postings of all the entries if they are not built, or dropped as most of them were
+           out of date.
+
+        """
+
+        if self.postings is not None:
+            return
+
+        self.postings = {}
+        self.stale_count = 0
+        for entry_id, name in enumerate(self.names):
+            if name is not None:
+                self._add_postings(entry_id=entry_id, name=name)
+
+    def _add_postings(self, entry_id, name):
+        """Append the entry id to the postings of the name trigrams.
+
+        """
+
+        postings = self.postings
+        for gram in get_trigrams(name, padded=True):
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = array.array('i')
+            posting.append(entry_id)
+
+    def _add_stale(self):
+        """Count an out of date entry in the postings, drop the postings to rebuild when most of them are.
+
+        """
+
+        self.stale_count += 1
+        if self.postings is not None and self.stale_count > max(self.count, 1024):
+            self.postings = None
@@ -0,0 +1,455 @@
+import os, sqlite3
+from collections import deque
+
+from maya import cmds
+
+import fileManage, imageUtils, nameSearch
+
+
+# catalog records fields, records are tuples in this order
+CATALOG_FIELDS = ('path', 'folder', 'name', 'stem', 'extension', 'size', 'mtime', 'width', 'height', 'bit_depth')
+
+CATALOG_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS roots (
+    path TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS folders (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    parent TEXT NOT NULL,
+    mtime REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS folders_root ON folders (root);
+CREATE INDEX IF NOT EXISTS folders_parent ON folders (parent);
+CREATE TABLE IF NOT EXISTS textures (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    stem TEXT NOT NULL COLLATE NOCASE,
+    extension TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    bit_depth INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS textures_root ON textures (root, path);
+CREATE INDEX IF NOT EXISTS textures_folder ON textures (folder);
+CREATE INDEX IF NOT EXISTS textures_stem ON textures (stem COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS textures_resolution ON textures (width, height);
+CREATE TABLE IF NOT EXISTS trigram_positions (
+    position INTEGER PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS stem_trigrams (
+    trigram TEXT NOT NULL,
+    texture INTEGER NOT NULL,
+    PRIMARY KEY (trigram, texture)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS textures_trigrams_insert AFTER INSERT ON textures BEGIN
+    INSERT OR IGNORE INTO stem_trigrams (trigram, texture)
+    SELECT lower(substr(new.stem, position, 3)), new.rowid FROM trigram_positions
+    WHERE position <= length(new.stem) - 2;
+END;
+CREATE TRIGGER IF NOT EXISTS textures_trigrams_delete AFTER DELETE ON textures BEGIN
+    DELETE FROM stem_trigrams WHERE texture = old.rowid AND trigram IN (
+        SELECT lower(substr(old.stem, position, 3)) FROM trigram_positions WHERE position <= length(old.stem) - 2
+    );
+END;
+'''
+# catalog schema version, the trigrams of the textures catalogued by an older version are added when opened
+CATALOG_VERSION = 1
+# file names are at most 255 characters on most file systems
+TRIGRAM_POSITIONS = 256
+# trigrams held by this many textures are common, name queries stop counting them there
+TRIGRAM_PROBE_LIMIT = 5000
+# rows scanned in path order first when every trigram of the name is common
+DENSE_SCAN_ROWS = 20000
+
+
+def default_catalog_path():
+    """Return the catalog database path in the maya user app directory, shared by all the projects.
+
+    Returns:
+        str: The catalog database file path.
+
+    """
+
+    return '{}textureManageTool/textureCatalog.db'.format(cmds.internalVar(userAppDir=True))
+
+
+class TextureCatalog(object):
+    """SQLite catalog of the texture files under the library roots, with their resolution and bit depth.
+
+    A connection can only be used by the thread created it, every thread opens its own catalog on the same file.
+
+    """
+
+    def __init__(self, catalog_path):
+        """Initial setting for TextureCatalog, create the database if not exists.
+
+        Args:
+            catalog_path (str): The catalog database file path, ':memory:' for a temporary catalog.
+
+        """
+
+        catalog_folder = os.path.dirname(catalog_path)
+        if catalog_folder and not os.path.isdir(catalog_folder):
+            os.makedirs(catalog_folder)
+
+        self.catalog_path = catalog_path
+        self.connection = sqlite3.connect(catalog_path, timeout=30)
+        # write ahead log, the ui thread can query while the scan thread is writing
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        # the rows replaced by INSERT OR REPLACE fire the delete trigger too, so their trigrams are dropped
+        self.connection.execute('PRAGMA recursive_triggers=ON')
+        self.connection.executescript(CATALOG_SCHEMA)
+        self.connection.commit()
+
+        if self.connection.execute('PRAGMA user_version').fetchone()[0] < CATALOG_VERSION:
+            with self.connection:
+                self.connection.executemany(
+                    'INSERT OR IGNORE INTO trigram_positions (position) VALUES (?)',
+                    [(position,) for position in range(1, TRIGRAM_POSITIONS + 1)]
+                )
+                self.connection.execute(
+                    'INSERT OR IGNORE INTO stem_trigrams (trigram, texture) '
+                    'SELECT lower(substr(stem, position, 3)), textures.rowid FROM textures, trigram_positions '
+                    'WHERE position <= length(stem) - 2'
+                )
+                self.connection.execute('PRAGMA user_version = {}'.format(CATALOG_VERSION))
+
+    def close(self):
+        """Close the database connection.
+
+        """
+
+        self.connection.close()
+
+    def get_roots(self):
+        """Return the library roots in the catalog.
+
+        Returns:
+            list: The library root paths.
+
+        """
+
+        return [row[0] for row in self.connection.execute('SELECT path FROM roots ORDER BY path')]
+
+    def has_root(self, root):
+        """Check if the library root is in the catalog, so it can be queried before scanning.
+
+        Args:
+            root (str): The library root path.
+
+        Returns:
+            bool: True if the root is in the catalog or False if not.
+
+        """
+
+        return self.connection.execute('SELECT 1 FROM roots WHERE path = ?', (root,)).fetchone() is not None
+
+    def remove_root(self, root):
+        """Remove the library root and all its folders and textures from the catalog.
+
+        Args:
+            root (str): The library root path.
+
+        """
+
+        with self.connection:
+            self.connection.execute('DELETE FROM textures WHERE root = ?', (root,))
+            self.connection.execute('DELETE FROM folders WHERE root = ?', (root,))
+            self.connection.execute('DELETE FROM roots WHERE path = ?', (root,))
+
+    def get_folders(self, parent):
+        """Return the sub folders of the folder in the catalog, walked by the last update.
+
+        Args:
+            parent (str): The parent folder path.
+
+        Returns:
+            list: The sub folder paths, ordered by path.
+
+        """
+
+        return [
+            row[0] for row in
+            self.connection.execute('SELECT path FROM folders WHERE parent = ? ORDER BY path', (parent,))
+        ]
+
+    def count(self, root):
+        """Return the number of textures under the library root.
+
+        Args:
+            root (str): The library root path.
+
+        Returns:
+            int: The number of textures.
+
+        """
+
+        return self.connection.execute('SELECT count(*) FROM textures WHERE root = ?', (root,)).fetchone()[0]
+
+    def query(self, root=None, folder=None, name='', min_width=0, min_height=0, min_bit_depth=0, extensions=None,
+              limit=None):
+        """Return the textures records matching all the given filters, ordered by path.
+           Names are matched among the textures holding the rarest trigram of the name, instead of the whole table.
+
+        Args:
+            root (str/None): The library root path, None for all the roots.
+            folder (str/None): Only the textures directly in this folder, None for all the folders.
+            name (str): Case-insensitive sub string of the file name without extension, '' for all the names.
+            min_width (int): The minimum width in pixels.
+            min_height (int): The minimum height in pixels.
+            min_bit_depth (int): The minimum bits per channel.
+            extensions (set/None): Lower case file extensions, example: {'.jpg', '.png'}, None for all the files.
+            limit (int/None): The maximum number of records, None for no limit.
+
+        Returns:
+            list: The list of records tuples in CATALOG_FIELDS order.
+
+        """
+
+        conditions = []
+        parameters = []
+
+        if root is not None:
+            conditions.append('root = ?')
+            parameters.append(root)
+        if folder is not None:
+            conditions.append('folder = ?')
+            parameters.append(folder)
+        if min_width:
+            conditions.append('width >= ?')
+            parameters.append(min_width)
+        if min_height:
+            conditions.append('height >= ?')
+            parameters.append(min_height)
+        if min_bit_depth:
+            conditions.append('bit_depth >= ?')
+            parameters.append(min_bit_depth)
+        if extensions is not None:
+            conditions.append('extension IN ({})'.format(', '.join('?' * len(extensions))))
+            parameters.extend(sorted(extensions))
+
+        fields = ', '.join(CATALOG_FIELDS)
+        limit_sql = ' LIMIT ?' if limit is not None else ''
+        limit_parameters = [limit] if limit is not None else []
+
+        if not name:
+            sql = 'SELECT {} FROM textures{} ORDER BY path{}'.format(fields, self._where(conditions), limit_sql)
+            return self.connection.execute(sql, parameters + limit_parameters).fetchall()
+
+        # stem is NOCASE, escape the LIKE wild cards in the name
+        name_pattern = '%{}%'.format(name.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_'))
+        name_condition = "stem LIKE ? ESCAPE '\\'"
+
+        trigram, count = self._pick_trigram(name=name)
+        if trigram is None:
+            sql = 'SELECT {} FROM textures{} ORDER BY path{}'.format(
+                fields, self._where(conditions + [name_condition]), limit_sql
+            )
+            return self.connection.execute(sql, parameters + [name_pattern] + limit_parameters).fetchall()
+
+        if limit is not None and count >= TRIGRAM_PROBE_LIMIT:
+            # every trigram is common so the matches are likely dense, the first rows in path order may hold enough
+            # matches, the scan stops at the limit. The first matches up to the bound path are the first matches.
+            bound_conditions = conditions[:1] if root is not None else []
+            bound_row = self.connection.execute(
+                'SELECT path FROM textures{} ORDER BY path LIMIT 1 OFFSET ?'.format(self._where(bound_conditions)),
+                parameters[:len(bound_conditions)] + [DENSE_SCAN_ROWS]
+            ).fetchone()
+            sql = 'SELECT {} FROM textures{} ORDER BY path{}'.format(
+                fields, self._where(conditions + [name_condition] + (['path <= ?'] if bound_row else [])), limit_sql
+            )
+            records = self.connection.execute(
+                sql, parameters + [name_pattern] + list(bound_row or []) + limit_parameters
+            ).fetchall()
+            if len(records) == limit or not bound_row:
+                return records
+
+        # CROSS JOIN keeps the trigram textures as the outer loop, instead of scanning textures in path order
+        sql = (
+            'SELECT {} FROM stem_trigrams CROSS JOIN textures ON textures.rowid = stem_trigrams.texture{} '
+            'ORDER BY path{}'
+        ).format(fields, self._where(['trigram = ?'] + conditions + [name_condition]), limit_sql)
+
+        return self.connection.execute(sql, [trigram] + parameters + [name_pattern] + limit_parameters).fetchall()
+
+    @staticmethod
+    def _where(conditions):
+        """Return the WHERE clause of the conditions joined by AND, '' if no conditions.
+
+        """
+
+        return ' WHERE ' + ' AND '.join(conditions) if conditions else ''
+
+    def _pick_trigram(self, name):
+        """Pick the trigram of the name held by the fewest textures.
+           Trigrams are counted up to the fewest count found so far, common trigrams are not counted through.
+
+        Args:
+            name (str): The name sub string.
+
+        Returns:
+            tuple: (the rarest trigram, the number of textures holding it, at most TRIGRAM_PROBE_LIMIT)
+                   (None, 0) if the name is shorter than 3 characters or not ascii, sqlite lower() only folds ascii.
+
+        """
+
+        if any(ord(character) > 127 for character in name):
+            return None, 0
+
+        picked_trigram, picked_count = None, TRIGRAM_PROBE_LIMIT
+        for trigram in sorted(nameSearch.get_trigrams(name=name.lower())):
+            count = self.connection.execute(
+                'SELECT count(*) FROM (SELECT 1 FROM stem_trigrams WHERE trigram = ? LIMIT ?)', (trigram, picked_count)
+            ).fetchone()[0]
+            if picked_trigram is None or count < picked_count:
+                picked_trigram, picked_count = trigram, count
+
+        return picked_trigram, picked_count
+
+    def update(self, root, extensions=None, cancel_event=None, batch_size=500, folders=None):
+        """Rescan the library root incrementally, only the folders whose modified time changed are listed,
+           the unchanged folders are walked down from the catalog without touching their files.
+           Headers are only read for the new and modified files.
+
+        Args:
+            root (str): The library root path, '/' separated.
+            extensions (set/None): Lower case file extensions, example: {'.jpg', '.png'}, None for all the files.
+            cancel_event (threading.Event/None): Stop updating once it is set, the records added so far are kept,
+                                                 a folder stopped in the middle is listed again on the next update.
+            batch_size (int): Commit and yield the changes once there are this many, also in the middle of a folder.
+            folders (list/None): Only rescan these folders under the root and their sub folders,
+                                 these folders are listed even if their modified time is unchanged,
+                                 so files modified in place are found. None for the whole root.
+
+        Yields:
+            tuple: (changed records list, new or modified textures in CATALOG_FIELDS order,
+                    removed paths list, textures no longer on the disk)
+
+        """
+
+        with self.connection:
+            self.connection.execute('INSERT OR IGNORE INTO roots (path) VALUES (?)', (root,))
+
+        known_folders = dict(self.connection.execute('SELECT path, mtime FROM folders WHERE root = ?', (root,)))
+        start_folders = folders or [root]
+        forced_folders = set(folders or [])
+        walked_folders = set()
+        folders = deque((folder, folder.rpartition('/')[0] if folder != root else '') for folder in start_folders)
+        changed_records = []
+        removed_paths = []
+
+        while folders:
+            if cancel_event is not None and cancel_event.is_set():
+                self.connection.commit()
+                return
+
+            folder, parent = folders.popleft()
+            walked_folders.add(folder)
+
+            try:
+                folder_mtime = os.stat(folder).st_mtime
+            except OSError:
+                walked_folders.discard(folder)
+                continue
+
+            # files are added, removed or renamed in this folder only if its modified time changed
+            if folder not in forced_folders and known_folders.get(folder) == folder_mtime:
+                folders.extend(
+                    (row[0], folder) for row in
+                    self.connection.execute('SELECT path FROM folders WHERE parent = ?', (folder,))
+                )
+                continue
+
+            known_files = dict(
+                (row[0], (row[1], row[2])) for row in
+                self.connection.execute('SELECT path, size, mtime FROM textures WHERE folder = ?', (folder,))
+            )
+
+            # the folder is listed lazily, the records are added and yielded in batches while it is listed
+            folder_records = []
+            try:
+                for name, is_dir, size, mtime in fileManage.iter_directory(path=folder, extensions=extensions):
+                    if cancel_event is not None and cancel_event.is_set():
+                        # the folder modified time is not recorded, the folder is listed again on the next update
+                        self._add_records(root=root, records=folder_records)
+                        self.connection.commit()
+                        return
+
+                    path = '{}/{}'.format(folder, name)
+                    if is_dir:
+                        folders.append((path, folder))
+                        continue
+
+                    if known_files.pop(path, None) == (size, mtime):
+                        continue
+
+                    stem, extension = os.path.splitext(name)
+                    width, height, bit_depth = imageUtils.read_image_header(texture_file_path=path)
+                    folder_records.append(
+                        (path, folder, name, stem, extension.lower(), size, mtime, width, height, bit_depth)
+                    )
+
+                    if len(changed_records) + len(folder_records) + len(removed_paths) >= batch_size:
+                        self._add_records(root=root, records=folder_records)
+                        self.connection.commit()
+                        yield changed_records + folder_records, removed_paths
+                        changed_records = []
+                        removed_paths = []
+                        folder_records = []
+            except OSError:
+                # permission denied or removed while walking
+                walked_folders.discard(folder)
+                continue
+
+            # the files left are not in the folder any more, its modified time is recorded after its last records
+            self._add_records(root=root, records=folder_records)
+            self.connection.executemany('DELETE FROM textures WHERE path = ?', [(path,) for path in known_files])
+            self.connection.execute(
+                'INSERT OR REPLACE INTO folders (path, root, parent, mtime) VALUES (?, ?, ?, ?)',
+                (folder, root, parent, folder_mtime)
+            )
+
+            changed_records.extend(folder_records)
+            removed_paths.extend(known_files)
+
+            if len(changed_records) + len(removed_paths) >= batch_size:
+                self.connection.commit()
+                yield changed_records, removed_paths
+                changed_records = []
+                removed_paths = []
+
+        # folders removed from the disk since the last scan
+        for folder in set(known_folders) - walked_folders:
+            if not any(folder == start or folder.startswith(start + '/') for start in start_folders):
+                continue
+            removed_paths.extend(
+                row[0] for row in self.connection.execute('SELECT path FROM textures WHERE folder = ?', (folder,))
+            )
+            self.connection.execute('DELETE FROM textures WHERE folder = ?', (folder,))
+            self.connection.execute('DELETE FROM folders WHERE path = ?', (folder,))
+
+        self.connection.commit()
+        if changed_records or removed_paths:
+            yield changed_records, removed_paths
+
+    def _add_records(self, root, records):
+        """Add or replace the textures records of the root, not committed.
+
+        Args:
+            root (str): The library root path.
+            records (list): Textures records in CATALOG_FIELDS order.
+
+        """
+
+        self.connection.executemany(
+            'INSERT OR REPLACE INTO textures (root, {}) VALUES (?, {})'.format(
+                ', '.join(CATALOG_FIELDS), ', '.join('?' * len(CATALOG_FIELDS))
+            ),
+            [(root,) + record for record in records]
+        )
@@ -5,6 +5,10 @@ from maya import cmds
 import geoUtils, fileManage
 
 
+# texture files extensions listed in the textures labs, lower case
+TEXTURE_EXTENSIONS = {'.jpg', '.jpeg', '.jpe', '.png', '.tif', '.tiff', '.tx', '.exr', '.hdr'}
+
+
 def get_geo_connected_shaders(geo):
     """Return given geometry connected shaders.
 
@@ -111,3 +115,29 @@ def get_image_metadata(texture_file_path):
                 metadata_dict[metadata_name] = value
 
     return metadata_dict
+
+
+def get_image_thumbnail(texture_file_path):
+    """Return the embedded exif thumbnail of the given image file.
+
+    Args:
+        texture_file_path (str): The path of the image file
+
+    Returns:
+        str/None: The encoded (usually jpeg) thumbnail data, None if the image doesn't carry one.
+
+    """
+
+    try:
+        image = Image(texture_file_path)
+    except RuntimeError:
+        return None
+
+    try:
+        thumbnail_data = image.read_thumbnail()
+    except RuntimeError:
+        thumbnail_data = None
+    finally:
+        image.close()
+
+    return thumbnail_data or None
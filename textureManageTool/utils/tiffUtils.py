@@ -0,0 +1,479 @@
+import struct, zlib
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# tiff tags needed to locate and decode the sub images
+TIFF_TAGS = {
+    254: 'new_subfile_type',
+    256: 'width',
+    257: 'height',
+    258: 'bits_per_sample',
+    259: 'compression',
+    262: 'photometric',
+    273: 'strip_offsets',
+    277: 'samples_per_pixel',
+    278: 'rows_per_strip',
+    279: 'strip_byte_counts',
+    284: 'planar_config',
+    317: 'predictor',
+    322: 'tile_width',
+    323: 'tile_height',
+    324: 'tile_offsets',
+    325: 'tile_byte_counts',
+    338: 'extra_samples',
+    339: 'sample_format'
+}
+
+# tiff field type: (struct format, byte size)
+TIFF_TYPES = {
+    1: ('B', 1),
+    2: ('c', 1),
+    3: ('H', 2),
+    4: ('I', 4),
+    5: ('II', 8),
+    6: ('b', 1),
+    7: ('B', 1),
+    8: ('h', 2),
+    9: ('i', 4),
+    10: ('ii', 8),
+    11: ('f', 4),
+    12: ('d', 8),
+    13: ('I', 4),
+    16: ('Q', 8),
+    17: ('q', 8),
+    18: ('Q', 8)
+}
+
+# NewSubfileType bit flag for reduced resolution version of another image
+REDUCED_RESOLUTION_FLAG = 1
+
+# compression: 1 none, 5 lzw, 8 / 32946 deflate, 32773 packbits
+SUPPORTED_COMPRESSIONS = (1, 5, 8, 32946, 32773)
+# compressions decoded tile by tile while panning, lzw is decoded code by code in python, too slow for a screen of
+# tiles, the lzw tiffs are decoded a level at once by the qt image reader instead, see can_read_tiles
+TILE_COMPRESSIONS = (1, 8, 32946, 32773)
+
+
+def is_tiff_file(texture_file_path):
+    """Check if the file is a tiff (or tiff based .tx) file by its header.
+
+    Args:
+        texture_file_path (str): The path of the image file.
+
+    Returns:
+        bool: True if it is a tiff file or False if not.
+
+    """
+
+    try:
+        with open(texture_file_path, 'rb') as texture_file:
+            header = texture_file.read(4)
+    except (IOError, OSError):
+        return False
+
+    return header in (b'II*\x00', b'MM\x00*', b'II+\x00', b'MM\x00+')
+
+
+def _read_ifd(texture_file, byte_order, big_tiff, ifd_offset):
+    """Read one image file directory.
+
+    Args:
+        texture_file (file): The opened tiff file.
+        byte_order (str): '<' little endian or '>' big endian.
+        big_tiff (bool): BigTIFF uses 8 bytes offsets and counts.
+        ifd_offset (int): The position of the directory in the file.
+
+    Returns:
+        tuple: (directory tags dictionary key(tag name), value(tuple of values), next directory offset)
+
+    """
+
+    if big_tiff:
+        count_format, entry_format, entry_size, offset_format, inline_size = 'Q', 'HHQ8s', 20, 'Q', 8
+    else:
+        count_format, entry_format, entry_size, offset_format, inline_size = 'H', 'HHI4s', 12, 'I', 4
+
+    texture_file.seek(ifd_offset)
+    count_size = struct.calcsize(count_format)
+    entries_count = struct.unpack(byte_order + count_format, texture_file.read(count_size))[0]
+
+    # read all the entries and the next ifd offset in one go
+    offset_size = struct.calcsize(offset_format)
+    entries_data = texture_file.read(entries_count * entry_size + offset_size)
+
+    tags = {}
+    for i in range(entries_count):
+        tag, field_type, count, value_data = struct.unpack(
+            byte_order + entry_format, entries_data[i * entry_size:(i + 1) * entry_size]
+        )
+        if tag not in TIFF_TAGS or field_type not in TIFF_TYPES:
+            continue
+
+        value_format, value_size = TIFF_TYPES[field_type]
+        data_size = value_size * count
+        if data_size > inline_size:
+            value_offset = struct.unpack(byte_order + offset_format, value_data[:offset_size])[0]
+            texture_file.seek(value_offset)
+            value_data = texture_file.read(data_size)
+
+        tags[TIFF_TAGS[tag]] = struct.unpack(
+            '{}{}{}'.format(byte_order, count, value_format) if len(value_format) == 1 else
+            '{}{}'.format(byte_order, value_format * count),
+            value_data[:data_size]
+        )
+
+    next_ifd_offset = struct.unpack(byte_order + offset_format, entries_data[-offset_size:])[0]
+
+    return tags, next_ifd_offset
+
+
+def read_ifds(texture_file_path):
+    """Walk the image file directory chain and return the sub images information without decoding any pixel.
+
+    Args:
+        texture_file_path (str): The path of the tiff file.
+
+    Returns:
+        list: The list of sub images dictionaries in the file order
+              [{
+              'index': directory index, same as QImageReader image number,
+              'width': int,
+              'height': int,
+              'tiled': bool,
+              'tile_width': int,
+              'tile_height': int,
+              'rows_per_strip': int,
+              'bits_per_sample': tuple,
+              'sample_format': int, 1 unsigned int, 2 signed int, 3 float,
+              'samples_per_pixel': int,
+              'compression': int,
+              'photometric': int,
+              'planar_config': int,
+              'predictor': int,
+              'offsets': tuple, strips or tiles offsets,
+              'byte_counts': tuple, strips or tiles byte counts,
+              'new_subfile_type': int,
+              'byte_order': str
+              },]
+
+    """
+
+    ifds = []
+
+    with open(texture_file_path, 'rb') as texture_file:
+        header = texture_file.read(16)
+        if header[:2] == b'II':
+            byte_order = '<'
+        elif header[:2] == b'MM':
+            byte_order = '>'
+        else:
+            return ifds
+
+        version = struct.unpack(byte_order + 'H', header[2:4])[0]
+        if version == 42:
+            big_tiff = False
+            ifd_offset = struct.unpack(byte_order + 'I', header[4:8])[0]
+        elif version == 43:
+            big_tiff = True
+            ifd_offset = struct.unpack(byte_order + 'Q', header[8:16])[0]
+        else:
+            return ifds
+
+        # guard against corrupted files looping back to a visited directory
+        visited_offsets = set()
+        while ifd_offset and ifd_offset not in visited_offsets:
+            visited_offsets.add(ifd_offset)
+            try:
+                tags, next_ifd_offset = _read_ifd(
+                    texture_file=texture_file, byte_order=byte_order, big_tiff=big_tiff, ifd_offset=ifd_offset
+                )
+            except struct.error:
+                break
+
+            tiled = 'tile_width' in tags
+            samples_per_pixel = tags.get('samples_per_pixel', (1,))[0]
+            bits_per_sample = tags.get('bits_per_sample', (1,))
+            height = tags.get('height', (0,))[0]
+
+            ifds.append(
+                {
+                    'index': len(ifds),
+                    'width': tags.get('width', (0,))[0],
+                    'height': height,
+                    'tiled': tiled,
+                    'tile_width': tags['tile_width'][0] if tiled else 0,
+                    'tile_height': tags['tile_height'][0] if tiled else 0,
+                    'rows_per_strip': tags.get('rows_per_strip', (height,))[0],
+                    'bits_per_sample': bits_per_sample * samples_per_pixel if len(bits_per_sample) == 1
+                    else bits_per_sample,
+                    'sample_format': tags.get('sample_format', (1,))[0],
+                    'samples_per_pixel': samples_per_pixel,
+                    'compression': tags.get('compression', (1,))[0],
+                    'photometric': tags.get('photometric', (2,))[0],
+                    'planar_config': tags.get('planar_config', (1,))[0],
+                    'predictor': tags.get('predictor', (1,))[0],
+                    'offsets': tags.get('tile_offsets' if tiled else 'strip_offsets', ()),
+                    'byte_counts': tags.get('tile_byte_counts' if tiled else 'strip_byte_counts', ()),
+                    'new_subfile_type': tags.get('new_subfile_type', (0,))[0],
+                    'byte_order': byte_order
+                }
+            )
+
+            ifd_offset = next_ifd_offset
+
+    return ifds
+
+
+def get_mip_levels(texture_file_path):
+    """Return the mip levels of a tiled tiff / .tx file, the full resolution level first.
+       Plain tiff files return a single level.
+
+    Args:
+        texture_file_path (str): The path of the tiff file.
+
+    Returns:
+        list: The list of sub images dictionaries, see read_ifds.
+
+    """
+
+    ifds = read_ifds(texture_file_path=texture_file_path)
+    if not ifds:
+        return []
+
+    levels = [ifds[0]]
+    for ifd in ifds[1:]:
+        previous_level = levels[-1]
+        # mip levels are flagged as reduced resolution, or at least keep shrinking with the same aspect ratio.
+        reduced = ifd['new_subfile_type'] & REDUCED_RESOLUTION_FLAG
+        shrinking = (
+            ifd['width'] < previous_level['width'] and ifd['height'] <= previous_level['height'] and
+            abs(ifd['width'] * levels[0]['height'] - ifd['height'] * levels[0]['width']) <= levels[0]['width']
+        )
+        if reduced or shrinking:
+            levels.append(ifd)
+
+    return levels
+
+
+def pick_mip_level(levels, width, height):
+    """Pick the smallest mip level that is still at least as large as the given size when fitting in it.
+
+    Args:
+        levels (list): The list of mip levels dictionaries, the full resolution level first.
+        width (int): The width to fit in, usually the preview label width.
+        height (int): The height to fit in, usually the preview label height.
+
+    Returns:
+        dict/None: The picked mip level dictionary, None if no levels.
+
+    """
+
+    picked_level = None
+    for level in levels:
+        # keep aspect ratio fitting won't upscale as long as one side covers the target size.
+        if picked_level is None or level['width'] >= width or level['height'] >= height:
+            if picked_level is None or level['width'] < picked_level['width']:
+                picked_level = level
+
+    return picked_level
+
+
+def can_read_tiles(level):
+    """Check if the tiles of the level can be decoded by read_tile_data into 8 bits gray / rgb / rgba pixels,
+       fast enough to decode them tile by tile, see TILE_COMPRESSIONS.
+
+    Args:
+        level (dict): The sub image dictionary, see read_ifds.
+
+    Returns:
+        bool: True if it can be decoded or False if not.
+
+    """
+
+    return (
+        level['tiled'] and
+        level['planar_config'] == 1 and
+        level['sample_format'] == 1 and
+        level['photometric'] in (1, 2) and
+        level['samples_per_pixel'] in (1, 3, 4) and
+        level['predictor'] in (1, 2) and
+        level['compression'] in TILE_COMPRESSIONS and
+        all(bits == 8 for bits in level['bits_per_sample'])
+    )
+
+
+def read_chunk_data(texture_file_path, level, chunk_index):
+    """Read and decompress a single strip / tile of the level, without touching the rest of the file.
+       The predictor is not undone.
+
+    Args:
+        texture_file_path (str): The path of the tiff file.
+        level (dict): The sub image dictionary, see read_ifds.
+        chunk_index (int): The strip / tile index in the offsets.
+
+    Returns:
+        str/bytearray: The decompressed strip / tile data.
+
+    """
+
+    if level['compression'] not in SUPPORTED_COMPRESSIONS:
+        raise ValueError('Unsupported tiff compression: {}'.format(level['compression']))
+
+    with open(texture_file_path, 'rb') as texture_file:
+        texture_file.seek(level['offsets'][chunk_index])
+        data = texture_file.read(level['byte_counts'][chunk_index])
+
+    if level['compression'] in (8, 32946):
+        data = zlib.decompress(data)
+    elif level['compression'] == 5:
+        data = _lzw_decode(data)
+    elif level['compression'] == 32773:
+        data = _packbits_decode(data)
+
+    return data
+
+
+def read_tile_data(texture_file_path, level, tile_x, tile_y):
+    """Read and decompress a single tile of the level, without touching the rest of the file.
+
+    Args:
+        texture_file_path (str): The path of the tiff file.
+        level (dict): The sub image dictionary, see read_ifds.
+        tile_x (int): The tile column.
+        tile_y (int): The tile row.
+
+    Returns:
+        bytearray: The tile pixels, tile_width * tile_height * samples_per_pixel bytes, padded on the edge tiles.
+
+    """
+
+    tiles_across = (level['width'] + level['tile_width'] - 1) // level['tile_width']
+    data = read_chunk_data(
+        texture_file_path=texture_file_path, level=level, chunk_index=tile_y * tiles_across + tile_x
+    )
+
+    tile_size = level['tile_width'] * level['tile_height'] * level['samples_per_pixel']
+    data = bytearray(data[:tile_size])
+    # some writers cut the trailing zero bytes
+    if len(data) < tile_size:
+        data.extend(bytearray(tile_size - len(data)))
+
+    if level['predictor'] == 2:
+        _undo_horizontal_predictor(
+            data=data, width=level['tile_width'], samples_per_pixel=level['samples_per_pixel']
+        )
+
+    return data
+
+
+def _undo_horizontal_predictor(data, width, samples_per_pixel):
+    """Undo the 8 bits horizontal differencing predictor in place.
+
+    Args:
+        data (bytearray): The decompressed tile pixels.
+        width (int): The tile width.
+        samples_per_pixel (int): Samples per pixel.
+
+    """
+
+    if np is not None:
+        samples = np.frombuffer(data, dtype=np.uint8).reshape(-1, width, samples_per_pixel)
+        # uint8 sums wrap around like the predictor differences
+        samples[...] = np.cumsum(samples, axis=1, dtype=np.uint8)
+        return
+
+    row_size = width * samples_per_pixel
+    for row_start in range(0, len(data), row_size):
+        for i in range(row_start + samples_per_pixel, row_start + row_size):
+            data[i] = (data[i] + data[i - samples_per_pixel]) & 0xff
+
+
+def _packbits_decode(data):
+    """Decode PackBits run length encoded data.
+
+    Args:
+        data (str): The encoded data.
+
+    Returns:
+        bytearray: The decoded data.
+
+    """
+
+    data = bytearray(data)
+    decoded = bytearray()
+
+    i = 0
+    while i < len(data):
+        n = data[i]
+        i += 1
+        if n < 128:
+            decoded.extend(data[i:i + n + 1])
+            i += n + 1
+        elif n > 128:
+            decoded.extend(data[i:i + 1] * (257 - n))
+            i += 1
+
+    return decoded
+
+
+def _lzw_decode(data):
+    """Decode tiff flavoured (msb first, early change) LZW data, code by code, see TILE_COMPRESSIONS.
+
+    Args:
+        data (str): The encoded data.
+
+    Returns:
+        bytearray: The decoded data.
+
+    """
+
+    data = bytearray(data)
+    decoded = bytearray()
+
+    clear_code, end_code = 256, 257
+    table = [bytearray([i]) for i in range(256)] + [bytearray(), bytearray()]
+    code_length = 9
+    previous = None
+
+    bit_buffer, bit_count = 0, 0
+    for byte in data:
+        bit_buffer = (bit_buffer << 8) | byte
+        bit_count += 8
+
+        while bit_count >= code_length:
+            bit_count -= code_length
+            code = (bit_buffer >> bit_count) & ((1 << code_length) - 1)
+
+            if code == end_code:
+                return decoded
+
+            if code == clear_code:
+                table = table[:258]
+                code_length = 9
+                previous = None
+                continue
+
+            if code < len(table):
+                entry = table[code]
+                if previous is not None:
+                    table.append(previous + entry[:1])
+            elif previous is not None:
+                entry = previous + previous[:1]
+                table.append(entry)
+            else:
+                raise ValueError('Corrupted tiff lzw data')
+
+            decoded.extend(entry)
+            previous = entry
+
+            # early change, the code length grows one code before the table is full
+            if len(table) + 1 >= (1 << code_length) and code_length < 12:
+                code_length += 1
+
+        bit_buffer &= (1 << bit_count) - 1
+
+    return decoded